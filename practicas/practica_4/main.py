@@ -36,6 +36,22 @@ if __name__ == '__main__':
         scheduler = "RoundRobin con quantum = "+str(quantum)
     time.sleep(0.5)
     print("Seleccionaste "+str(scheduler))
+    time.sleep(0.5)
+    seleccionMemoria = None
+    print("Seleccione una estrategia de asignación de memoria: 1 - FirstFit, 2 - BestFit, 3 - WorstFit, 4 - NextFit")
+    while seleccionMemoria is None:
+        seleccionMemoria = input()
+        if not seleccionMemoria.isdigit() or not 1 <= int(seleccionMemoria) <= 4:
+            print("La ópcion seleccionada no es válida, por favor ingrese una ópcion nuevamente")
+            seleccionMemoria = None
+    time.sleep(0.5)
+    seleccionCompactacion = None
+    print("¿Compactar la memoria cuando ningún hueco alcance? 1 - Sí, 2 - No")
+    while seleccionCompactacion is None:
+        seleccionCompactacion = input()
+        if seleccionCompactacion not in ("1", "2"):
+            print("La ópcion seleccionada no es válida, por favor ingrese una ópcion nuevamente")
+            seleccionCompactacion = None
     time.sleep(1.5)
 
 
@@ -47,7 +63,7 @@ if __name__ == '__main__':
 
     ## new create the Operative System Kernel
 
-    kernel = Kernel(seleccion, quantum)
+    kernel = Kernel(seleccion, quantum, seleccionMemoria, seleccionCompactacion == "1")
 
     # grafico cant
 
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 from hardware import *
+from bisect import bisect_left, insort
 import log
 
 ## emulates a compiled program
@@ -193,6 +194,8 @@ class KillInterruptionHandler(AbstractInterruptionHandler):
         pcb.state = "terminated"
         self.kernel.pcbTable.remove(pcb.pid)
         self.kernel.pcbTable.runningPCB = None
+        self.kernel.loader.unload(pcb)
+        log.logger.info(self.kernel.loader.memoria)
         self.handlerOut()
 
 
@@ -222,8 +225,8 @@ class NewInterruptionHandler(AbstractInterruptionHandler):
     def execute(self, irq):
         program = irq.parameters[0]
         priority = irq.parameters[1]
-        baseDir = self.kernel.loader.load(program)
         pid = self.kernel.pcbTable.getNewPID()
+        baseDir = self.kernel.loader.load(program, pid)
         pcb = PCB(baseDir, pid, 0, program.name, priority)
         self.kernel.pcbTable.add(pcb)
         self.handlerIn(pcb)
@@ -247,9 +250,18 @@ class TimeoutInterruptionHandle(AbstractInterruptionHandler):
 
 class Loader:
 
-    def __init__(self):
+    def __init__(self, kernel, memoria):
+        self._kernel = kernel
+        self._memoria = memoria
         self._baseDir = 0
-        self._proximaBaseDir = 0
+
+    @property
+    def kernel(self):
+        return self._kernel
+
+    @property
+    def memoria(self):
+        return self._memoria
 
     @property
     def baseDir(self):
@@ -259,26 +271,231 @@ class Loader:
     def baseDir(self, baseDir):
         self._baseDir = baseDir
 
-    @property
-    def proximaBaseDir(self):
-        return self._proximaBaseDir
-
-    @proximaBaseDir.setter
-    def proximaBaseDir(self, proximaBaseDir):
-        self._proximaBaseDir = proximaBaseDir
-
-    def load(self, program):
+    def load(self, program, pid):
         # loads the program in main memory
         progSize = len(program.instructions)
-        self.celdaContador = self.proximaBaseDir
-        self.baseDir = self.proximaBaseDir
+        self.baseDir = self.memoria.asignar(pid, progSize, self.reubicar)
+        self.celdaContador = self.baseDir
         for index in range(0, progSize):
             inst = program.instructions[index]
             HARDWARE.memory.write(self.celdaContador, inst)
             self.celdaContador = self.celdaContador + 1
-        self.proximaBaseDir = self.celdaContador
         return self.baseDir
 
+    def unload(self, pcb):
+        self.memoria.liberar(pcb.pid)
+
+    def reubicar(self, pid, baseDir):
+        ## la compactacion movio el proceso: actualizamos su PCB (y el MMU si esta corriendo)
+        pcb = self.kernel.pcbTable.get(pid)
+        pcb.baseDir = baseDir
+        if pcb is self.kernel.pcbTable.runningPCB:
+            HARDWARE.mmu.baseDir = baseDir
+
+################################ HUECOS LIBRES ########################################
+
+
+class IndiceDeHuecos:
+
+    ## huecos libres de la memoria indexados por direccion (para coalescer y para first/next fit)
+    ## y por tamaño (para best/worst fit); las dos listas se mantienen ordenadas con bisect
+
+    def __init__(self, tamañoMemoria):
+        self._inicios = []
+        self._tamaños = dict()
+        self._porTamaño = []
+        if tamañoMemoria > 0:
+            self.agregar(0, tamañoMemoria)
+
+    @property
+    def huecos(self):
+        return [(inicio, self._tamaños[inicio]) for inicio in self._inicios]
+
+    @property
+    def totalLibre(self):
+        return sum(self._tamaños.values())
+
+    @property
+    def huecoMasGrande(self):
+        if not self._porTamaño:
+            return 0
+        return self._porTamaño[-1][0]
+
+    def agregar(self, inicio, tamaño):
+        insort(self._inicios, inicio)
+        self._tamaños[inicio] = tamaño
+        insort(self._porTamaño, (tamaño, inicio))
+
+    def quitar(self, inicio):
+        tamaño = self._tamaños.pop(inicio)
+        del self._inicios[bisect_left(self._inicios, inicio)]
+        del self._porTamaño[bisect_left(self._porTamaño, (tamaño, inicio))]
+        return tamaño
+
+    def ocupar(self, inicio, tamaño):
+        tamañoHueco = self.quitar(inicio)
+        if tamañoHueco > tamaño:
+            self.agregar(inicio + tamaño, tamañoHueco - tamaño)
+
+    def liberar(self, inicio, tamaño):
+        ## coalescemos con el hueco anterior y el siguiente si son contiguos
+        indice = bisect_left(self._inicios, inicio)
+        if indice < len(self._inicios) and self._inicios[indice] == inicio + tamaño:
+            tamaño += self.quitar(inicio + tamaño)
+        if indice > 0:
+            anterior = self._inicios[indice - 1]
+            if anterior + self._tamaños[anterior] == inicio:
+                tamaño += self.quitar(anterior)
+                inicio = anterior
+        self.agregar(inicio, tamaño)
+
+    def primeroDesde(self, direccion, tamaño):
+        for indice in range(bisect_left(self._inicios, direccion), len(self._inicios)):
+            inicio = self._inicios[indice]
+            if self._tamaños[inicio] >= tamaño:
+                return inicio
+        return None
+
+    def menorQueAlcance(self, tamaño):
+        indice = bisect_left(self._porTamaño, (tamaño, -1))
+        if indice < len(self._porTamaño):
+            return self._porTamaño[indice][1]
+        return None
+
+    def mayor(self, tamaño):
+        if self._porTamaño and self._porTamaño[-1][0] >= tamaño:
+            return self._porTamaño[-1][1]
+        return None
+
+    def __repr__(self):
+        return "Huecos({huecos})".format(huecos=self.huecos)
+
+################################ ESTRATEGIAS DE ASIGNACION ########################################
+
+
+class AbstractEstrategiaDeAsignacion:
+
+    def elegirHueco(self, indiceDeHuecos, tamaño):
+        log.logger.error("-- elegirHueco MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+
+class FirstFit(AbstractEstrategiaDeAsignacion):
+
+    def elegirHueco(self, indiceDeHuecos, tamaño):
+        return indiceDeHuecos.primeroDesde(0, tamaño)
+
+
+class BestFit(AbstractEstrategiaDeAsignacion):
+
+    def elegirHueco(self, indiceDeHuecos, tamaño):
+        return indiceDeHuecos.menorQueAlcance(tamaño)
+
+
+class WorstFit(AbstractEstrategiaDeAsignacion):
+
+    def elegirHueco(self, indiceDeHuecos, tamaño):
+        return indiceDeHuecos.mayor(tamaño)
+
+
+class NextFit(AbstractEstrategiaDeAsignacion):
+
+    def __init__(self):
+        self._ultimaDireccion = 0
+
+    def elegirHueco(self, indiceDeHuecos, tamaño):
+        inicio = indiceDeHuecos.primeroDesde(self._ultimaDireccion, tamaño)
+        if inicio is None:
+            inicio = indiceDeHuecos.primeroDesde(0, tamaño)
+        if inicio is not None:
+            self._ultimaDireccion = inicio + tamaño
+        return inicio
+
+################################ MEMORIA CONTIGUA ########################################
+
+
+class MemoriaContigua:
+
+    def __init__(self, tamañoMemoria, estrategia, compactacion):
+        self._tamañoMemoria = tamañoMemoria
+        self._huecos = IndiceDeHuecos(tamañoMemoria)
+        self._estrategia = estrategia
+        self._compactacion = compactacion
+        self._bloques = dict()  ## pid -> (baseDir, tamaño)
+        self._compactaciones = 0
+        self._tickActual = 0
+        self._historialDeFragmentacion = []  ## (tickNbr, fragmentacion externa) despues de cada cambio
+
+    @property
+    def huecos(self):
+        return self._huecos
+
+    @property
+    def estrategia(self):
+        return self._estrategia
+
+    @property
+    def compactaciones(self):
+        return self._compactaciones
+
+    @property
+    def historialDeFragmentacion(self):
+        return self._historialDeFragmentacion
+
+    @property
+    def fragmentacionExterna(self):
+        ## porcentaje de la memoria libre que no se puede usar para el pedido mas grande posible
+        totalLibre = self._huecos.totalLibre
+        if totalLibre == 0:
+            return 0.0
+        return 1 - self._huecos.huecoMasGrande / totalLibre
+
+    def asignar(self, pid, tamaño, reubicar):
+        baseDir = self._estrategia.elegirHueco(self._huecos, tamaño)
+        if baseDir is None and self._compactacion and self._huecos.totalLibre >= tamaño:
+            self.compactar(reubicar)
+            baseDir = self._estrategia.elegirHueco(self._huecos, tamaño)
+        if baseDir is None:
+            raise Exception("\n*\n* ERROR \n*\n No hay un hueco de {tamaño} celdas en memoria ({huecos})".format(
+                tamaño=tamaño, huecos=self._huecos))
+        self._huecos.ocupar(baseDir, tamaño)
+        self._bloques[pid] = (baseDir, tamaño)
+        self.registrarFragmentacion()
+        return baseDir
+
+    def liberar(self, pid):
+        baseDir, tamaño = self._bloques.pop(pid)
+        self._huecos.liberar(baseDir, tamaño)
+        self.registrarFragmentacion()
+
+    def compactar(self, reubicar):
+        ## movemos todos los procesos al principio de la memoria y dejamos un unico hueco al final
+        proximaBaseDir = 0
+        for pid, (baseDir, tamaño) in sorted(self._bloques.items(), key=lambda bloque: bloque[1][0]):
+            if baseDir != proximaBaseDir:
+                for offset in range(0, tamaño):
+                    HARDWARE.memory.write(proximaBaseDir + offset, HARDWARE.memory.read(baseDir + offset))
+                self._bloques[pid] = (proximaBaseDir, tamaño)
+                reubicar(pid, proximaBaseDir)
+            proximaBaseDir += tamaño
+        self._huecos = IndiceDeHuecos(0)
+        if proximaBaseDir < self._tamañoMemoria:
+            self._huecos.agregar(proximaBaseDir, self._tamañoMemoria - proximaBaseDir)
+        self._compactaciones += 1
+        self.registrarFragmentacion()
+        log.logger.info("Memoria compactada: {huecos}".format(huecos=self._huecos))
+
+    def registrarFragmentacion(self):
+        ## la fragmentacion solo cambia cuando se asigna, libera o compacta: se calcula ahi y no en cada tick
+        self._historialDeFragmentacion.append((self._tickActual, self.fragmentacionExterna))
+
+    def tick(self, tickNbr):
+        self._tickActual = tickNbr
+
+    def __repr__(self):
+        return "MemoriaContigua({estrategia}, {huecos}, fragmentacion externa={fragmentacion:.2f}, compactaciones={compactaciones})".format(
+            estrategia=self._estrategia.__class__.__name__, huecos=self._huecos,
+            fragmentacion=self.fragmentacionExterna, compactaciones=self._compactaciones)
+
 ################################ READY QUEUE ########################################
 
 class ReadyQueue:
@@ -326,6 +543,10 @@ class PCB:
     def baseDir(self):
         return self._baseDir
 
+    @baseDir.setter
+    def baseDir(self, baseDir):
+        self._baseDir = baseDir
+
     @property
     def priority(self):
         return self._priority
@@ -429,7 +650,7 @@ class Dispatcher:
 
 class Kernel:
 
-    def __init__(self, seleccion, quantum):
+    def __init__(self, seleccion, quantum, seleccionMemoria="1", compactacion=True):
         if seleccion == "1":
             scheduler = PriorityExpropiativoScheduler()
         if seleccion == "2":
@@ -439,6 +660,15 @@ class Kernel:
         if seleccion == "4":
             scheduler = RoundRobinScheduler(int(quantum))
 
+        if seleccionMemoria == "1":
+            estrategia = FirstFit()
+        if seleccionMemoria == "2":
+            estrategia = BestFit()
+        if seleccionMemoria == "3":
+            estrategia = WorstFit()
+        if seleccionMemoria == "4":
+            estrategia = NextFit()
+
         ## setup interruption handlers
         killHandler = KillInterruptionHandler(self)
         HARDWARE.interruptVector.register(KILL_INTERRUPTION_TYPE, killHandler)
@@ -458,7 +688,9 @@ class Kernel:
 
         ## controls the Hardware's I/O Device
         self._ioDeviceController = IoDeviceController(HARDWARE.ioDevice)
-        self._loader = Loader()
+        memoria = MemoriaContigua(HARDWARE.memory.size, estrategia, compactacion)
+        HARDWARE.clock.addSubscriber(memoria)
+        self._loader = Loader(self, memoria)
         self._pcbTable = PCBTable()
         self._dispatcher = Dispatcher()
         self._scheduler = scheduler
@@ -0,0 +1,34 @@
+## los modulos de la practica se importan como en main.py (desde su directorio);
+## so.py ademas importa tabulate como practicas.practica_4.tabulate (desde la raiz del repo)
+import collections
+import collections.abc
+import os
+import sys
+
+import pytest
+
+practica = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(practica)))
+sys.path.insert(0, practica)
+
+## el tabulate incluido importa Iterable de collections (se movio a collections.abc en python 3.10)
+if not hasattr(collections, "Iterable"):
+    collections.Iterable = collections.abc.Iterable
+
+import hardware
+from hardware import HARDWARE
+
+
+## el reloj espera un segundo por tick: en los tests no hace falta
+@pytest.fixture(autouse=True)
+def sinEsperas(monkeypatch):
+    monkeypatch.setattr(hardware, "sleep", lambda segundos: None)
+
+
+## arma el hardware con una memoria del tamaño pedido
+@pytest.fixture
+def armarHardware():
+    def armar(memoria):
+        HARDWARE.setup(memoria)
+        return HARDWARE
+    return armar
@@ -0,0 +1,75 @@
+import pytest
+
+from hardware import HARDWARE
+from so import FirstFit, Kernel, MemoriaContigua
+
+
+def sinReubicar(pid, baseDir):
+    raise AssertionError("no deberia compactar")
+
+
+## deja la memoria de 10 celdas con dos huecos de 2 celdas: [libre 0-1][pid 1 2-5][libre 6-7][pid 3 8-9]
+def fragmentada(memoria):
+    memoria.asignar(0, 2, sinReubicar)
+    memoria.asignar(1, 4, sinReubicar)
+    memoria.asignar(2, 2, sinReubicar)
+    memoria.asignar(3, 2, sinReubicar)
+    memoria.liberar(0)
+    memoria.liberar(2)
+
+
+def test_la_fragmentacion_se_registra_al_asignar_y_liberar_y_no_en_cada_tick(armarHardware):
+    armarHardware(10)
+    memoria = MemoriaContigua(10, FirstFit(), True)
+    memoria.tick(0)
+    memoria.asignar(0, 4, sinReubicar)
+    for tickNbr in range(1, 50):
+        memoria.tick(tickNbr)
+    memoria.liberar(0)
+
+    assert memoria.historialDeFragmentacion == [(0, 0.0), (49, 0.0)]
+
+
+def test_la_fragmentacion_externa_mide_la_memoria_libre_que_no_esta_en_el_hueco_mas_grande(armarHardware):
+    armarHardware(10)
+    memoria = MemoriaContigua(10, FirstFit(), True)
+    fragmentada(memoria)
+
+    assert memoria.fragmentacionExterna == 0.5
+    assert memoria.historialDeFragmentacion[-1] == (0, 0.5)
+
+
+def test_con_compactacion_un_pedido_que_no_entra_en_ningun_hueco_mueve_los_procesos(armarHardware):
+    armarHardware(10)
+    memoria = MemoriaContigua(10, FirstFit(), True)
+    fragmentada(memoria)
+    for direccion in range(10):
+        HARDWARE.memory.write(direccion, direccion)
+    movidos = dict()
+
+    baseDir = memoria.asignar(4, 4, lambda pid, nuevaBaseDir: movidos.__setitem__(pid, nuevaBaseDir))
+
+    assert movidos == {1: 0, 3: 4}
+    assert baseDir == 6
+    assert [HARDWARE.memory.read(direccion) for direccion in range(6)] == [2, 3, 4, 5, 8, 9]
+    assert memoria.compactaciones == 1
+    assert memoria.fragmentacionExterna == 0.0
+
+
+def test_sin_compactacion_un_pedido_que_no_entra_en_ningun_hueco_falla(armarHardware):
+    armarHardware(10)
+    memoria = MemoriaContigua(10, FirstFit(), False)
+    fragmentada(memoria)
+
+    with pytest.raises(Exception, match="No hay un hueco de 4 celdas"):
+        memoria.asignar(4, 4, sinReubicar)
+    assert memoria.compactaciones == 0
+
+
+def test_el_kernel_permite_elegir_si_se_compacta(armarHardware):
+    armarHardware(10)
+    kernel = Kernel("3", None, "1", compactacion=False)
+    fragmentada(kernel.loader.memoria)
+
+    with pytest.raises(Exception, match="No hay un hueco"):
+        kernel.loader.memoria.asignar(4, 4, kernel.loader.reubicar)
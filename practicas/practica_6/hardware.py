@@ -2,13 +2,130 @@
 
 from tabulate import tabulate
 from time import sleep
-from threading import Thread, Lock
+from threading import Thread, get_ident
+from queue import Queue, SimpleQueue, Empty
+from heapq import heappush, heappop
+from collections import OrderedDict
+from collections.abc import Sequence
+from enum import IntEnum
+from ast import literal_eval
+import mmap
 import log
 
 ##  Estas son la instrucciones soportadas por nuestro CPU
 INSTRUCTION_IO = 'IO'
 INSTRUCTION_CPU = 'CPU'
 INSTRUCTION_EXIT = 'EXIT'
+INSTRUCTION_WRITE = 'WRITE'
+INSTRUCTION_FORK = 'FORK'
+##  instrucciones con registros: SET Rn valor, LOAD/STORE Rn direccion, ADD/SUB Rn (Rm | valor),
+##  JMP direccion, JZ/JNZ Rn direccion (las direcciones son logicas, como el pc)
+INSTRUCTION_SET = 'SET'
+INSTRUCTION_LOAD = 'LOAD'
+INSTRUCTION_STORE = 'STORE'
+INSTRUCTION_ADD = 'ADD'
+INSTRUCTION_SUB = 'SUB'
+INSTRUCTION_JMP = 'JMP'
+INSTRUCTION_JZ = 'JZ'
+INSTRUCTION_JNZ = 'JNZ'
+INSTRUCTIONS_WITH_REGISTER = (INSTRUCTION_SET, INSTRUCTION_LOAD, INSTRUCTION_STORE, INSTRUCTION_ADD, INSTRUCTION_SUB,
+                              INSTRUCTION_JZ, INSTRUCTION_JNZ)
+
+##  registros de uso general del CPU: R0 .. R7
+REGISTER_COUNT = 8
+
+## valor que escribe la instruccion WRITE en memoria
+WRITE_VALUE = 'DATA'
+
+##  Codigos de operacion de las instrucciones en una imagen binaria (el operando vacio es OPERAND_NONE)
+OPCODE_CPU = 0
+OPCODE_IO = 1
+OPCODE_EXIT = 2
+OPCODE_WRITE = 3
+OPCODE_FORK = 4
+OPCODE_SET = 5
+OPCODE_LOAD = 6
+OPCODE_STORE = 7
+OPCODE_ADD_REGISTER = 8
+OPCODE_ADD_VALUE = 9
+OPCODE_SUB_REGISTER = 10
+OPCODE_SUB_VALUE = 11
+OPCODE_JMP = 12
+OPCODE_JZ = 13
+OPCODE_JNZ = 14
+OPCODE_DATA = 15
+OPERAND_NONE = 0xFFFF
+##  los valores inmediatos (DATA, SET, ADD/SUB valor) van en complemento a dos
+OPCODES_WITH_VALUE = (OPCODE_DATA, OPCODE_SET, OPCODE_ADD_VALUE, OPCODE_SUB_VALUE)
+VALUE_MIN = -0x8000
+VALUE_MAX = 0x7FFF
+
+##  Dispositivos de entrada/salida (la instruccion IO sin dispositivo usa la impresora)
+PRINTER_DEVICE = 'Printer'
+DISK_DEVICE = 'Disk'
+NETWORK_DEVICE = 'Network'
+TERMINAL_DEVICE = 'Terminal'
+
+##  Geometria del disco: el tiempo de una operacion es la transferencia mas el seek hasta el cilindro
+DISK_CYLINDERS = 200
+DISK_CYLINDERS_PER_TICK = 20
+DISK_TRANSFER_TIME = 1
+
+##  Modo asincronico de los dispositivos: cada uno trabaja en su propio thread
+DEVICE_SECONDS_PER_TICK = 1
+DISK_FILE_PATH = "disk.bin"
+DISK_BLOCK_SIZE = 512
+
+
+## a run of equal instructions: ASM.CPU(10000) is one segment, not a list of 10000 strings.
+## It still reads like that list (len, indexing, iteration, ==, +) for code that treats it as one
+class Burst(Sequence):
+
+    __slots__ = ('_instruction', '_times')
+
+    def __init__(self, instruction, times):
+        self._instruction = instruction
+        self._times = times
+
+    @property
+    def instruction(self):
+        return self._instruction
+
+    @property
+    def times(self):
+        return self._times
+
+    def __len__(self):
+        return self._times
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._instruction] * len(range(self._times)[index])
+        range(self._times)[index]  ## raises IndexError out of range
+        return self._instruction
+
+    def __iter__(self):
+        for i in range(self._times):
+            yield self._instruction
+
+    def count(self, value):
+        return self._times if value == self._instruction else 0
+
+    def __eq__(self, other):
+        if isinstance(other, Burst):
+            return (self._instruction, self._times) == (other._instruction, other._times)
+        if isinstance(other, list):
+            return len(other) == self._times and other.count(self._instruction) == self._times
+        return NotImplemented
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return "Burst({instruction} x{times})".format(instruction=self._instruction, times=self._times)
 
 
 ## Helper for emulated machine code
@@ -16,15 +133,93 @@ class ASM():
 
     @classmethod
     def EXIT(self, times):
-        return [INSTRUCTION_EXIT] * times
+        return Burst(INSTRUCTION_EXIT, times)
 
     @classmethod
-    def IO(self):
-        return INSTRUCTION_IO
+    def IO(self, deviceId=None, cylinder=None):
+        if deviceId is None:
+            return INSTRUCTION_IO
+        if cylinder is None:
+            return "{instr} {deviceId}".format(instr=INSTRUCTION_IO, deviceId=deviceId)
+        return "{instr} {deviceId} {cylinder}".format(instr=INSTRUCTION_IO, deviceId=deviceId, cylinder=cylinder)
 
     @classmethod
     def CPU(self, times):
-        return [INSTRUCTION_CPU] * times
+        return Burst(INSTRUCTION_CPU, times)
+
+    @classmethod
+    def WRITE(self, address):
+        return "{instr} {address}".format(instr=INSTRUCTION_WRITE, address=address)
+
+    @classmethod
+    def FORK(self):
+        return INSTRUCTION_FORK
+
+    @classmethod
+    def SET(self, register, value):
+        return "{instr} {register} {value}".format(instr=INSTRUCTION_SET, register=ASM.register(register), value=value)
+
+    @classmethod
+    def LOAD(self, register, address):
+        return "{instr} {register} {address}".format(instr=INSTRUCTION_LOAD, register=ASM.register(register),
+                                                     address=address)
+
+    @classmethod
+    def STORE(self, register, address):
+        return "{instr} {register} {address}".format(instr=INSTRUCTION_STORE, register=ASM.register(register),
+                                                     address=address)
+
+    ## operand es otro registro ("R2" o 2 con register=True) o un valor
+    @classmethod
+    def ADD(self, register, operand):
+        return "{instr} {register} {operand}".format(instr=INSTRUCTION_ADD, register=ASM.register(register),
+                                                     operand=operand)
+
+    @classmethod
+    def SUB(self, register, operand):
+        return "{instr} {register} {operand}".format(instr=INSTRUCTION_SUB, register=ASM.register(register),
+                                                     operand=operand)
+
+    @classmethod
+    def JMP(self, address):
+        return "{instr} {address}".format(instr=INSTRUCTION_JMP, address=address)
+
+    @classmethod
+    def JZ(self, register, address):
+        return "{instr} {register} {address}".format(instr=INSTRUCTION_JZ, register=ASM.register(register),
+                                                     address=address)
+
+    @classmethod
+    def JNZ(self, register, address):
+        return "{instr} {register} {address}".format(instr=INSTRUCTION_JNZ, register=ASM.register(register),
+                                                     address=address)
+
+    ## celdas de datos (enteros) para LOAD/STORE: no se ejecutan, van despues del EXIT
+    @classmethod
+    def DATA(self, times, value=0):
+        return [value] * times
+
+    ## nombre del registro n ("R3"), valida que exista
+    @classmethod
+    def register(self, register):
+        number = int(str(register).lstrip("R"))
+        if not 0 <= number < REGISTER_COUNT:
+            raise Exception("\n*\n* ERROR \n*\n No existe el registro {register}".format(register=register))
+        return "R{number}".format(number=number)
+
+    @classmethod
+    def isRegister(self, operand):
+        return isinstance(operand, str) and operand.startswith("R") and operand[1:].isdigit()
+
+    @classmethod
+    def mnemonicOf(self, instruction):
+        if not isinstance(instruction, str):
+            return None
+        return instruction.split(" ", 1)[0]
+
+    @classmethod
+    def operandsOf(self, instruction):
+        return instruction.split()[1:]
 
     @classmethod
     def isEXIT(self, instruction):
@@ -32,24 +227,229 @@ class ASM():
 
     @classmethod
     def isIO(self, instruction):
-        return INSTRUCTION_IO == instruction
+        return INSTRUCTION_IO == instruction or \
+               (isinstance(instruction, str) and instruction.startswith(INSTRUCTION_IO + " "))
+
+    @classmethod
+    def isWRITE(self, instruction):
+        return isinstance(instruction, str) and instruction.startswith(INSTRUCTION_WRITE + " ")
+
+    @classmethod
+    def isFORK(self, instruction):
+        return INSTRUCTION_FORK == instruction
+
+    @classmethod
+    def addressOf(self, instruction):
+        return int(instruction.split()[1])
+
+    @classmethod
+    def deviceOf(self, instruction):
+        operands = instruction.split()
+        if len(operands) < 2:
+            return PRINTER_DEVICE
+        return operands[1]
+
+    @classmethod
+    def cylinderOf(self, instruction):
+        operands = instruction.split()
+        if len(operands) < 3:
+            return 0
+        return int(operands[2])
+
+    ## codifica una instruccion como (opcode, dispositivo, operando); los dispositivos se numeran desde 1
+    ## segun su posicion en devices, que se va completando con los que aparecen (0 = sin dispositivo)
+    @classmethod
+    def encode(self, instruction, devices):
+        if isinstance(instruction, int):
+            return OPCODE_DATA, 0, self._value(instruction, instruction)
+        mnemonic = ASM.mnemonicOf(instruction)
+        if mnemonic in INSTRUCTIONS_WITH_REGISTER or mnemonic == INSTRUCTION_JMP:
+            return self._encodeWithRegister(mnemonic, ASM.operandsOf(instruction), instruction)
+        if INSTRUCTION_CPU == instruction:
+            return OPCODE_CPU, 0, OPERAND_NONE
+        if ASM.isEXIT(instruction):
+            return OPCODE_EXIT, 0, OPERAND_NONE
+        if ASM.isFORK(instruction):
+            return OPCODE_FORK, 0, OPERAND_NONE
+        if ASM.isWRITE(instruction):
+            return OPCODE_WRITE, 0, self._operand(ASM.addressOf(instruction), instruction)
+        if ASM.isIO(instruction):
+            operands = instruction.split()
+            if len(operands) < 2:
+                return OPCODE_IO, 0, OPERAND_NONE
+            if operands[1] not in devices:
+                devices.append(operands[1])
+            operand = OPERAND_NONE
+            if len(operands) > 2:
+                operand = self._operand(int(operands[2]), instruction)
+            return OPCODE_IO, devices.index(operands[1]) + 1, operand
+        raise Exception("\n*\n* ERROR \n*\n Instruccion desconocida: {instruction}".format(instruction=instruction))
+
+    @classmethod
+    def decode(self, opcode, device, operand, devices):
+        if opcode in OPCODES_WITH_VALUE and operand > VALUE_MAX:
+            operand -= 0x10000
+        if opcode == OPCODE_CPU:
+            return INSTRUCTION_CPU
+        if opcode == OPCODE_EXIT:
+            return INSTRUCTION_EXIT
+        if opcode == OPCODE_FORK:
+            return INSTRUCTION_FORK
+        if opcode == OPCODE_WRITE:
+            return ASM.WRITE(operand)
+        if opcode == OPCODE_IO:
+            if device == 0:
+                return ASM.IO()
+            return ASM.IO(devices[device - 1], None if operand == OPERAND_NONE else operand)
+        if opcode == OPCODE_DATA:
+            return operand
+        if opcode == OPCODE_SET:
+            return ASM.SET(device, operand)
+        if opcode == OPCODE_LOAD:
+            return ASM.LOAD(device, operand)
+        if opcode == OPCODE_STORE:
+            return ASM.STORE(device, operand)
+        if opcode == OPCODE_ADD_REGISTER:
+            return ASM.ADD(device, ASM.register(operand))
+        if opcode == OPCODE_ADD_VALUE:
+            return ASM.ADD(device, operand)
+        if opcode == OPCODE_SUB_REGISTER:
+            return ASM.SUB(device, ASM.register(operand))
+        if opcode == OPCODE_SUB_VALUE:
+            return ASM.SUB(device, operand)
+        if opcode == OPCODE_JMP:
+            return ASM.JMP(operand)
+        if opcode == OPCODE_JZ:
+            return ASM.JZ(device, operand)
+        if opcode == OPCODE_JNZ:
+            return ASM.JNZ(device, operand)
+        raise Exception("\n*\n* ERROR \n*\n Codigo de operacion desconocido: {opcode}".format(opcode=opcode))
+
+    ## el registro va en el byte del dispositivo; ADD y SUB tienen un opcode para registro y otro para valor
+    @classmethod
+    def _encodeWithRegister(self, mnemonic, operands, instruction):
+        if mnemonic == INSTRUCTION_JMP:
+            return OPCODE_JMP, 0, self._operand(int(operands[0]), instruction)
+        register = int(ASM.register(operands[0])[1:])
+        if mnemonic in (INSTRUCTION_ADD, INSTRUCTION_SUB):
+            withRegister = ASM.isRegister(operands[1])
+            if mnemonic == INSTRUCTION_ADD:
+                opcode = OPCODE_ADD_REGISTER if withRegister else OPCODE_ADD_VALUE
+            else:
+                opcode = OPCODE_SUB_REGISTER if withRegister else OPCODE_SUB_VALUE
+            if withRegister:
+                return opcode, register, self._operand(int(operands[1][1:]), instruction)
+            return opcode, register, self._value(int(operands[1]), instruction)
+        if mnemonic == INSTRUCTION_SET:
+            return OPCODE_SET, register, self._value(int(operands[1]), instruction)
+        opcodes = {INSTRUCTION_LOAD: OPCODE_LOAD, INSTRUCTION_STORE: OPCODE_STORE,
+                   INSTRUCTION_JZ: OPCODE_JZ, INSTRUCTION_JNZ: OPCODE_JNZ}
+        return opcodes[mnemonic], register, self._operand(int(operands[1]), instruction)
+
+    @classmethod
+    def _operand(self, value, instruction):
+        if not 0 <= value < OPERAND_NONE:
+            raise Exception("\n*\n* ERROR \n*\n Operando fuera de rango en: {instruction}".format(instruction=instruction))
+        return value
+
+    @classmethod
+    def _value(self, value, instruction):
+        if not VALUE_MIN <= value <= VALUE_MAX:
+            raise Exception("\n*\n* ERROR \n*\n Valor fuera de rango en: {instruction}".format(instruction=instruction))
+        return value & 0xFFFF
 
 
 ##  Estas son la interrupciones soportadas por nuestro Kernel
-KILL_INTERRUPTION_TYPE = "#KILL"
-IO_IN_INTERRUPTION_TYPE = "#IO_IN"
-IO_OUT_INTERRUPTION_TYPE = "#IO_OUT"
-NEW_INTERRUPTION_TYPE = "#NEW"
-TIMEOUT_INTERRUPTION_TYPE = "#TIMEOUT"
-PAGE_FAULT_INTERRUPTION_TYPE = "#PAGE_FAULT"
+##  (codigos enteros: el vector de interrupciones es una lista indexada por el tipo)
+class InterruptionType(IntEnum):
+    KILL = 0
+    IO_IN = 1
+    IO_OUT = 2
+    NEW = 3
+    TIMEOUT = 4
+    PAGE_FAULT = 5
+    PROTECTION_FAULT = 6
+    FORK = 7
+
+    def __str__(self):
+        return "#" + self.name
+
+    def __repr__(self):
+        return str(self)
+
+    def __format__(self, formatSpec):
+        return format(str(self), formatSpec)
+
+
+KILL_INTERRUPTION_TYPE = InterruptionType.KILL
+IO_IN_INTERRUPTION_TYPE = InterruptionType.IO_IN
+IO_OUT_INTERRUPTION_TYPE = InterruptionType.IO_OUT
+NEW_INTERRUPTION_TYPE = InterruptionType.NEW
+TIMEOUT_INTERRUPTION_TYPE = InterruptionType.TIMEOUT
+PAGE_FAULT_INTERRUPTION_TYPE = InterruptionType.PAGE_FAULT
+PROTECTION_FAULT_INTERRUPTION_TYPE = InterruptionType.PROTECTION_FAULT
+FORK_INTERRUPTION_TYPE = InterruptionType.FORK
+
+##  Clases de interrupciones del controlador, de mayor a menor prioridad
+##  las excepciones y los traps los produce la instruccion en curso y se atienden en el momento,
+##  el resto se encola y se atiende en el limite del tick
+IRQ_CLASS_EXCEPTION = 0
+IRQ_CLASS_TRAP = 1
+IRQ_CLASS_TIMER = 2
+IRQ_CLASS_DEVICE = 3
+IRQ_CLASS_SOFTWARE = 4
+IRQ_CLASSES = {
+    PAGE_FAULT_INTERRUPTION_TYPE: IRQ_CLASS_EXCEPTION,
+    PROTECTION_FAULT_INTERRUPTION_TYPE: IRQ_CLASS_EXCEPTION,
+    KILL_INTERRUPTION_TYPE: IRQ_CLASS_TRAP,
+    IO_IN_INTERRUPTION_TYPE: IRQ_CLASS_TRAP,
+    FORK_INTERRUPTION_TYPE: IRQ_CLASS_TRAP,
+    TIMEOUT_INTERRUPTION_TYPE: IRQ_CLASS_TIMER,
+    IO_OUT_INTERRUPTION_TYPE: IRQ_CLASS_DEVICE,
+    NEW_INTERRUPTION_TYPE: IRQ_CLASS_SOFTWARE,
+}
+
+##  Configuracion del dispositivo de swap
+SWAP_FILE_PATH = "swap.bin"
+SWAP_DEVICE_TIME = 2
+SWAP_CELL_SIZE = 32
+
+##  Configuracion de la TLB (cantidad de entradas y de vias por conjunto)
+TLB_SIZE = 16
+TLB_WAYS = 4
 
 
 ## emulates an Interrupt request
 class IRQ:
 
+    __slots__ = ('_type', '_parameters', '_raisedTick', '_pooled')
+
+    ## IRQs ya atendidos que se reusan en los caminos calientes (TIMEOUT, IO, KILL)
+    _free = []
+
     def __init__(self, type, parameters=None):
         self._type = type
         self._parameters = parameters
+        self._raisedTick = 0
+        self._pooled = False
+
+    ## takes an irq from the pool (or creates one): the interrupt vector gives it back once it was handled
+    @classmethod
+    def acquire(cls, type, parameters=None):
+        try:
+            irq = cls._free.pop()
+        except IndexError:
+            irq = cls(type, parameters)
+            irq._pooled = True
+            return irq
+        irq._type = type
+        irq._parameters = parameters
+        return irq
+
+    def release(self):
+        if self._pooled:
+            self._parameters = None
+            IRQ._free.append(self)
 
     @property
     def parameters(self):
@@ -59,23 +459,138 @@ class IRQ:
     def type(self):
         return self._type
 
+    ## tick en el que se levanto la interrupcion (para medir la latencia hasta atenderla)
+    @property
+    def raisedTick(self):
+        return self._raisedTick
+
+    @raisedTick.setter
+    def raisedTick(self, tick):
+        self._raisedTick = tick
+
 
-## emulates the Interrupt Vector Table
+## emulates the Interrupt Vector Table and the interrupt controller:
+## the top half of an irq (stamp, count, acknowledge the device) runs when it is raised,
+## the bottom half (the kernel handler) runs when its priority and mask allow it
 class InterruptVector():
 
-    def __init__(self):
-        self._handlers = dict()
-        self.lock = Lock()
+    def __init__(self, clock=None):
+        self._handlers = [None] * len(InterruptionType)
+        self._classes = [IRQ_CLASSES[type] for type in InterruptionType]
+        self._clock = clock
+        self._counts = dict()
+        ## handled irqs, total latency and maximum latency (in ticks) of each type
+        self._latencies = dict()
+        ## pending bottom halves ordered by (class, arrival): a heap
+        self._pending = []
+        self._arrivals = 0
+        self._masked = set()
+        ## IRQs posted by other threads (device workers, the user program), waiting for the tick boundary: (irq, acknowledge)
+        self._posted = SimpleQueue()
+        ## the thread that drives the clock: the only one that runs handlers, so no lock is needed
+        self._owner = None
+        self._handling = False
 
     def register(self, interruptionType, interruptionHandler):
         self._handlers[interruptionType] = interruptionHandler
 
+    ## raises an irq: exceptions and traps of the running instruction are handled right away,
+    ## the rest is handled at the tick boundary (also the traps raised from inside another handler)
     def handle(self, irq):
+        if get_ident() != self._owner:
+            self.post(irq)
+            return
+        irq.raisedTick = self._currentTick()
+        irqClass = self._classes[irq.type]
+        if irqClass == IRQ_CLASS_EXCEPTION or (irqClass == IRQ_CLASS_TRAP and not self._handling):
+            self._dispatch(irq)
+        else:
+            self._enqueue(irq)
+
+    ## thread safe: can be called from any thread, the irq is handled at the next tick boundary
+    def post(self, irq, acknowledge=None):
+        irq.raisedTick = self._currentTick()
+        self._posted.put((irq, acknowledge))
+
+    ## the clock subscribes the controller after the devices and the timer: drains what they raised in this tick
+    def tick(self, tickNbr):
+        self.handlePending()
+
+    def handlePending(self):
+        self._owner = get_ident()
+        if self._handling:
+            return
+        ## top halves of the posted irqs
+        while True:
+            try:
+                irq, acknowledge = self._posted.get_nowait()
+            except Empty:
+                break
+            if acknowledge is not None:
+                acknowledge()
+            self._enqueue(irq)
+        ## bottom halves by priority, the masked classes stay pending
+        masked = []
+        while self._pending:
+            entry = heappop(self._pending)
+            if entry[0] in self._masked:
+                masked.append(entry)
+            else:
+                self._dispatch(entry[2])
+        for entry in masked:
+            heappush(self._pending, entry)
+
+    def mask(self, irqClass):
+        if irqClass in (IRQ_CLASS_EXCEPTION, IRQ_CLASS_TRAP):
+            raise Exception("\n*\n* ERROR \n*\n Las interrupciones de clase {irqClass} no se pueden enmascarar".format(
+                irqClass=irqClass))
+        self._masked.add(irqClass)
+
+    def unmask(self, irqClass):
+        self._masked.discard(irqClass)
+
+    def isMasked(self, irqClass):
+        return irqClass in self._masked
+
+    @property
+    def pendingCount(self):
+        return len(self._pending) + self._posted.qsize()
+
+    ## handled irqs of each type
+    @property
+    def counts(self):
+        return self._counts
+
+    ## handled irqs of each type per simulated second (every tick of the clock is a second)
+    def rates(self, seconds):
+        return {type: count / max(seconds, 1) for type, count in self._counts.items()}
+
+    ## average and maximum ticks from raise to handling of each type
+    @property
+    def latencies(self):
+        return {type: (total / handled, maximum) for type, (handled, total, maximum) in self._latencies.items()}
+
+    def _currentTick(self):
+        if self._clock is None:
+            return 0
+        return self._clock.currentTick
+
+    def _enqueue(self, irq):
+        heappush(self._pending, (self._classes[irq.type], self._arrivals, irq))
+        self._arrivals += 1
+
+    def _dispatch(self, irq):
         log.logger.info(
             "Handling {type} irq with parameters = {parameters}".format(type=irq.type, parameters=irq.parameters))
-        self.lock.acquire()
+        self._counts[irq.type] = self._counts.get(irq.type, 0) + 1
+        latency = self._currentTick() - irq.raisedTick
+        handled, total, maximum = self._latencies.get(irq.type, (0, 0, 0))
+        self._latencies[irq.type] = (handled + 1, total + latency, max(maximum, latency))
+        nested = self._handling
+        self._handling = True
         self._handlers[irq.type].execute(irq)
-        self.lock.release()
+        self._handling = nested
+        irq.release()
 
 
 ## emulates the Internal Clock
@@ -84,6 +599,11 @@ class Clock():
     def __init__(self):
         self._subscribers = []
         self._running = False
+        self._currentTick = 0
+
+    @property
+    def currentTick(self):
+        return self._currentTick
 
     def addSubscriber(self, subscriber):
         self._subscribers.append(subscriber)
@@ -104,6 +624,7 @@ class Clock():
             tickNbr += 1
 
     def tick(self, tickNbr):
+        self._currentTick = tickNbr
         log.logger.info("        --------------- tick: {tickNbr} ---------------".format(tickNbr=tickNbr))
         ## notify all subscriber that a new clock cycle has started
         for subscriber in self._subscribers:
@@ -123,9 +644,16 @@ class Memory():
     def __init__(self, size):
         self._size = size
         self._cells = [''] * size
+        self._writeSubscribers = []
+
+    ## los que guardan algo derivado del contenido (como las instrucciones decodificadas del cpu) se enteran de cada escritura
+    def addWriteSubscriber(self, subscriber):
+        self._writeSubscribers.append(subscriber)
 
     def write(self, addr, value):
         self._cells[addr] = value
+        for subscriber in self._writeSubscribers:
+            subscriber.written(addr)
 
     def read(self, addr):
         return self._cells[addr]
@@ -139,14 +667,228 @@ class Memory():
         ##return "Memoria = {mem}".format(mem=self._cells)
 
 
+## emulates the swap device: a preallocated file on the host disk
+## where the pages evicted from main memory are stored
+class SwapDevice():
+
+    def __init__(self, size, path, deviceTime, useMmap=False):
+        self._size = size
+        self._path = path
+        self._deviceTime = deviceTime
+        self._frameSize = 0
+        self._reads = 0
+        self._writes = 0
+        self._latencyTicks = 0
+        self._file = None
+        self._mmap = None
+        ## without swap there is no backing file
+        if size > 0:
+            ## preallocate the backing file (every cell takes SWAP_CELL_SIZE bytes)
+            self._file = open(path, "w+b")
+            self._file.write(bytes(size * SWAP_CELL_SIZE))
+            self._file.flush()
+            if useMmap:
+                self._mmap = mmap.mmap(self._file.fileno(), size * SWAP_CELL_SIZE)
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def deviceTime(self):
+        return self._deviceTime
+
+    @property
+    def frameSize(self):
+        return self._frameSize
+
+    @frameSize.setter
+    def frameSize(self, frameSize):
+        self._frameSize = frameSize
+
+    @property
+    def slots(self):
+        if self._frameSize == 0:
+            return 0
+        return self._size // self._frameSize
+
+    @property
+    def reads(self):
+        return self._reads
+
+    @property
+    def writes(self):
+        return self._writes
+
+    @property
+    def latencyTicks(self):
+        return self._latencyTicks
+
+    ## writes a whole page (frameSize cells) in the given slot, returns the ticks it took
+    def write(self, slot, cells):
+        data = b"".join(self._encode(cell) for cell in cells)
+        data = data.ljust(self._frameSize * SWAP_CELL_SIZE, b"\0")
+        offset = self._slotOffset(slot)
+        if self._mmap is not None:
+            self._mmap[offset:offset + len(data)] = data
+        else:
+            self._file.seek(offset)
+            self._file.write(data)
+        self._writes += 1
+        self._latencyTicks += self._deviceTime
+        return self._deviceTime
+
+    ## reads a whole page (frameSize cells) from the given slot, returns the cells read
+    def read(self, slot):
+        return self.readMany([slot])[0]
+
+    ## reads several pages in a single operation (paying the device time once), returns the cells of each slot
+    def readMany(self, slots):
+        pages = [self._readSlot(slot) for slot in slots]
+        self._reads += 1
+        self._latencyTicks += self._deviceTime
+        return pages
+
+    def _readSlot(self, slot):
+        offset = self._slotOffset(slot)
+        length = self._frameSize * SWAP_CELL_SIZE
+        if self._mmap is not None:
+            data = self._mmap[offset:offset + length]
+        else:
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return [self._decode(data[i:i + SWAP_CELL_SIZE]) for i in range(0, length, SWAP_CELL_SIZE)]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _slotOffset(self, slot):
+        if not 0 <= slot < self.slots:
+            raise Exception("Invalid swap slot {slot}, the device has {slots} slots".format(slot=slot, slots=self.slots))
+        return slot * self._frameSize * SWAP_CELL_SIZE
+
+    ## every cell takes SWAP_CELL_SIZE bytes: a longer value is rejected before anything is written
+    def _encode(self, cell):
+        data = repr(cell).encode("utf-8")
+        if len(data) > SWAP_CELL_SIZE:
+            raise Exception("\n*\n* ERROR \n*\n The cell value {cell} takes {length} bytes, a swap cell holds {size}".format(
+                cell=cell, length=len(data), size=SWAP_CELL_SIZE))
+        return data.ljust(SWAP_CELL_SIZE, b"\0")
+
+    def _decode(self, data):
+        data = data.rstrip(b"\0")
+        if not data:
+            return ''
+        return literal_eval(data.decode("utf-8"))
+
+    def __repr__(self):
+        return "SwapDevice({path}, slots={slots}, reads={reads}, writes={writes})".format(
+            path=self._path, slots=self.slots, reads=self._reads, writes=self._writes)
+
+
+## emulates the Translation Lookaside Buffer (TLB)
+## set associative cache of translations tagged with the address space id (asid) of the process
+class TLB():
+
+    def __init__(self, size, ways):
+        if size < 1 or ways < 1 or size % ways != 0:
+            raise Exception("Invalid TLB geometry: {size} entries with {ways} ways".format(size=size, ways=ways))
+        self._size = size
+        self._ways = ways
+        ## every set keeps its entries in LRU order: (asid, pageId) -> (frameId, writable)
+        self._sets = [OrderedDict() for _ in range(size // ways)]
+        self._hits = 0
+        self._misses = 0
+        self._flushes = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def ways(self):
+        return self._ways
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def flushes(self):
+        return self._flushes
+
+    @property
+    def hitRate(self):
+        lookups = self._hits + self._misses
+        if lookups == 0:
+            return 0.0
+        return self._hits / lookups
+
+    def _setOf(self, pageId):
+        return self._sets[pageId % len(self._sets)]
+
+    def lookup(self, asid, pageId):
+        entries = self._setOf(pageId)
+        key = (asid, pageId)
+        if key in entries:
+            entries.move_to_end(key)
+            self._hits += 1
+            return entries[key]
+        self._misses += 1
+        return None
+
+    def insert(self, asid, pageId, frameId, writable=False):
+        entries = self._setOf(pageId)
+        key = (asid, pageId)
+        if key not in entries and len(entries) >= self._ways:
+            ## evict the least recently used entry of the set
+            entries.popitem(last=False)
+        entries[key] = (frameId, writable)
+        entries.move_to_end(key)
+
+    def invalidate(self, asid, pageId):
+        self._setOf(pageId).pop((asid, pageId), None)
+
+    def flush(self, asid=None):
+        self._flushes += 1
+        for entries in self._sets:
+            if asid is None:
+                entries.clear()
+            else:
+                for key in [key for key in entries if key[0] == asid]:
+                    del entries[key]
+
+    def __repr__(self):
+        return "TLB(size={size}, ways={ways}, hits={hits}, misses={misses}, flushes={flushes}, hitRate={rate:.2f})".format(
+            size=self._size, ways=self._ways, hits=self._hits, misses=self._misses, flushes=self._flushes,
+            rate=self.hitRate)
+
+
 ## emulates the Memory Management Unit (MMU)
 class MMU():
 
-    def __init__(self, memory):
+    def __init__(self, memory, interruptVector, tlb):
         self._memory = memory
+        self._interruptVector = interruptVector
         self._frameSize = 0
         self._limit = 999
-        self._tlb = dict()
+        self._tlb = tlb
+        self._asid = None
+        self._pageTable = None
+        self._referenceSubscribers = []
 
     @property
     def limit(self):
@@ -164,13 +906,67 @@ class MMU():
     def frameSize(self, frameSize):
         self._frameSize = frameSize
 
+    @property
+    def memory(self):
+        return self._memory
+
+    @property
+    def tlb(self):
+        return self._tlb
+
+    ## address space id of the running process, used to tag the TLB entries
+    @property
+    def asid(self):
+        return self._asid
+
+    @asid.setter
+    def asid(self, asid):
+        self._asid = asid
+
+    ## page table of the running process, walked on every TLB miss
+    @property
+    def pageTable(self):
+        return self._pageTable
+
+    @pageTable.setter
+    def pageTable(self, pageTable):
+        self._pageTable = pageTable
+
+    def addReferenceSubscriber(self, subscriber):
+        self._referenceSubscribers.append(subscriber)
+
     def resetTLB(self):
-        self._tlb = dict()
+        self._tlb.flush()
 
     def setPageFrame(self, pageId, frameId):
-        self._tlb[pageId] = frameId
+        self._tlb.insert(self._asid, pageId, frameId)
+
+    def invalidatePage(self, asid, pageId):
+        self._tlb.invalidate(asid, pageId)
+
+    def flushASID(self, asid):
+        self._tlb.flush(asid)
+
+    def _walkPageTable(self, pageId):
+        if self._pageTable is None:
+            return None
+        frameId = self._pageTable.frameDePagina(pageId)
+        if frameId is None:
+            return None
+        return (frameId, self._pageTable.esEscribible(pageId))
 
     def fetch(self, logicalAddress):
+        # obtenemos la instrucción alocada en esa direccion
+        return self._memory.read(self._translate(logicalAddress, False))
+
+    ## la direccion fisica de una lectura (con los mismos page faults y referencias que fetch)
+    def physicalAddress(self, logicalAddress):
+        return self._translate(logicalAddress, False)
+
+    def write(self, logicalAddress, value):
+        self._memory.write(self._translate(logicalAddress, True), value)
+
+    def _translate(self, logicalAddress, write):
         if (logicalAddress > self._limit):
             raise Exception(
                 "Invalid Address,  {logicalAddress} is higher than process limit: {limit}".format(limit=self._limit,
@@ -180,19 +976,39 @@ class MMU():
         pageId = logicalAddress // self._frameSize
         offset = logicalAddress % self._frameSize
         #
-        # buscamos la direccion Base del frame donde esta almacenada la pagina
-        try:
-            frameId = self._tlb[pageId]
-        except:
-            raise Exception(
-                "\n*\n* ERROR \n*\n Error en el MMU\nNo se cargo la pagina  {pageId}".format(pageId=str(pageId)))
+        # buscamos la direccion Base del frame donde esta almacenada la pagina:
+        # primero en la TLB y si no esta recorremos la page table del proceso
+        entry = self._tlb.lookup(self._asid, pageId)
+        if entry is None:
+            entry = self._walkPageTable(pageId)
+            if entry is None:
+                # si la pagina no esta en memoria, el S.O. la tiene que cargar (page fault)
+                pageFaultIRQ = IRQ(PAGE_FAULT_INTERRUPTION_TYPE, pageId)
+                self._interruptVector.handle(pageFaultIRQ)
+                entry = self._walkPageTable(pageId)
+            if entry is None:
+                raise Exception(
+                    "\n*\n* ERROR \n*\n Error en el MMU\nNo se cargo la pagina  {pageId}".format(pageId=str(pageId)))
+            self._tlb.insert(self._asid, pageId, entry[0], entry[1])
         #
-        ##calculamos la direccion fisica resultante
-        frameBaseDir = self._frameSize * frameId
-        physicalAddress = frameBaseDir + offset
+        # si se escribe una pagina de solo lectura el S.O. decide si la copia (copy on write)
+        if write and not entry[1]:
+            protectionFaultIRQ = IRQ(PROTECTION_FAULT_INTERRUPTION_TYPE, pageId)
+            self._interruptVector.handle(protectionFaultIRQ)
+            self._tlb.invalidate(self._asid, pageId)
+            entry = self._walkPageTable(pageId)
+            if entry is None or not entry[1]:
+                raise Exception(
+                    "\n*\n* ERROR \n*\n Error en el MMU\nLa pagina {pageId} es de solo lectura".format(pageId=str(pageId)))
+            self._tlb.insert(self._asid, pageId, entry[0], entry[1])
         #
-        # obtenemos la instrucción alocada en esa direccion
-        return self._memory.read(physicalAddress)
+        ## avisamos la referencia (como el bit de referencia de la pagina) a quien lleve la cuenta del working set
+        for subscriber in self._referenceSubscribers:
+            subscriber.referencia(self._asid, pageId)
+        #
+        ##calculamos la direccion fisica resultante
+        frameBaseDir = self._frameSize * entry[0]
+        return frameBaseDir + offset
 
 
 ## emulates the main Central Processor Unit
@@ -203,9 +1019,53 @@ class Cpu():
         self._interruptVector = interruptVector
         self._pc = -1
         self._ir = None
+        self._address = None  ## direccion fisica de la instruccion en curso (la deja _fetch)
+        self._handler = None
+        self._operands = ()
+        self._stallTicks = 0
+        self._registers = [0] * REGISTER_COUNT
+        ## instrucciones decodificadas por frame fisico: frame -> [(handler, operandos, instruccion) por offset]
+        ## se descarta el frame entero cuando se escribe cualquier celda suya
+        self._decodedFrames = dict()
+        self._decodeHits = 0
+        self._decodeMisses = 0
+        self._decoders = {
+            INSTRUCTION_CPU: self._decodeNoOperands,
+            INSTRUCTION_EXIT: self._decodeNoOperands,
+            INSTRUCTION_FORK: self._decodeNoOperands,
+            INSTRUCTION_IO: self._decodeIO,
+            INSTRUCTION_WRITE: self._decodeWrite,
+            INSTRUCTION_SET: self._decodeRegisterValue,
+            INSTRUCTION_LOAD: self._decodeRegisterValue,
+            INSTRUCTION_STORE: self._decodeRegisterValue,
+            INSTRUCTION_JZ: self._decodeRegisterValue,
+            INSTRUCTION_JNZ: self._decodeRegisterValue,
+            INSTRUCTION_ADD: self._decodeArithmetic,
+            INSTRUCTION_SUB: self._decodeArithmetic,
+            INSTRUCTION_JMP: self._decodeJump,
+        }
+        self._handlers = {
+            INSTRUCTION_CPU: self._executeCPU,
+            INSTRUCTION_EXIT: self._executeEXIT,
+            INSTRUCTION_FORK: self._executeFORK,
+            INSTRUCTION_IO: self._executeIO,
+            INSTRUCTION_WRITE: self._executeWRITE,
+            INSTRUCTION_SET: self._executeSET,
+            INSTRUCTION_LOAD: self._executeLOAD,
+            INSTRUCTION_STORE: self._executeSTORE,
+            INSTRUCTION_JZ: self._executeJZ,
+            INSTRUCTION_JNZ: self._executeJNZ,
+            INSTRUCTION_JMP: self._executeJMP,
+        }
 
     def tick(self, tickNbr):
-        if (self.isBusy()):
+        ## the pending interrupts are handled at the tick boundary, before the next instruction
+        self._interruptVector.handlePending()
+        if self._stallTicks > 0:
+            ## the cpu is waiting for a synchronous swap operation
+            self._stallTicks -= 1
+            log.logger.info("cpu - STALL: waiting for swap, {ticks} ticks left".format(ticks=self._stallTicks))
+        elif (self.isBusy()):
             self._fetch()
             self._decode()
             self._execute()
@@ -213,26 +1073,129 @@ class Cpu():
             log.logger.info("cpu - NOOP")
 
     def _fetch(self):
-        self._ir = self._mmu.fetch(self._pc)
+        ## la traduccion se hace siempre (page faults, TLB, referencias); la memoria se lee solo si hay que decodificar
+        self._address = self._mmu.physicalAddress(self._pc)
         self._pc += 1
 
     def _decode(self):
-        ## decode no hace nada en este caso
-        pass
+        frame, offset = divmod(self._address, self._mmu.frameSize)
+        decoded = self._decodedFrames.get(frame)
+        if decoded is None:
+            decoded = [None] * self._mmu.frameSize
+            self._decodedFrames[frame] = decoded
+        entry = decoded[offset]
+        if entry is None:
+            self._decodeMisses += 1
+            instruction = self._mmu.memory.read(self._address)
+            decoder = self._decoders.get(ASM.mnemonicOf(instruction), self._decodeNoOperands)
+            entry = decoder(instruction)
+            decoded[offset] = entry
+        else:
+            self._decodeHits += 1
+        self._handler, self._operands, self._ir = entry
 
     def _execute(self):
-        if ASM.isEXIT(self._ir):
-            killIRQ = IRQ(KILL_INTERRUPTION_TYPE)
-            self._interruptVector.handle(killIRQ)
-        elif ASM.isIO(self._ir):
-            ioInIRQ = IRQ(IO_IN_INTERRUPTION_TYPE, self._ir)
-            self._interruptVector.handle(ioInIRQ)
-        else:
-            log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._handler(*self._operands)
+
+    ## the memory tells every write: the decoded instructions of that frame are no longer valid
+    def written(self, addr):
+        if self._decodedFrames:
+            self._decodedFrames.pop(addr // self._mmu.frameSize, None)
+
+    ## decoders: turn an instruction into (handler, operands, instruction) once per frame load
+    def _decodeNoOperands(self, instruction):
+        return self._handlers.get(instruction, self._executeCPU), (), instruction
+
+    def _decodeIO(self, instruction):
+        return self._executeIO, (instruction,), instruction
+
+    def _decodeWrite(self, instruction):
+        return self._executeWRITE, (ASM.addressOf(instruction),), instruction
+
+    def _decodeRegisterValue(self, instruction):
+        register, value = ASM.operandsOf(instruction)
+        return self._handlers[ASM.mnemonicOf(instruction)], (int(register[1:]), int(value)), instruction
+
+    def _decodeArithmetic(self, instruction):
+        register, operand = ASM.operandsOf(instruction)
+        sign = -1 if ASM.mnemonicOf(instruction) == INSTRUCTION_SUB else 1
+        if ASM.isRegister(operand):
+            return self._executeAddRegister, (int(register[1:]), int(operand[1:]), sign), instruction
+        return self._executeAddValue, (int(register[1:]), sign * int(operand)), instruction
+
+    def _decodeJump(self, instruction):
+        return self._executeJMP, (int(ASM.operandsOf(instruction)[0]),), instruction
+
+    ## handlers
+    def _executeCPU(self):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+
+    def _executeEXIT(self):
+        killIRQ = IRQ.acquire(KILL_INTERRUPTION_TYPE)
+        self._interruptVector.handle(killIRQ)
+
+    def _executeIO(self, instruction):
+        ioInIRQ = IRQ.acquire(IO_IN_INTERRUPTION_TYPE, instruction)
+        self._interruptVector.handle(ioInIRQ)
+
+    def _executeWRITE(self, address):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._mmu.write(address, WRITE_VALUE)
+
+    def _executeFORK(self):
+        forkIRQ = IRQ(FORK_INTERRUPTION_TYPE)
+        self._interruptVector.handle(forkIRQ)
+
+    def _executeSET(self, register, value):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._registers[register] = value
+
+    def _executeLOAD(self, register, address):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        ## las celdas que no tienen un numero (instrucciones, celdas vacias) se leen como 0
+        value = self._mmu.fetch(address)
+        self._registers[register] = value if isinstance(value, int) else 0
+
+    def _executeSTORE(self, register, address):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._mmu.write(address, self._registers[register])
+
+    def _executeAddRegister(self, register, source, sign):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._registers[register] += sign * self._registers[source]
+
+    def _executeAddValue(self, register, value):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._registers[register] += value
+
+    def _executeJMP(self, address):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._pc = address
+
+    def _executeJZ(self, register, address):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        if self._registers[register] == 0:
+            self._pc = address
+
+    def _executeJNZ(self, register, address):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        if self._registers[register] != 0:
+            self._pc = address
+
+    @property
+    def decodeHits(self):
+        return self._decodeHits
+
+    @property
+    def decodeMisses(self):
+        return self._decodeMisses
 
     def isBusy(self):
         return self._pc > -1
 
+    def stall(self, ticks):
+        self._stallTicks += ticks
+
     @property
     def pc(self):
         return self._pc
@@ -241,6 +1204,14 @@ class Cpu():
     def pc(self, addr):
         self._pc = addr
 
+    @property
+    def registers(self):
+        return self._registers
+
+    @registers.setter
+    def registers(self, registers):
+        self._registers[:] = registers
+
     def __repr__(self):
         return "CPU(PC={pc})".format(pc=self._pc)
 
@@ -252,6 +1223,17 @@ class AbstractIODevice():
         self._deviceId = deviceId
         self._deviceTime = deviceTime
         self._busy = False
+        self._worker = None
+        self._jobs = None
+        self._interruptVector = None
+        ## interrupt coalescing: the finished operations are reported together in a single IO_OUT irq
+        self._coalesceCount = 1
+        self._coalesceTicks = 0
+        self._completed = []
+        self._firstCompletionTick = None
+        self._fetchNext = None
+        self._completions = 0
+        self._interrupts = 0
 
     @property
     def deviceId(self):
@@ -265,6 +1247,71 @@ class AbstractIODevice():
     def is_idle(self):
         return not self._busy
 
+    @property
+    def isAsync(self):
+        return self._worker is not None
+
+    @property
+    def completions(self):
+        return self._completions
+
+    @property
+    def interrupts(self):
+        return self._interrupts
+
+    @property
+    def isCoalescing(self):
+        return self._coalesceCount > 1 or self._coalesceTicks > 0
+
+    ## the irq is raised after "count" finished operations or "ticks" ticks after the first one, whatever comes first
+    ## (ticks = 0 is no timeout: a device left without work reports what it has)
+    def setCoalescing(self, count, ticks):
+        self._coalesceCount = max(count, 1)
+        self._coalesceTicks = max(ticks, 0)
+
+    ## while the irq is delayed nobody would start the next operation: the device fetches it by itself
+    ## (like a DMA descriptor ring filled by the driver)
+    def setFetchNext(self, fetchNext):
+        self._fetchNext = fetchNext
+
+    ## asynchronous mode: the operations run in a worker thread that posts the IO_OUT irq when it finishes.
+    ## The worker only gets (operation, deviceTime) from the job queue and hands its result back through the
+    ## posted irq: the device state (busy, counters, buffers) is only touched in the clock thread, by acknowledge.
+    ## The tick in which an operation finishes depends on the real time the worker takes, so runs with
+    ## asynchronous devices are not deterministic: the order of the completions and the tick counts can vary.
+    def startWorker(self, interruptVector):
+        self._interruptVector = interruptVector
+        self._jobs = Queue()
+        self._worker = Thread(target=self.__work, name="device-" + self._deviceId, daemon=True)
+        self._worker.start()
+
+    def stopWorker(self):
+        if self._worker is not None:
+            self._jobs.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def __work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            operation, deviceTime = job
+            result = self.perform(operation, deviceTime)
+            ## the device stays busy until the cpu takes the interrupt (a new irq: the pool belongs to the clock thread)
+            self._interruptVector.post(IRQ(IO_OUT_INTERRUPTION_TYPE, [self._deviceId, [operation]]),
+                                       lambda: self.acknowledge(result))
+
+    ## the actual work of an operation (only in asynchronous mode, runs in the worker thread): returns its result
+    def perform(self, operation, deviceTime):
+        sleep(deviceTime * DEVICE_SECONDS_PER_TICK)
+
+    ## top half of the IO_OUT irq of an asynchronous operation (runs in the clock thread)
+    def acknowledge(self, result=None):
+        self._busy = False
+        self._completions += 1
+        self._interrupts += 1
+
     ## executes an I/O instruction
     def execute(self, operation):
         if (self._busy):
@@ -274,24 +1321,141 @@ class AbstractIODevice():
             self._busy = True
             self._ticksCount = 0
             self._operation = operation
+            if self._worker is not None:
+                self._jobs.put((operation, self._deviceTime))
 
     def tick(self, tickNbr):
+        if self._worker is not None:
+            if self._busy:
+                log.logger.info("device {deviceId} - Busy: running in background".format(deviceId=self.deviceId))
+            return
         if (self._busy):
             self._ticksCount += 1
             if (self._ticksCount > self._deviceTime):
                 ## operation execution has finished
                 self._busy = False
-                ioOutIRQ = IRQ(IO_OUT_INTERRUPTION_TYPE, self._deviceId)
-                HARDWARE.interruptVector.handle(ioOutIRQ)
+                self._completions += 1
+                self._completed.append(self._operation)
+                if self._firstCompletionTick is None:
+                    self._firstCompletionTick = tickNbr
+                if self.isCoalescing and self._fetchNext is not None:
+                    self._fetchNext()
+                if len(self._completed) >= self._coalesceCount:
+                    self._raiseCompletion()
+                elif self._coalesceTicks == 0 and not self._busy:
+                    ## without a timeout nothing else would report them: the device has no next operation
+                    self._raiseCompletion()
             else:
                 log.logger.info("device {deviceId} - Busy: {ticksCount} of {deviceTime}".format(deviceId=self.deviceId,
                                                                                                 ticksCount=self._ticksCount,
                                                                                                 deviceTime=self._deviceTime))
+        if self._completed and self._coalesceTicks > 0 and tickNbr - self._firstCompletionTick >= self._coalesceTicks:
+            self._raiseCompletion()
+
+    def _raiseCompletion(self):
+        completed = self._completed
+        self._completed = []
+        self._firstCompletionTick = None
+        self._interrupts += 1
+        ioOutIRQ = IRQ.acquire(IO_OUT_INTERRUPTION_TYPE, [self._deviceId, completed])
+        HARDWARE.interruptVector.handle(ioOutIRQ)
 
 
 class PrinterIODevice(AbstractIODevice):
     def __init__(self):
-        super(PrinterIODevice, self).__init__("Printer", 3)
+        super(PrinterIODevice, self).__init__(PRINTER_DEVICE, 3)
+
+
+## the disk takes longer the farther the head has to move: the operation "IO Disk n" reads cylinder n
+class DiskIODevice(AbstractIODevice):
+    def __init__(self, cylinders=DISK_CYLINDERS):
+        super(DiskIODevice, self).__init__(DISK_DEVICE, DISK_TRANSFER_TIME)
+        self._cylinders = cylinders
+        self._head = 0
+        self._operations = 0
+        self._totalSeek = 0
+        self._file = None
+        self._buffer = bytearray(DISK_BLOCK_SIZE)
+
+    @property
+    def cylinders(self):
+        return self._cylinders
+
+    @property
+    def head(self):
+        return self._head
+
+    @property
+    def operations(self):
+        return self._operations
+
+    @property
+    def totalSeek(self):
+        return self._totalSeek
+
+    @property
+    def averageSeek(self):
+        if self._operations == 0:
+            return 0.0
+        return self._totalSeek / self._operations
+
+    ## last block read from the backing file (asynchronous mode)
+    @property
+    def buffer(self):
+        return self._buffer
+
+    def startWorker(self, interruptVector, path=DISK_FILE_PATH):
+        ## the disk is backed by a real file with one block per cylinder
+        self._file = open(path, "w+b")
+        self._file.write(bytes(self._cylinders * DISK_BLOCK_SIZE))
+        self._file.flush()
+        super(DiskIODevice, self).startWorker(interruptVector)
+
+    def stopWorker(self):
+        super(DiskIODevice, self).stopWorker()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def perform(self, operation, deviceTime):
+        ## the backing file is only used by the worker (it is opened before it starts and closed after it stops)
+        self._file.seek(ASM.cylinderOf(operation) * DISK_BLOCK_SIZE)
+        block = self._file.read(DISK_BLOCK_SIZE)
+        super(DiskIODevice, self).perform(operation, deviceTime)
+        return block
+
+    def acknowledge(self, result=None):
+        if result is not None:
+            self._buffer[:] = result
+        super(DiskIODevice, self).acknowledge(result)
+
+    ## via: cylinder the head sweeps to before going to the requested one (the edge of the disk in SCAN)
+    def execute(self, operation, via=None):
+        cylinder = ASM.cylinderOf(operation)
+        if not 0 <= cylinder < self._cylinders:
+            raise Exception("Invalid cylinder {cylinder}, the disk has {cylinders} cylinders".format(
+                cylinder=cylinder, cylinders=self._cylinders))
+        distance = 0
+        position = self._head
+        if via is not None:
+            distance += abs(via - position)
+            position = via
+        distance += abs(cylinder - position)
+        self._head = cylinder
+        self._operations += 1
+        self._totalSeek += distance
+        self._deviceTime = DISK_TRANSFER_TIME + -(-distance // DISK_CYLINDERS_PER_TICK)
+        super(DiskIODevice, self).execute(operation)
+
+
+class NetworkIODevice(AbstractIODevice):
+    def __init__(self):
+        super(NetworkIODevice, self).__init__(NETWORK_DEVICE, 4)
+
+
+class TerminalIODevice(AbstractIODevice):
+    def __init__(self):
+        super(TerminalIODevice, self).__init__(TERMINAL_DEVICE, 1)
 
 
 class Timer:
@@ -308,7 +1472,7 @@ class Timer:
         self._tickCount += 1
         if self._active and (self._tickCount > self._quantum) and self._cpu.isBusy():
             # se “cumplio” el limite de ejecuciones
-            timeoutIRQ = IRQ(TIMEOUT_INTERRUPTION_TYPE)
+            timeoutIRQ = IRQ.acquire(TIMEOUT_INTERRUPTION_TYPE)
             self._interruptVector.handle(timeoutIRQ)
         else:
             self._cpu.tick(tickNbr)
@@ -330,17 +1494,29 @@ class Timer:
 class Hardware():
 
     ## Setup our hardware
-    def setup(self, memorySize):
+    def setup(self, memorySize, swapSize=0, swapPath=SWAP_FILE_PATH, swapMmap=False, tlbSize=TLB_SIZE, tlbWays=TLB_WAYS,
+              ioDevices=None, asyncIO=False, coalesceCount=1, coalesceTicks=0):
         ## add the components to the "motherboard"
         self._memory = Memory(memorySize)
-        self._interruptVector = InterruptVector()
+        self._swapDevice = SwapDevice(swapSize, swapPath, SWAP_DEVICE_TIME, swapMmap)
         self._clock = Clock()
-        self._ioDevice = PrinterIODevice()
-        self._mmu = MMU(self._memory)
+        self._interruptVector = InterruptVector(self._clock)
+        if ioDevices is None:
+            ioDevices = [PrinterIODevice(), DiskIODevice(), NetworkIODevice(), TerminalIODevice()]
+        ## every device works on its own: operations on different devices overlap
+        self._ioDevices = OrderedDict((device.deviceId, device) for device in ioDevices)
+        self._mmu = MMU(self._memory, self._interruptVector, TLB(tlbSize, tlbWays))
         self._cpu = Cpu(self._mmu, self._interruptVector)
+        self._memory.addWriteSubscriber(self._cpu)
         self._timer = Timer(self._cpu, self._interruptVector)
-        self._clock.addSubscriber(self._ioDevice)
+        for device in self._ioDevices.values():
+            self._clock.addSubscriber(device)
+            device.setCoalescing(coalesceCount, coalesceTicks)
+            ## asynchronous devices finish in real time: the runs are not deterministic (see startWorker)
+            if asyncIO:
+                device.startWorker(self._interruptVector)
         self._clock.addSubscriber(self._timer)
+        self._clock.addSubscriber(self._interruptVector)
 
     def switchOn(self):
         log.logger.info(" ---- SWITCH ON ---- ")
@@ -348,6 +1524,9 @@ class Hardware():
 
     def switchOff(self):
         self.clock.stop()
+        for device in self._ioDevices.values():
+            device.stopWorker()
+        self._swapDevice.close()
         log.logger.info(" ---- SWITCH OFF ---- ")
 
     @property
@@ -366,13 +1545,21 @@ class Hardware():
     def memory(self):
         return self._memory
 
+    @property
+    def swapDevice(self):
+        return self._swapDevice
+
     @property
     def mmu(self):
         return self._mmu
 
+    @property
+    def ioDevices(self):
+        return self._ioDevices
+
     @property
     def ioDevice(self):
-        return self._ioDevice
+        return self._ioDevices.get(PRINTER_DEVICE)
 
     @property
     def timer(self):
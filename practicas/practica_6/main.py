@@ -2,6 +2,7 @@ from hardware import *
 from so import *
 import log
 import time
+import os
 
 ##
 ##  MAIN
@@ -16,6 +17,7 @@ if __name__ == '__main__':
     estadoDiagramaGantt = None
     frameSize = None
     tamañoMemoria = None
+    tamañoSwap = None
     print("Seleccione un número de scheduler: 1 - Expropiativo, 2 - NoExpropiativo, 3 - FCFS, 4 - RoundRobin")
     while seleccion is None:
         seleccion = input()
@@ -82,8 +84,17 @@ if __name__ == '__main__':
     time.sleep(0.5)
     print("Seleccionaste un tamaño de memoria de " + tamañoMemoria)
     time.sleep(0.5)
-    ## setup our hardware and set memory size to 25 "cells"
-    HARDWARE.setup(int(tamañoMemoria))
+    print("Seleccione un tamaño de swap (en celdas, 0 = sin swap):")
+    while tamañoSwap is None:
+        tamañoSwap = input()
+        if not tamañoSwap.isdigit():
+            print("La ópcion seleccionada no es válida, por favor ingrese una ópcion nuevamente")
+            tamañoSwap = None
+    time.sleep(0.5)
+    print("Seleccionaste un tamaño de swap de " + tamañoSwap)
+    time.sleep(0.5)
+    ## setup our hardware: memory and swap sizes in "cells"
+    HARDWARE.setup(int(tamañoMemoria), int(tamañoSwap))
 
     ## Switch on computer
     HARDWARE.switchOn()
@@ -98,13 +109,8 @@ if __name__ == '__main__':
 
     # "booteamos" el sistema operativo
 
-    prg1 = Program("prg1.exe", [ASM.CPU(10), ASM.IO(), ASM.CPU(3), ASM.IO(), ASM.CPU(2)])
-    prg2 = Program("prg2.exe", [ASM.CPU(4), ASM.IO(), ASM.CPU(1)])
-    prg3 = Program("prg3.exe", [ASM.CPU(3)])
-
-    kernel.fileSystem.write("c:/prg1.exe", prg1)
-    kernel.fileSystem.write("c:/prg2.exe", prg2)
-    kernel.fileSystem.write("c:/prg3.exe", prg3)
+    ## los programas estan en programas/*.asm (prg1.asm queda en c:/prg1.exe)
+    kernel.loader.cargarFuentes(os.path.join(os.path.dirname(os.path.abspath(__file__)), "programas"))
 
     # execute all programs
     kernel.run("c:/prg1.exe", 0)
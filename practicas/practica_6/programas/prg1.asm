@@ -0,0 +1,6 @@
+; prg1: rafagas de cpu separadas por dos operaciones de impresora
+CPU 10
+IO
+CPU 3
+IO
+CPU 2
@@ -0,0 +1,4 @@
+; prg2
+CPU 4
+IO
+CPU
@@ -0,0 +1,2 @@
+; prg3: solo cpu
+CPU 3
@@ -2,6 +2,15 @@
 
 from hardware import *
 from main import *
+from heapq import heappush, heappop
+from bisect import bisect_right
+from collections import deque, Counter
+from enum import IntEnum
+import struct
+import mmap
+import warnings
+import os
+import hashlib
 import log
 
 ## emulates a compiled program
@@ -10,41 +19,279 @@ from tabulate import tabulate
 
 class Program:
 
+    ## las instrucciones se guardan como rafagas [instruccion, cantidad]: ASM.CPU(10000) es un solo segmento
     def __init__(self, name, instructions):
         self._name = name
-        self._instructions = self.expand(instructions)
+        self._segmentos = []
+        self._inicios = []  ## posicion de la primera instruccion de cada segmento (para buscar con bisect)
+        self._size = 0
+        ## sin instrucciones queda vacio, para armarlo de a una con addInstr (como hace el Ensamblador)
+        if instructions:
+            self.expand(instructions)
 
     @property
     def name(self):
         return self._name
 
+    ## arma la lista completa: se usa segmentos o instruccionesEntre, que no expanden las rafagas
     @property
     def instructions(self):
-        return self._instructions
+        warnings.warn("Program.instructions expande todas las rafagas: usar segmentos o instruccionesEntre",
+                      DeprecationWarning, stacklevel=2)
+        return self.instruccionesEntre(0, self._size)
 
-    def addInstr(self, instruction):
-        self._instructions.append(instruction)
+    @property
+    def segmentos(self):
+        return self._segmentos
+
+    @property
+    def size(self):
+        return self._size
+
+    def addInstr(self, instruction, cantidad=1):
+        if self._segmentos and self._segmentos[-1][0] == instruction:
+            self._segmentos[-1][1] += cantidad
+        else:
+            self._inicios.append(self._size)
+            self._segmentos.append([instruction, cantidad])
+        self._size += cantidad
+
+    ## las instrucciones de las posiciones [desde, hasta): solo se recorren los segmentos de ese rango
+    def instruccionesEntre(self, desde, hasta):
+        hasta = min(hasta, self._size)
+        instrucciones = []
+        indice = bisect_right(self._inicios, desde) - 1
+        while desde < hasta:
+            instruccion, cantidad = self._segmentos[indice]
+            fin = min(self._inicios[indice] + cantidad, hasta)
+            instrucciones.extend([instruccion] * (fin - desde))
+            desde = fin
+            indice += 1
+        return instrucciones
+
+    ## una copia con otro nombre (el Ensamblador la usa para los fuentes iguales con distinto nombre de archivo)
+    def renombrado(self, name):
+        programa = Program(name, [])
+        programa._segmentos = [list(segmento) for segmento in self._segmentos]
+        programa._inicios = list(self._inicios)
+        programa._size = self._size
+        return programa
 
     def expand(self, instructions):
-        expanded = []
         for i in instructions:
-            if isinstance(i, list):
+            if isinstance(i, Burst):
+                ## ASM.CPU(n) is a single segment of n equal instructions
+                if len(i) > 0:
+                    self.addInstr(i.instruction, len(i))
+            elif isinstance(i, list):
                 ## is a list of instructions
-                expanded.extend(i)
+                if i and i.count(i[0]) == len(i):
+                    self.addInstr(i[0], len(i))
+                else:
+                    for instruction in i:
+                        self.addInstr(instruction)
             else:
                 ## a single instr (a String)
-                expanded.append(i)
+                self.addInstr(i)
 
         ## now test if last instruction is EXIT
         ## if not... add an EXIT as final instruction
-        last = expanded[-1]
+        last = self._segmentos[-1][0]
         if not ASM.isEXIT(last):
-            expanded.append(INSTRUCTION_EXIT)
+            self.addInstr(INSTRUCTION_EXIT)
+
+    def __repr__(self):
+        return "Program({name}, {segmentos})".format(name=self._name, segmentos=", ".join(
+            str(instruccion) if cantidad == 1 else "{instruccion} x{cantidad}".format(instruccion=instruccion, cantidad=cantidad)
+            for instruccion, cantidad in self._segmentos))
+
+
+################################ IMAGEN BINARIA ########################################
+
+## formato de los ejecutables en disco:
+##   header: magic, version, largo del nombre, cantidad de dispositivos, cantidad de instrucciones,
+##           tamaño de frame y cantidad de paginas con los que se escribio
+##   el nombre del programa y los nombres de los dispositivos que usan sus instrucciones IO (largo + bytes)
+##   el cuerpo: cada instruccion ocupa IMAGEN_INSTRUCCION.size bytes (opcode, dispositivo, operando)
+IMAGEN_MAGIC = b"SOEX"
+IMAGEN_VERSION = 2  ## 2: valores inmediatos con signo
+IMAGEN_EXTENSION = ".img"
+IMAGEN_HEADER = struct.Struct("<4sHHHIII")
+IMAGEN_INSTRUCCION = struct.Struct("<BBH")
+
+
+class EscritorDeImagenes:
+
+    def __init__(self, frameSize):
+        self._frameSize = frameSize
+
+    def escribir(self, programa, path):
+        dispositivos = []
+        cuerpo = bytearray()
+        for instruccion, cantidad in programa.segmentos:
+            cuerpo += IMAGEN_INSTRUCCION.pack(*ASM.encode(instruccion, dispositivos)) * cantidad
+        nombre = programa.name.encode()
+        cantidadPaginas = -(-programa.size // self._frameSize)
+        with open(path, "wb") as archivo:
+            archivo.write(IMAGEN_HEADER.pack(IMAGEN_MAGIC, IMAGEN_VERSION, len(nombre), len(dispositivos), programa.size,
+                                             self._frameSize, cantidadPaginas))
+            archivo.write(nombre)
+            for dispositivo in dispositivos:
+                dispositivo = dispositivo.encode()
+                archivo.write(bytes([len(dispositivo)]) + dispositivo)
+            archivo.write(cuerpo)
+        return path
+
+
+## un programa leido de una imagen binaria: el archivo se mapea en memoria (lo comparten todos los
+## procesos del host que lo abren) y las instrucciones se decodifican recien cuando se carga cada pagina.
+## close (o salir del with) libera el mapeo; si despues se lo vuelve a leer, se mapea de nuevo
+class ProgramaBinario:
+
+    ## con name se ignora el nombre del header (las imagenes del cache del Ensamblador no lo traen);
+    ## con frameSize se rechaza una imagen armada para otro tamaño de frame
+    def __init__(self, path, name=None, frameSize=None):
+        self._path = path
+        self._mmap = None
+        datos = self._mapear()
+        if len(datos) < IMAGEN_HEADER.size:
+            self._rechazar("no es una imagen de programa")
+        magic, version, largoNombre, cantidadDispositivos, self._size, self._frameSize, self._cantidadPaginas = \
+            IMAGEN_HEADER.unpack_from(datos, 0)
+        if magic != IMAGEN_MAGIC or version != IMAGEN_VERSION:
+            self._rechazar("no es una imagen de programa")
+        if frameSize is not None and self._frameSize != frameSize:
+            self._rechazar("tiene paginas de {imagen} celdas y los frames son de {frameSize}".format(
+                imagen=self._frameSize, frameSize=frameSize))
+        if self._frameSize == 0 or self._cantidadPaginas != -(-self._size // self._frameSize):
+            self._rechazar("dice tener {paginas} paginas de {frameSize} celdas para {size} instrucciones".format(
+                paginas=self._cantidadPaginas, frameSize=self._frameSize, size=self._size))
+        offset = IMAGEN_HEADER.size
+        self._name = name if name is not None else datos[offset:offset + largoNombre].decode()
+        offset += largoNombre
+        self._dispositivos = []
+        for dispositivo in range(0, cantidadDispositivos):
+            largo = datos[offset]
+            self._dispositivos.append(datos[offset + 1:offset + 1 + largo].decode())
+            offset += 1 + largo
+        self._cuerpo = offset
+        if len(datos) < self._cuerpo + self._size * IMAGEN_INSTRUCCION.size:
+            self._rechazar("esta truncada: le faltan instrucciones")
+        self._decodificadas = dict()  ## (opcode, dispositivo, operando) -> instruccion, compartida por todas las paginas
+
+    def _mapear(self):
+        if self._mmap is None:
+            with open(self._path, "rb") as archivo:
+                self._mmap = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _rechazar(self, motivo):
+        self.close()
+        raise Exception("\n*\n* ERROR \n*\n La imagen {path} {motivo}".format(path=self._path, motivo=motivo))
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def frameSize(self):
+        return self._frameSize
+
+    @property
+    def cantidadPaginas(self):
+        return self._cantidadPaginas
+
+    ## arma la lista completa: se usa segmentos o instruccionesEntre, que no expanden las rafagas
+    @property
+    def instructions(self):
+        warnings.warn("ProgramaBinario.instructions expande todas las rafagas: usar segmentos o instruccionesEntre",
+                      DeprecationWarning, stacklevel=2)
+        return self.instruccionesEntre(0, self._size)
+
+    ## se agrupan los registros iguales sin decodificar: se decodifica uno por segmento
+    @property
+    def segmentos(self):
+        registros = []
+        fin = self._cuerpo + self._size * IMAGEN_INSTRUCCION.size
+        for registro in IMAGEN_INSTRUCCION.iter_unpack(self._mapear()[self._cuerpo:fin]):
+            if registros and registros[-1][0] == registro:
+                registros[-1][1] += 1
+            else:
+                registros.append([registro, 1])
+        return [[self._decodificar(registro), cantidad] for registro, cantidad in registros]
+
+    def instruccionesEntre(self, desde, hasta):
+        inicio = self._cuerpo + desde * IMAGEN_INSTRUCCION.size
+        fin = self._cuerpo + min(hasta, self._size) * IMAGEN_INSTRUCCION.size
+        return [self._decodificar(registro) for registro in IMAGEN_INSTRUCCION.iter_unpack(self._mapear()[inicio:fin])]
+
+    def _decodificar(self, registro):
+        instruccion = self._decodificadas.get(registro)
+        if instruccion is None:
+            instruccion = ASM.decode(*registro, self._dispositivos)
+            self._decodificadas[registro] = instruccion
+        return instruccion
+
+    def renombrado(self, name):
+        return ProgramaBinario(self._path, name, self._frameSize)
+
+    @property
+    def abierto(self):
+        return self._mmap is not None
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.close()
+
+    ## para pasarlo a otro proceso alcanza con el path: el otro lo vuelve a mapear
+    def __reduce__(self):
+        return ProgramaBinario, (self._path, self._name, self._frameSize)
+
+    def __repr__(self):
+        return "ProgramaBinario({name}, {path}, instrucciones={size})".format(name=self._name, path=self._path,
+                                                                             size=self._size)
 
-        return expanded
+
+## una operacion de entrada/salida esperando su dispositivo
+class PedidoDeIO:
+
+    __slots__ = ('_pcb', '_instruction', '_llegada')
+
+    def __init__(self, pcb, instruction, llegada):
+        self._pcb = pcb
+        self._instruction = instruction
+        self._llegada = llegada
+
+    @property
+    def pcb(self):
+        return self._pcb
+
+    @property
+    def instruction(self):
+        return self._instruction
+
+    @property
+    def llegada(self):
+        return self._llegada
 
     def __repr__(self):
-        return "Program({name}, {instructions})".format(name=self._name, instructions=self._instructions)
+        return "PedidoDeIO(pid={pid}, instruction={instruction}, llegada={llegada})".format(
+            pid=self._pcb.pid, instruction=self._instruction, llegada=self._llegada)
 
 
 ## emulates an Input/Output device controller (driver)
@@ -52,35 +299,275 @@ class IoDeviceController():
 
     def __init__(self, device):
         self._device = device
-        self._waiting_queue = []
-        self._currentPCB = None
+        self._waiting_queue = deque()
+        self._enCurso = deque()  ## pcbs enviados al dispositivo, en el orden en que los va a terminar
+        self._operaciones = 0
+        self._esperaTotal = 0
+        device.setFetchNext(self.__load_from_waiting_queue_if_apply)
+
+    @property
+    def device(self):
+        return self._device
+
+    @property
+    def esperaPromedio(self):
+        if self._operaciones == 0:
+            return 0.0
+        return self._esperaTotal / self._operaciones
 
     def runOperation(self, pcb, instruction):
-        pair = {'pcb': pcb, 'instruction': instruction}
-        # append: adds the element at the end of the queue
-        self._waiting_queue.append(pair)
+        pair = PedidoDeIO(pcb, instruction, HARDWARE.clock.currentTick)
+        # adds the element at the end of the queue
+        self._encolar(pair)
         # try to send the instruction to hardware's device (if is idle)
         self.__load_from_waiting_queue_if_apply()
 
-    def getFinishedPCB(self):
-        finishedPCB = self._currentPCB
-        self._currentPCB = None
+    def getFinishedPCBs(self, cantidad):
+        finishedPCBs = [self._enCurso.popleft() for terminado in range(0, cantidad)]
         self.__load_from_waiting_queue_if_apply()
-        return finishedPCB
+        return finishedPCBs
 
     def __load_from_waiting_queue_if_apply(self):
-        if (len(self._waiting_queue) > 0) and self._device.is_idle:
-            ## pop(): extracts (deletes and return) the first element in queue
-            pair = self._waiting_queue.pop(0)
-            # print(pair)
-            pcb = pair['pcb']
-            instruction = pair['instruction']
-            self._currentPCB = pcb
-            self._device.execute(instruction)
+        if self._hayPendientes() and self._device.is_idle:
+            pair = self._siguiente()
+            self._enCurso.append(pair.pcb)
+            self._operaciones += 1
+            self._esperaTotal += HARDWARE.clock.currentTick - pair.llegada
+            self._ejecutar(pair)
+
+    def _encolar(self, pair):
+        self._waiting_queue.append(pair)
+
+    def _hayPendientes(self):
+        return len(self._waiting_queue) > 0
+
+    def _siguiente(self):
+        ## popleft(): extracts (deletes and return) the first element in queue
+        return self._waiting_queue.popleft()
+
+    def _ejecutar(self, pair):
+        self._device.execute(pair.instruction)
+
+    def estadisticas(self):
+        return "IO {deviceID}: {operaciones} operaciones, {irqs} interrupciones, espera promedio en cola {espera:.2f} ticks".format(
+            deviceID=self._device.deviceId, operaciones=self._operaciones, irqs=self._device.interrupts,
+            espera=self.esperaPromedio)
+
+    def __repr__(self):
+        return "IoDeviceController for {deviceID} running: {enCurso} waiting: {waiting_queue}".format(
+            deviceID=self._device.deviceId, enCurso=list(self._enCurso), waiting_queue=list(self._waiting_queue))
+
+
+class DiskDeviceController(IoDeviceController):
+
+    ## los pedidos al disco no se atienden por orden de llegada sino segun la politica (que mira el cabezal)
+
+    def __init__(self, device, politica):
+        super(DiskDeviceController, self).__init__(device)
+        self._politica = politica
+        self._via = None  ## cilindro por el que pasa el cabezal antes del pedido en curso (el borde en SCAN)
+
+    def _encolar(self, pair):
+        self._politica.agregar(ASM.cylinderOf(pair.instruction), pair)
+
+    def _hayPendientes(self):
+        return self._politica.pendientes > 0
+
+    def _siguiente(self):
+        pair, self._via = self._politica.siguiente(self._device.head, self._device.cylinders)
+        return pair
+
+    def _ejecutar(self, pair):
+        self._device.execute(pair.instruction, self._via)
+
+    def estadisticas(self):
+        return "IO {deviceID} ({politica}): {operaciones} operaciones, {irqs} interrupciones, " \
+               "seek promedio {seek:.2f} cilindros, espera promedio en cola {espera:.2f} ticks".format(
+                   deviceID=self._device.deviceId, politica=self._politica.__class__.__name__,
+                   operaciones=self._operaciones, irqs=self._device.interrupts,
+                   seek=self._device.averageSeek, espera=self.esperaPromedio)
 
     def __repr__(self):
-        return "IoDeviceController for {deviceID} running: {currentPCB} waiting: {waiting_queue}".format(
-            deviceID=self._device.deviceId, currentPCB=self._currentPCB, waiting_queue=self._waiting_queue)
+        return "DiskDeviceController for {deviceID} running: {enCurso} head: {head} waiting: {pendientes}".format(
+            deviceID=self._device.deviceId, enCurso=list(self._enCurso), head=self._device.head,
+            pendientes=self._politica.pendientes)
+
+
+## ############################## POLITICAS DE DISCO ########################################
+
+class IndiceDeCilindros:
+
+    ## cilindros que tienen pedidos pendientes, en un arbol de Fenwick que cuenta los ocupados hasta cada cilindro:
+    ## marcar, desmarcar y buscar el ocupado mas cercano al cabezal en cada sentido son O(log cilindros)
+
+    def __init__(self, cilindros):
+        self._cilindros = cilindros
+        self._arbol = [0] * (cilindros + 1)
+        self._ocupados = 0
+        self._paso = 1 << max(cilindros.bit_length() - 1, 0)
+
+    def _sumar(self, cilindro, valor):
+        indice = cilindro + 1
+        while indice <= self._cilindros:
+            self._arbol[indice] += valor
+            indice += indice & -indice
+        self._ocupados += valor
+
+    def _ocupadosHasta(self, cilindro):
+        ## cuantos cilindros ocupados hay entre 0 y cilindro inclusive
+        total = 0
+        indice = min(cilindro, self._cilindros - 1) + 1
+        while indice > 0:
+            total += self._arbol[indice]
+            indice -= indice & -indice
+        return total
+
+    def _ocupadoNumero(self, orden):
+        ## el cilindro ocupado numero orden (desde 1), bajando por el arbol
+        indice = 0
+        paso = self._paso
+        while paso > 0:
+            if indice + paso <= self._cilindros and self._arbol[indice + paso] < orden:
+                indice += paso
+                orden -= self._arbol[indice]
+            paso >>= 1
+        return indice
+
+    def marcar(self, cilindro):
+        if not 0 <= cilindro < self._cilindros:
+            raise Exception("\n*\n* ERROR \n*\n Cilindro {cilindro} invalido, el disco tiene {cilindros} cilindros".format(
+                cilindro=cilindro, cilindros=self._cilindros))
+        self._sumar(cilindro, 1)
+
+    def desmarcar(self, cilindro):
+        self._sumar(cilindro, -1)
+
+    def primeroDesde(self, cilindro):
+        ## el cilindro ocupado mas bajo que sea >= cilindro, o None
+        anteriores = self._ocupadosHasta(cilindro - 1)
+        if anteriores == self._ocupados:
+            return None
+        return self._ocupadoNumero(anteriores + 1)
+
+    def ultimoHasta(self, cilindro):
+        ## el cilindro ocupado mas alto que sea <= cilindro, o None
+        hasta = self._ocupadosHasta(cilindro)
+        if hasta == 0:
+            return None
+        return self._ocupadoNumero(hasta)
+
+
+class AbstractPoliticaDeDisco:
+
+    ## los pedidos se agrupan por cilindro (en orden de llegada dentro de cada uno) y los cilindros ocupados
+    ## se indexan en un IndiceDeCilindros, asi el pedido mas cercano al cabezal en cada sentido sale en O(log cilindros)
+
+    def __init__(self, cilindros=DISK_CYLINDERS):
+        self._pedidos = dict()  ## cilindro -> pedidos en orden de llegada
+        self._ocupados = IndiceDeCilindros(cilindros)
+        self._cantidadDeCilindros = cilindros
+        self._pendientes = 0
+
+    @property
+    def pendientes(self):
+        return self._pendientes
+
+    def agregar(self, cilindro, pedido):
+        pedidos = self._pedidos.get(cilindro)
+        if pedidos is None:
+            self._ocupados.marcar(cilindro)
+            pedidos = deque()
+            self._pedidos[cilindro] = pedidos
+        pedidos.append(pedido)
+        self._pendientes += 1
+
+    def _sacarDelCilindro(self, cilindro):
+        pedidos = self._pedidos[cilindro]
+        pedido = pedidos.popleft()
+        if not pedidos:
+            del self._pedidos[cilindro]
+            self._ocupados.desmarcar(cilindro)
+        self._pendientes -= 1
+        return pedido
+
+    def siguiente(self, cabezal, cilindros):
+        ## devuelve el proximo pedido y el cilindro por el que pasa el cabezal antes de ir a buscarlo (o None)
+        log.logger.error("-- siguiente MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+
+class PoliticaDeDiscoFCFS(AbstractPoliticaDeDisco):
+
+    def __init__(self, cilindros=DISK_CYLINDERS):
+        super(PoliticaDeDiscoFCFS, self).__init__(cilindros)
+        self._pedidos = deque()
+
+    @property
+    def pendientes(self):
+        return len(self._pedidos)
+
+    def agregar(self, cilindro, pedido):
+        self._pedidos.append(pedido)
+
+    def siguiente(self, cabezal, cilindros):
+        return self._pedidos.popleft(), None
+
+
+class PoliticaDeDiscoSSTF(AbstractPoliticaDeDisco):
+
+    def siguiente(self, cabezal, cilindros):
+        arriba = self._ocupados.primeroDesde(cabezal)
+        abajo = self._ocupados.ultimoHasta(cabezal - 1)
+        if arriba is None or (abajo is not None and cabezal - abajo < arriba - cabezal):
+            return self._sacarDelCilindro(abajo), None
+        return self._sacarDelCilindro(arriba), None
+
+
+class PoliticaDeDiscoSCAN(AbstractPoliticaDeDisco):
+
+    ## ascensor: atiende en un sentido hasta que no quedan pedidos adelante y ahi vuelve;
+    ## SCAN llega hasta el borde del disco antes de volver, LOOK vuelve en el ultimo pedido
+
+    def __init__(self, cilindros=DISK_CYLINDERS):
+        super(PoliticaDeDiscoSCAN, self).__init__(cilindros)
+        self._subiendo = True
+
+    def _hastaElBorde(self, cilindros):
+        if self._subiendo:
+            return cilindros - 1
+        return 0
+
+    def siguiente(self, cabezal, cilindros):
+        via = None
+        if self._subiendo:
+            cilindro = self._ocupados.primeroDesde(cabezal)
+            if cilindro is None:
+                via = self._hastaElBorde(cilindros)
+                self._subiendo = False
+                cilindro = self._ocupados.ultimoHasta(self._cantidadDeCilindros - 1)
+            return self._sacarDelCilindro(cilindro), via
+        cilindro = self._ocupados.ultimoHasta(cabezal)
+        if cilindro is None:
+            via = self._hastaElBorde(cilindros)
+            self._subiendo = True
+            cilindro = self._ocupados.primeroDesde(0)
+        return self._sacarDelCilindro(cilindro), via
+
+
+class PoliticaDeDiscoLOOK(PoliticaDeDiscoSCAN):
+
+    def _hastaElBorde(self, cilindros):
+        return None
+
+
+class PoliticaDeDiscoCLOOK(AbstractPoliticaDeDisco):
+
+    ## atiende solo subiendo: cuando no quedan pedidos adelante salta al pedido mas bajo
+
+    def siguiente(self, cabezal, cilindros):
+        cilindro = self._ocupados.primeroDesde(cabezal)
+        if cilindro is None:
+            cilindro = self._ocupados.primeroDesde(0)
+        return self._sacarDelCilindro(cilindro), None
 
 
 ## ############################## SCHEDULERS ########################################
@@ -167,29 +654,51 @@ class AbstractInterruptionHandler():
     def handlerIn(self, pcb):
         if self.kernel.pcbTable.runningPCB is None:
             self.kernel.dispatcher.load(pcb)
-            pcb.state = "running"
+            pcb.state = EstadoPCB.RUNNING
             self.kernel.pcbTable.runningPCB = pcb
         else:
             pcbInCpu = self.kernel.pcbTable.runningPCB
             if self.kernel.scheduler.mustExpropiate(pcb, pcbInCpu):
                 pcbExpropiado = pcbInCpu
-                pcbExpropiado.state = "ready"
+                pcbExpropiado.state = EstadoPCB.READY
                 self.kernel.dispatcher.save(pcbExpropiado)
                 self.scheduler.readyQueue.add(pcbExpropiado)
                 self.kernel.dispatcher.load(pcb)
-                pcb.state = "running"
+                pcb.state = EstadoPCB.RUNNING
                 self.kernel.pcbTable.runningPCB = pcb
             else:
-                pcb.state = "ready"
+                pcb.state = EstadoPCB.READY
                 self.kernel.scheduler.readyQueue.add(pcb)
 
     def handlerOut(self):
         if self.kernel.scheduler.readyQueue.lista:
             nextPCB = self.scheduler.getPcb()
-            nextPCB.state = "running"
+            nextPCB.state = EstadoPCB.RUNNING
             self.kernel.dispatcher.load(nextPCB)
             self.kernel.pcbTable.runningPCB = nextPCB
 
+    def admitirTrabajos(self):
+        ## se crean los procesos de los trabajos en espera mientras haya memoria para ellos
+        trabajo = self.kernel.colaDeAdmision.siguienteAdmisible()
+        while trabajo is not None:
+            self.crearProceso(trabajo)
+            trabajo = self.kernel.colaDeAdmision.siguienteAdmisible()
+
+    def crearProceso(self, trabajo):
+        program = trabajo.programa
+        pid = self.kernel.pcbTable.getNewPID()
+        pageTable = self.kernel.memoryManager.pageTableDePrograma(program, pid, trabajo.path)
+        baseDir = None
+        primerFrame = pageTable.frameDePagina(0)
+        if primerFrame is not None:
+            baseDir = self.kernel.memoryManager.baseDirDeFrame(primerFrame)
+        limit = program.size - 1
+        pcb = PCB(baseDir, pid, program.name, trabajo.priority, pageTable, limit)
+        self.kernel.pcbTable.add(pcb)
+        if self.kernel.planificadorMedianoPlazo is not None:
+            self.kernel.planificadorMedianoPlazo.reservar(pid, self.kernel.memoryManager.paginasDePrograma(program))
+        self.handlerIn(pcb)
+
 
 class KillInterruptionHandler(AbstractInterruptionHandler):
 
@@ -197,58 +706,77 @@ class KillInterruptionHandler(AbstractInterruptionHandler):
         log.logger.info(" Program Finished ")
         pcb = self.kernel.pcbTable.runningPCB
         self.kernel.dispatcher.save(pcb)
-        pcb.state = "terminated"
+        pcb.state = EstadoPCB.TERMINATED
         self.kernel.pcbTable.remove(pcb.pid)
         self.kernel.pcbTable.runningPCB = None
         self.handlerOut()
         self.kernel.memoryManager.liberarFrameUsado(pcb)
+        if self.kernel.planificadorMedianoPlazo is not None:
+            self.kernel.planificadorMedianoPlazo.olvidar(pcb.pid)
+        self.admitirTrabajos()
         if self.terminoTodosLosProcesos():
             self.kernel.finalizado = True
+            log.logger.info(self.kernel.memoryManager.estadisticasDePaginacion())
+            log.logger.info(HARDWARE.mmu.tlb)
+            log.logger.info(self.kernel.memoryManager.asignadorDeFrames)
+            log.logger.info(self.kernel.colaDeAdmision)
+            for ioDeviceController in self.kernel.ioDeviceControllers.values():
+                log.logger.info(ioDeviceController.estadisticas())
+            segundos = HARDWARE.clock.currentTick + 1
+            log.logger.info("Interrupciones por segundo simulado: {tasas}".format(
+                tasas={tipo: round(tasa, 2) for tipo, tasa in HARDWARE.interruptVector.rates(segundos).items()}))
+            log.logger.info("Latencia de las interrupciones en ticks (promedio, maxima): {latencias}".format(
+                latencias={tipo: (round(promedio, 2), maxima) for tipo, (promedio, maxima) in HARDWARE.interruptVector.latencies.items()}))
+            log.logger.info("Instrucciones decodificadas en cache: {hits} aciertos, {misses} decodificaciones".format(
+                hits=HARDWARE.cpu.decodeHits, misses=HARDWARE.cpu.decodeMisses))
+            if self.kernel.planificadorMedianoPlazo is not None:
+                log.logger.info(self.kernel.planificadorMedianoPlazo)
+            if self.kernel.memoryManager.invertedPageTable is not None:
+                log.logger.info(self.kernel.memoryManager.invertedPageTable)
+            ## ya no hay procesos: lo que quede de los dispositivos y del timer no se atiende
+            HARDWARE.interruptVector.mask(IRQ_CLASS_TIMER)
+            HARDWARE.interruptVector.mask(IRQ_CLASS_DEVICE)
+            self.kernel.fileSystem.cerrar()
+            self.kernel.loader.ensamblador.cerrar()
             HARDWARE.switchOff()
 
     def terminoTodosLosProcesos(self):
-        resultado = True
-        for pcbIndice in self.kernel.pcbTable.tabla:
-            resultado = resultado and pcbIndice.state == "terminated"
-        return resultado
+        return self.kernel.pcbTable.terminaronTodos
 
 
 class IoInInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
         program = irq.parameters
+        ioDeviceController = self.kernel.ioDeviceControllerDe(ASM.deviceOf(program))
         pcb = self.kernel.pcbTable.runningPCB
         self.kernel.pcbTable.runningPCB = None
-        pcb.state = "waiting"
+        pcb.state = EstadoPCB.WAITING
         self.kernel.dispatcher.save(pcb)
-        self.kernel.ioDeviceController.runOperation(pcb, program)
-        log.logger.info(self.kernel.ioDeviceController)
+        ioDeviceController.runOperation(pcb, program)
+        log.logger.info(ioDeviceController)
         self.handlerOut()
 
 
 class IoOutInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
-        pcb = self.kernel.ioDeviceController.getFinishedPCB()
-        log.logger.info(self.kernel.ioDeviceController)
-        self.handlerIn(pcb)
+        ## con coalescing una sola interrupcion informa varias operaciones terminadas
+        deviceId, terminadas = irq.parameters
+        ioDeviceController = self.kernel.ioDeviceControllerDe(deviceId)
+        pcbs = ioDeviceController.getFinishedPCBs(len(terminadas))
+        log.logger.info(ioDeviceController)
+        for pcb in pcbs:
+            self.handlerIn(pcb)
 
 
 class NewInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
-        pathProgram = irq.parameters[0]
-        priority = irq.parameters[1]
-        program = self.kernel.fileSystem.read(pathProgram)
-        pageTable = self.kernel.memoryManager.pageTableDePrograma(program)
-        primerTupla = pageTable.table[0]
-        for tuple in pageTable.table:
-            self.kernel.loader.load(tuple)
-        baseDir = self.kernel.memoryManager.baseDirDeFrame(primerTupla[1])
-        pid = self.kernel.pcbTable.getNewPID()
-        pcb = PCB(baseDir, pid, program.name, priority, pageTable)
-        self.kernel.pcbTable.add(pcb)
-        self.handlerIn(pcb)
+        ## sin trabajo es un reintento de la cola de admision
+        if irq.parameters is not None:
+            self.kernel.colaDeAdmision.encolar(irq.parameters)
+        self.admitirTrabajos()
 
 
 class TimeoutInterruptionHandle(AbstractInterruptionHandler):
@@ -256,7 +784,7 @@ class TimeoutInterruptionHandle(AbstractInterruptionHandler):
     def execute(self, irq):
         if self.scheduler.readyQueue.lista:
             pcbCorriendo = self.kernel.pcbTable.runningPCB
-            pcbCorriendo.state = "ready"
+            pcbCorriendo.state = EstadoPCB.READY
             self.kernel.dispatcher.save(pcbCorriendo)
             self.scheduler.readyQueue.add(pcbCorriendo)
             self.kernel.pcbTable.runningPCB = None
@@ -270,7 +798,46 @@ class PageFaultInterruptionHandler(AbstractInterruptionHandler):
     def execute(self, irq):
         pageIDenMemoria = irq.parameters
         pcb = self.kernel.pcbTable.runningPCB
-        self.kernel.loader.load(pageIDenMemoria, pcb)
+        self.kernel.memoryManager.cargarPaginaDesdeSwap(pcb, pageIDenMemoria)
+        if self.kernel.planificadorMedianoPlazo is not None:
+            self.kernel.planificadorMedianoPlazo.registrarFallo(pcb.pid)
+
+
+class ProtectionFaultInterruptionHandler(AbstractInterruptionHandler):
+
+    def execute(self, irq):
+        pageIDenMemoria = irq.parameters
+        pcb = self.kernel.pcbTable.runningPCB
+        self.kernel.memoryManager.copiarAlEscribir(pcb, pageIDenMemoria)
+
+
+## registro en el que FORK deja su resultado (los pids de los hijos nunca son 0)
+FORK_REGISTRO_DE_RETORNO = 0
+
+
+class ForkInterruptionHandler(AbstractInterruptionHandler):
+
+    def execute(self, irq):
+        padre = self.kernel.pcbTable.runningPCB
+        if irq.parameters is not None:
+            padre = self.kernel.pcbTable.get(irq.parameters)
+        pc = padre.pc
+        registers = padre.registers
+        if padre is self.kernel.pcbTable.runningPCB:
+            pc = HARDWARE.cpu.pc
+            registers = HARDWARE.cpu.registers
+        pid = self.kernel.pcbTable.getNewPID()
+        ## el hijo comparte todos los frames del padre hasta que alguno de los dos escriba (copy on write)
+        pageTable = self.kernel.memoryManager.forkEspacio(padre, pid)
+        hijo = PCB(padre.baseDir, pid, padre.path, padre.priority, pageTable, padre.limit)
+        hijo.pc = pc
+        hijo.registers = list(registers)
+        ## como el valor de retorno de fork(): R0 es 0 en el hijo y el pid del hijo en el padre
+        hijo.registers[FORK_REGISTRO_DE_RETORNO] = 0
+        registers[FORK_REGISTRO_DE_RETORNO] = pid
+        self.kernel.pcbTable.add(hijo)
+        log.logger.info("Fork del proceso {padre}: nuevo proceso {hijo}".format(padre=padre.pid, hijo=pid))
+        self.handlerIn(hijo)
 
 
 class AbstractSeleccionDeVictima:
@@ -286,11 +853,25 @@ class AbstractSeleccionDeVictima:
             return self._pageTable[pid]
 
     def completePageTable(self, pid, pageIDenMemoria, frameDePage, bitValidez):
-        pageTable = self._pageTable[pid]
+        pageTable = self._pageTable.setdefault(pid, dict())
         pageTable[pageIDenMemoria] = (frameDePage, bitValidez)
 
     # bitValidez es un booleano (True = valido, False = invalido)
 
+    def liberarFrame(self, frameDePage):
+        if frameDePage in self._colaDeVictimas:
+            self._colaDeVictimas.remove(frameDePage)
+
+    ## el primer frame de la cola que se puede desalojar (None si ninguno)
+    def seleccionDeVictima(self, desalojable=None):
+        for frame in self._colaDeVictimas:
+            if desalojable is None or desalojable(frame):
+                return frame
+        return None
+
+    def removePageTable(self, pid):
+        self._pageTable.pop(pid, None)
+
 
 class AlgoritmoFIFO(AbstractSeleccionDeVictima):
 
@@ -299,12 +880,10 @@ class AlgoritmoFIFO(AbstractSeleccionDeVictima):
         self._colaDeVictimas = []
 
     def completePageTable(self, pid, pageIDenMemoria, frameDePage, bitValidez):
-        pageTable = self._pageTable[pid]
+        pageTable = self._pageTable.setdefault(pid, dict())
         pageTable[pageIDenMemoria] = (frameDePage, bitValidez)
-        self._colaDeVictimas.append(frameDePage)
-
-    def seleccionDeVictima(self):
-        return self._colaDeVictimas[0]
+        if bitValidez:
+            self._colaDeVictimas.append(frameDePage)
 
 
 class AlgoritmoLRU(AbstractSeleccionDeVictima):
@@ -314,16 +893,209 @@ class AlgoritmoLRU(AbstractSeleccionDeVictima):
         self._colaDeVictimas = []
 
     def completePageTable(self, pid, pageIDenMemoria, frameDePage, bitValidez):
-        pageTable = self._pageTable[pid]
+        pageTable = self._pageTable.setdefault(pid, dict())
         pageTable[pageIDenMemoria] = (frameDePage, bitValidez)
 
         if frameDePage in self._colaDeVictimas:
             self._colaDeVictimas.remove(frameDePage)
 
-        self._colaDeVictimas.append(frameDePage)
+        if bitValidez:
+            self._colaDeVictimas.append(frameDePage)
+
+
+################################ ENSAMBLADOR ########################################
+
+## formato de texto de los programas (un archivo .asm por programa), una instruccion por linea:
+##   .name prg1.exe      nombre del programa (si no esta, el del archivo con extension .exe)
+##   CPU 10              rafaga de 10 instrucciones CPU (CPU sola es una)
+##   IO Disk 57          IO [dispositivo [cilindro]]
+##   WRITE 12            WRITE direccion
+##   FORK / EXIT         despues de FORK, R0 es 0 en el hijo y el pid del hijo en el padre
+##   SET R1 100          registros R0 .. R7: SET, LOAD/STORE Rn direccion, ADD/SUB Rn (Rm | valor)
+##   loop: JNZ R1 loop   JMP direccion, JZ/JNZ Rn direccion; "etiqueta:" nombra la posicion de la linea
+##   DATA 5              una celda de datos con el valor 5 (DATA sola vale 0)
+##   IO Terminal * 3     cualquier instruccion se puede repetir con "* n"
+##   ; comentario        (tambien con #) hasta el fin de la linea
+##  las direcciones pueden ser numeros o etiquetas (tambien las de LOAD, STORE y WRITE)
+FUENTE_EXTENSION = ".asm"
+
+
+class Ensamblador:
+
+    ## los programas ensamblados se guardan por hash del archivo y tamaño de frame: el mismo fuente no se
+    ## vuelve a procesar (con un directorio de cache tambien entre ejecuciones, como imagenes binarias).
+    ## En el cache quedan sin nombre salvo que el fuente tenga .name: el nombre sale del archivo pedido
+    def __init__(self, frameSize, directorioDeCache=None):
+        self._frameSize = frameSize
+        self._directorioDeCache = directorioDeCache
+        self._cache = dict()  ## (hash del fuente, tamaño de frame) -> programa
+        self._aciertos = 0
+
+    @property
+    def directorioDeCache(self):
+        return self._directorioDeCache
+
+    @directorioDeCache.setter
+    def directorioDeCache(self, directorioDeCache):
+        self._directorioDeCache = directorioDeCache
 
-    def seleccionDeVictima(self):
-        return self._colaDeVictimas[0]
+    @property
+    def aciertos(self):
+        return self._aciertos
+
+    def ensamblar(self, path):
+        clave = (self.hashDe(path), self._frameSize)
+        programa = self._cache.get(clave)
+        if programa is None and self._directorioDeCache is not None:
+            imagen = self._imagenEnCache(clave)
+            if os.path.exists(imagen):
+                programa = ProgramaBinario(imagen, frameSize=self._frameSize)
+        if programa is not None:
+            self._aciertos += 1
+        else:
+            programa = self._ensamblarFuente(path, "")
+            if self._directorioDeCache is not None:
+                os.makedirs(self._directorioDeCache, exist_ok=True)
+                EscritorDeImagenes(self._frameSize).escribir(programa, self._imagenEnCache(clave))
+        self._cache[clave] = programa
+        if not programa.name:
+            programa = programa.renombrado(self.nombrePorDefecto(path))
+        return programa
+
+    ## libera el mapeo de las imagenes binarias del cache
+    def cerrar(self):
+        for programa in self._cache.values():
+            if isinstance(programa, ProgramaBinario):
+                programa.close()
+
+    def _imagenEnCache(self, clave):
+        ## con la version en el nombre, las imagenes de otro formato no se confunden con las actuales
+        digest, frameSize = clave
+        return os.path.join(self._directorioDeCache, "{digest}-{frameSize}-v{version}{extension}".format(
+            digest=digest, frameSize=frameSize, version=IMAGEN_VERSION, extension=IMAGEN_EXTENSION))
+
+    def nombrePorDefecto(self, path):
+        return os.path.splitext(os.path.basename(path))[0] + ".exe"
+
+    def hashDe(self, path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as archivo:
+            for bloque in iter(lambda: archivo.read(1 << 16), b""):
+                digest.update(bloque)
+        return digest.hexdigest()
+
+    ## lee el fuente linea por linea anotando donde cae cada etiqueta y cuantas celdas ocupa cada linea;
+    ## despues arma las rafagas del programa con las etiquetas ya resueltas (saltos hacia adelante)
+    def ensamblarFuente(self, path):
+        return self._ensamblarFuente(path, self.nombrePorDefecto(path))
+
+    def _ensamblarFuente(self, path, nombre):
+        lineas = []  ## (numero de linea, campos, cantidad)
+        etiquetas = dict()
+        posicion = 0
+        with open(path) as archivo:
+            for numeroLinea, linea in enumerate(archivo, 1):
+                campos = linea.split(";")[0].split("#")[0].split()
+                while campos and campos[0].endswith(":"):
+                    etiqueta = campos.pop(0)[:-1]
+                    if not etiqueta or etiqueta in etiquetas:
+                        self._error(path, numeroLinea, "etiqueta vacia o repetida: {etiqueta}".format(etiqueta=etiqueta))
+                    etiquetas[etiqueta] = posicion
+                if not campos:
+                    continue
+                if campos[0] == ".name":
+                    if len(campos) != 2 or lineas:
+                        self._error(path, numeroLinea, ".name va antes de las instrucciones y lleva un nombre")
+                    nombre = campos[1]
+                    continue
+                campos, cantidad = self._repeticion(campos, path, numeroLinea)
+                lineas.append((numeroLinea, campos, cantidad))
+                posicion += cantidad
+        if not lineas:
+            self._error(path, 0, "el programa no tiene instrucciones")
+        programa = Program(nombre, [])
+        for numeroLinea, campos, cantidad in lineas:
+            programa.addInstr(self._instruccion(campos, etiquetas, path, numeroLinea), cantidad)
+        if not ASM.isEXIT(programa.segmentos[-1][0]):
+            programa.addInstr(INSTRUCTION_EXIT)
+        return programa
+
+    ## mapea los .asm de un directorio del host: [(nombre del archivo, programa)]
+    def ensamblarDirectorio(self, directorio):
+        return [(nombre, self.ensamblar(os.path.join(directorio, nombre))) for nombre in sorted(os.listdir(directorio))
+                if nombre.endswith(FUENTE_EXTENSION)]
+
+    ## "* n" al final repite la linea; "CPU n" es una rafaga de n
+    def _repeticion(self, campos, path, numeroLinea):
+        cantidad = 1
+        if len(campos) >= 3 and campos[-2] == "*":
+            cantidad = self._entero(campos[-1], path, numeroLinea, 1)
+            campos = campos[:-2]
+        if campos[0].upper() == INSTRUCTION_CPU and len(campos) == 2:
+            cantidad *= self._entero(campos[1], path, numeroLinea, 1)
+            campos = campos[:1]
+        return campos, cantidad
+
+    def _instruccion(self, campos, etiquetas, path, numeroLinea):
+        codigo = campos[0].upper()
+        operandos = campos[1:]
+        if codigo == INSTRUCTION_CPU and not operandos:
+            return INSTRUCTION_CPU
+        if codigo in (INSTRUCTION_EXIT, INSTRUCTION_FORK) and not operandos:
+            return codigo
+        if codigo == INSTRUCTION_WRITE and len(operandos) == 1:
+            return ASM.WRITE(self._direccion(operandos[0], etiquetas, path, numeroLinea))
+        if codigo == INSTRUCTION_IO and len(operandos) <= 2:
+            dispositivo = operandos[0] if operandos else None
+            cilindro = self._entero(operandos[1], path, numeroLinea) if len(operandos) > 1 else None
+            return ASM.IO(dispositivo, cilindro)
+        if codigo == "DATA" and len(operandos) <= 1:
+            return self._entero(operandos[0], path, numeroLinea) if operandos else 0
+        if codigo == INSTRUCTION_JMP and len(operandos) == 1:
+            return ASM.JMP(self._direccion(operandos[0], etiquetas, path, numeroLinea))
+        if codigo in INSTRUCTIONS_WITH_REGISTER and len(operandos) == 2:
+            registro = self._registro(operandos[0], path, numeroLinea)
+            if codigo == INSTRUCTION_SET:
+                return ASM.SET(registro, self._entero(operandos[1], path, numeroLinea))
+            if codigo in (INSTRUCTION_ADD, INSTRUCTION_SUB):
+                operando = operandos[1]
+                if operando.upper().startswith("R"):
+                    operando = self._registro(operando, path, numeroLinea)
+                else:
+                    operando = self._entero(operando, path, numeroLinea)
+                return ASM.ADD(registro, operando) if codigo == INSTRUCTION_ADD else ASM.SUB(registro, operando)
+            direccion = self._direccion(operandos[1], etiquetas, path, numeroLinea)
+            return {INSTRUCTION_LOAD: ASM.LOAD, INSTRUCTION_STORE: ASM.STORE, INSTRUCTION_JZ: ASM.JZ,
+                    INSTRUCTION_JNZ: ASM.JNZ}[codigo](registro, direccion)
+        self._error(path, numeroLinea, "instruccion invalida: {linea}".format(linea=" ".join(campos)))
+
+    def _registro(self, campo, path, numeroLinea):
+        campo = campo.upper()
+        if not (campo.startswith("R") and campo[1:].isdigit() and int(campo[1:]) < REGISTER_COUNT):
+            self._error(path, numeroLinea, "registro invalido: {campo}".format(campo=campo))
+        return campo
+
+    def _direccion(self, campo, etiquetas, path, numeroLinea):
+        if campo.isdigit():
+            return int(campo)
+        if campo not in etiquetas:
+            self._error(path, numeroLinea, "etiqueta desconocida: {campo}".format(campo=campo))
+        return etiquetas[campo]
+
+    ## los inmediatos pueden ser negativos o cero; las rafagas y las repeticiones piden un minimo
+    def _entero(self, campo, path, numeroLinea, minimo=None):
+        try:
+            valor = int(campo)
+        except ValueError:
+            self._error(path, numeroLinea, "se esperaba un numero: {campo}".format(campo=campo))
+        if minimo is not None and valor < minimo:
+            self._error(path, numeroLinea, "se esperaba un numero mayor o igual a {minimo}: {campo}".format(
+                minimo=minimo, campo=campo))
+        return valor
+
+    def _error(self, path, numeroLinea, mensaje):
+        raise Exception("\n*\n* ERROR \n*\n {path}:{linea}: {mensaje}".format(path=path, linea=numeroLinea,
+                                                                              mensaje=mensaje))
 
 
 ################################ LOADER ########################################
@@ -335,38 +1107,45 @@ class Loader:
         self.kernel = kernel
         self._kernel = kernel
         self._frameSize = frameSize
+        self._ensamblador = Ensamblador(frameSize)
 
     @property
     def frameSize(self):
         return self._frameSize
 
-    def load(self, tuple):
-        # loads the program in main memory
-        numeroPagina = tuple[0]
-        pagina = self.kernel.memoryManager.logicalMemory.getPageForId(numeroPagina)
-        numeroFrame = tuple[1]
+    @property
+    def ensamblador(self):
+        return self._ensamblador
+
+    def load(self, imagen, numeroPagina, numeroFrame):
+        # loads the page of the program in main memory
+        pagina = self.kernel.memoryManager.logicalMemory.getPageForId(imagen, numeroPagina)
         baseDir = self.kernel.memoryManager.baseDirDeFrame(numeroFrame)
-        progSize = len(pagina.cells)
         celdaContador = baseDir
-        for index in range(0, progSize):
-            inst = pagina.cells[index]
+        for inst in pagina.cells:
             HARDWARE.memory.write(celdaContador, inst)
             celdaContador += 1
 
-    def dividirProgramaEnPaginas(self, instrucciones):
-        listaIntruccionesAgrupadas = []
-        lista = []
+    def dividirProgramaEnPaginas(self, programa):
+        ## las paginas no copian las instrucciones: las leen del programa recien cuando se cargan en un frame
+        paginas = [Page(idPage, programa, desde, desde + self.frameSize)
+                   for idPage, desde in enumerate(range(0, programa.size, self.frameSize))]
+        log.logger.info("{programa} dividido en {cantidad} paginas".format(programa=programa.name, cantidad=len(paginas)))
+        return paginas
 
-        log.logger.info("instrucciones := {}".format(instrucciones))
-        for instr in instrucciones:
-            lista.append(instr)
-            if len(lista) == self.frameSize:
-                listaIntruccionesAgrupadas.append(lista)
-                lista = []
-        if lista:
-            listaIntruccionesAgrupadas.append(lista)
-        log.logger.info("listaIntruccionesAgrupadas := {}".format(listaIntruccionesAgrupadas))
-        return listaIntruccionesAgrupadas
+    ## mapea las imagenes binarias de un directorio del host y las agrega al FileSystem con su nombre
+    def cargarImagenes(self, directorio, destino="c:/"):
+        programas = [ProgramaBinario(os.path.join(directorio, nombre), frameSize=self.frameSize)
+                     for nombre in sorted(os.listdir(directorio))
+                     if nombre.endswith(IMAGEN_EXTENSION)]
+        self.kernel.fileSystem.importar([(destino.rstrip("/") + "/" + programa.name, programa) for programa in programas])
+        return programas
+
+    ## ensambla los fuentes .asm de un directorio del host y los agrega al FileSystem con su nombre
+    def cargarFuentes(self, directorio, destino="c:/"):
+        programas = [programa for nombre, programa in self._ensamblador.ensamblarDirectorio(directorio)]
+        self.kernel.fileSystem.importar([(destino.rstrip("/") + "/" + programa.name, programa) for programa in programas])
+        return programas
 
 
 ################################ READY QUEUE ########################################
@@ -403,19 +1182,404 @@ class ReadyQueue:
         return pcbBuscado
 
 
+################################ WORKING SET ########################################
+
+
+class WorkingSet:
+
+    ## paginas referenciadas por un proceso en las ultimas "ventana" referencias.
+    ## Cada referencia guarda si fue un page fault, asi la frecuencia de fallos sale de la misma ventana.
+
+    def __init__(self, ventana):
+        self._referencias = deque()
+        self._paginas = Counter()
+        self._ventana = ventana
+        self._fallosEnVentana = 0
+        self._falloPendiente = False
+
+    @property
+    def tamaño(self):
+        return len(self._paginas)
+
+    @property
+    def paginas(self):
+        return set(self._paginas)
+
+    @property
+    def lleno(self):
+        ## ya vio una ventana completa de referencias: su tamaño mide la demanda del proceso
+        return len(self._referencias) >= self._ventana
+
+    @property
+    def frecuenciaDeFallos(self):
+        if not self._referencias:
+            return 0.0
+        return self._fallosEnVentana / len(self._referencias)
+
+    def registrarFallo(self):
+        ## el page fault se atiende antes de que el MMU informe la referencia que lo provoco
+        self._falloPendiente = True
+
+    def referencia(self, idPage):
+        self._referencias.append((idPage, self._falloPendiente))
+        self._paginas[idPage] += 1
+        if self._falloPendiente:
+            self._fallosEnVentana += 1
+            self._falloPendiente = False
+        if len(self._referencias) > self._ventana:
+            idPageViejo, fueFallo = self._referencias.popleft()
+            self._paginas[idPageViejo] -= 1
+            if self._paginas[idPageViejo] == 0:
+                del self._paginas[idPageViejo]
+            if fueFallo:
+                self._fallosEnVentana -= 1
+
+    def __repr__(self):
+        return "WorkingSet(paginas={paginas}, pff={pff:.2f})".format(paginas=sorted(self._paginas),
+                                                                     pff=self.frecuenciaDeFallos)
+
+
+################################ COLA DE ADMISION ########################################
+
+
+class Trabajo:
+
+    def __init__(self, path, programa, priority):
+        self._path = path
+        self._programa = programa
+        self._priority = priority
+        self._llegada = None
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def programa(self):
+        return self._programa
+
+    @property
+    def priority(self):
+        return self._priority
+
+    @property
+    def llegada(self):
+        return self._llegada
+
+    @llegada.setter
+    def llegada(self, llegada):
+        self._llegada = llegada
+
+    def __repr__(self):
+        return "Trabajo({path}, priority={priority}, llegada={llegada})".format(path=self._path,
+                                                                               priority=self._priority,
+                                                                               llegada=self._llegada)
+
+
+class AbstractPoliticaDeAdmision:
+
+    def elegir(self, trabajos, memoryManager):
+        log.logger.error("-- elegir MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+
+class PoliticaDeAdmisionFIFO(AbstractPoliticaDeAdmision):
+
+    def elegir(self, trabajos, memoryManager):
+        return trabajos[0]
+
+
+class PoliticaDeAdmisionMenorPrimero(AbstractPoliticaDeAdmision):
+
+    def elegir(self, trabajos, memoryManager):
+        return min(trabajos, key=lambda trabajo: memoryManager.framesNecesarios(trabajo.programa, trabajo.path))
+
+
+class PoliticaDeAdmisionPrioridad(AbstractPoliticaDeAdmision):
+
+    def elegir(self, trabajos, memoryManager):
+        return min(trabajos, key=lambda trabajo: trabajo.priority)
+
+
+class ColaDeAdmision:
+
+    ## planificador de largo plazo: los trabajos nuevos esperan hasta que haya frames libres para cargarlos
+    ## (o, con swap y working sets, hasta que entre su working set). La politica elige que trabajo se intenta admitir;
+    ## si ese no entra, los demas siguen esperando.
+
+    def __init__(self, kernel, politica):
+        self._kernel = kernel
+        self._politica = politica
+        self._trabajos = []
+        self._tickActual = 0
+        self._admitidos = 0
+        self._esperaTotal = 0
+        self._esperaMaxima = 0
+        self._largoMaximo = 0
+
+    @property
+    def kernel(self):
+        return self._kernel
+
+    @property
+    def trabajos(self):
+        return self._trabajos
+
+    @property
+    def largo(self):
+        return len(self._trabajos)
+
+    @property
+    def largoMaximo(self):
+        return self._largoMaximo
+
+    @property
+    def admitidos(self):
+        return self._admitidos
+
+    @property
+    def esperaPromedio(self):
+        if self._admitidos == 0:
+            return 0.0
+        return self._esperaTotal / self._admitidos
+
+    @property
+    def esperaMaxima(self):
+        return self._esperaMaxima
+
+    def tick(self, tickNbr):
+        self._tickActual = tickNbr
+        ## con working sets la demanda baja sin que termine ningun proceso: si ahora entra el trabajo elegido,
+        ## se pide la admision con una interrupcion NEW sin trabajo (se atiende en el proximo tick)
+        if self._trabajos and self.kernel.planificadorMedianoPlazo is not None and \
+                self.puedeAdmitir(self._politica.elegir(self._trabajos, self.kernel.memoryManager)):
+            HARDWARE.interruptVector.handle(IRQ(NEW_INTERRUPTION_TYPE, None))
+
+    def entraEnMemoria(self, trabajo):
+        memoryManager = self.kernel.memoryManager
+        return memoryManager.swap.habilitado or \
+            memoryManager.framesNecesarios(trabajo.programa, trabajo.path) <= memoryManager.cantidadFrames
+
+    def encolar(self, trabajo):
+        ## Kernel.run ya rechaza los programas que no entran; si igual llega uno, se descarta sin cortar el handler
+        if not self.entraEnMemoria(trabajo):
+            log.logger.error("{trabajo} rechazado: no entra en memoria y no hay swap configurado".format(trabajo=trabajo))
+            return
+        trabajo.llegada = self._tickActual
+        self._trabajos.append(trabajo)
+        self._largoMaximo = max(self._largoMaximo, len(self._trabajos))
+
+    def puedeAdmitir(self, trabajo):
+        memoryManager = self.kernel.memoryManager
+        if not memoryManager.swap.habilitado:
+            ## las paginas se cargan por demanda: los frames libres que ya necesitan las imagenes admitidas no cuentan
+            return memoryManager.framesNecesarios(trabajo.programa, trabajo.path) <= \
+                memoryManager.asignadorDeFrames.cantidadLibres - memoryManager.framesComprometidos
+        ## con swap las paginas que no entran se cargan bajo demanda: solo se limita por working sets.
+        ## Los procesos recien admitidos tienen el working set vacio: cuentan con lo que tienen reservado
+        planificador = self.kernel.planificadorMedianoPlazo
+        if planificador is None or planificador.cantidadActivos == 0:
+            return True
+        reserva = planificador.reservaPara(memoryManager.paginasDePrograma(trabajo.programa))
+        return planificador.demandaEstimada + reserva <= memoryManager.cantidadFrames
+
+    def siguienteAdmisible(self):
+        if not self._trabajos:
+            return None
+        trabajo = self._politica.elegir(self._trabajos, self.kernel.memoryManager)
+        if not self.puedeAdmitir(trabajo):
+            return None
+        self._trabajos.remove(trabajo)
+        espera = self._tickActual - trabajo.llegada
+        self._admitidos += 1
+        self._esperaTotal += espera
+        self._esperaMaxima = max(self._esperaMaxima, espera)
+        if espera > 0:
+            log.logger.info("{trabajo} admitido despues de esperar {espera} ticks".format(trabajo=trabajo, espera=espera))
+        return trabajo
+
+    def __repr__(self):
+        return "ColaDeAdmision({politica}, esperando={largo}, largoMaximo={maximo}, admitidos={admitidos}, " \
+               "esperaPromedio={promedio:.2f}, esperaMaxima={espera})".format(
+                   politica=self._politica.__class__.__name__, largo=self.largo, maximo=self._largoMaximo,
+                   admitidos=self._admitidos, promedio=self.esperaPromedio, espera=self._esperaMaxima)
+
+
+################################ PLANIFICADOR DE MEDIANO PLAZO ########################################
+
+
+class PlanificadorMedianoPlazo:
+
+    ## control de carga: si la suma de los working sets de los procesos activos supera los frames de la memoria,
+    ## se suspende el proceso listo con mas page faults (sale de la ready queue y sus paginas van al swap).
+    ## Cuando vuelve a haber lugar para su working set, se reanuda. Se hace a lo sumo un cambio por tick.
+    ## La demanda se mantiene al dia con cada referencia, suspension, reanudacion y fin de proceso (no se recorre la tabla).
+
+    def __init__(self, kernel, ventana):
+        self._kernel = kernel
+        self._ventana = ventana
+        self._workingSets = dict()  ## pid -> working set
+        self._suspendidos = []
+        self._pidsSuspendidos = set()
+        self._demanda = 0  ## suma de los working sets de los procesos activos
+        self._reservas = dict()  ## pid -> frames reservados hasta que su working set vea una ventana completa
+        self._suspensiones = 0
+        self._reanudaciones = 0
+        self._demandaMaxima = 0
+
+    @property
+    def kernel(self):
+        return self._kernel
+
+    @property
+    def ventana(self):
+        return self._ventana
+
+    @property
+    def suspendidos(self):
+        return self._suspendidos
+
+    @property
+    def suspensiones(self):
+        return self._suspensiones
+
+    @property
+    def reanudaciones(self):
+        return self._reanudaciones
+
+    def workingSet(self, pid):
+        workingSet = self._workingSets.get(pid)
+        if workingSet is None:
+            workingSet = WorkingSet(self._ventana)
+            self._workingSets[pid] = workingSet
+        return workingSet
+
+    def referencia(self, pid, idPage):
+        workingSet = self.workingSet(pid)
+        tamaño = workingSet.tamaño
+        workingSet.referencia(idPage)
+        if pid not in self._pidsSuspendidos:
+            self._demanda += workingSet.tamaño - tamaño
+        if self._reservas and workingSet.lleno:
+            self._reservas.pop(pid, None)
+
+    def reservaPara(self, cantidadPaginas):
+        ## un proceso nuevo todavia no referencio nada: se estima que va a usar una ventana de paginas distintas
+        return min(cantidadPaginas, self._ventana)
+
+    def reservar(self, pid, cantidadPaginas):
+        self._reservas[pid] = self.reservaPara(cantidadPaginas)
+
+    def registrarFallo(self, pid):
+        self.workingSet(pid).registrarFallo()
+
+    def olvidar(self, pid):
+        workingSet = self._workingSets.pop(pid, None)
+        if workingSet is not None and pid not in self._pidsSuspendidos:
+            self._demanda -= workingSet.tamaño
+        self._pidsSuspendidos.discard(pid)
+        self._reservas.pop(pid, None)
+
+    @property
+    def cantidadActivos(self):
+        pcbTable = self.kernel.pcbTable
+        return pcbTable.cantidad - pcbTable.cantidadEn(EstadoPCB.SUSPENDED)
+
+    @property
+    def demanda(self):
+        return self._demanda
+
+    @property
+    def demandaEstimada(self):
+        ## la demanda medida mas lo reservado para los procesos recien admitidos que todavia no la alcanzaron
+        return self._demanda + sum(max(reserva - self.workingSet(pid).tamaño, 0) for pid, reserva in self._reservas.items())
+
+    def tick(self, tickNbr):
+        activos = self.cantidadActivos
+        demanda = self._demanda
+        self._demandaMaxima = max(self._demandaMaxima, demanda)
+        frames = self.kernel.memoryManager.cantidadFrames
+        if demanda > frames and activos > 1:
+            candidatos = self.kernel.scheduler.readyQueue.lista
+            if candidatos:
+                victima = max(candidatos, key=lambda pcb: (self.workingSet(pcb.pid).frecuenciaDeFallos, pcb.priority))
+                self.suspender(victima, demanda)
+        elif self._suspendidos:
+            pcb = self._suspendidos[0]
+            if activos == 0 or self.demandaEstimada + self.workingSet(pcb.pid).tamaño <= frames:
+                self.reanudar(pcb, demanda)
+
+    def suspender(self, pcb, demanda):
+        self.kernel.scheduler.readyQueue.remove(pcb)
+        pcb.state = EstadoPCB.SUSPENDED
+        self._suspendidos.append(pcb)
+        self._pidsSuspendidos.add(pcb.pid)
+        self._demanda -= self.workingSet(pcb.pid).tamaño
+        self._reservas.pop(pcb.pid, None)
+        self._suspensiones += 1
+        desalojados = 0
+        if self.kernel.memoryManager.swap.habilitado:
+            desalojados = self.kernel.memoryManager.desalojarEspacio(pcb.pid, self._pidsSuspendidos)
+        log.logger.info("Proceso {pid} suspendido: demanda de {demanda} frames, {desalojados} paginas al swap".format(
+            pid=pcb.pid, demanda=demanda, desalojados=desalojados))
+
+    def reanudar(self, pcb, demanda):
+        self._suspendidos.remove(pcb)
+        self._pidsSuspendidos.discard(pcb.pid)
+        self._demanda += self.workingSet(pcb.pid).tamaño
+        self._reanudaciones += 1
+        if self.kernel.pcbTable.runningPCB is None:
+            self.kernel.dispatcher.load(pcb)
+            pcb.state = EstadoPCB.RUNNING
+            self.kernel.pcbTable.runningPCB = pcb
+        else:
+            pcb.state = EstadoPCB.READY
+            self.kernel.scheduler.readyQueue.add(pcb)
+        log.logger.info("Proceso {pid} reanudado: demanda de {demanda} frames".format(pid=pcb.pid, demanda=demanda))
+
+    def __repr__(self):
+        return "PlanificadorMedianoPlazo(ventana={ventana}, suspensiones={suspensiones}, reanudaciones={reanudaciones}, " \
+               "demandaMaxima={demanda})".format(ventana=self._ventana, suspensiones=self._suspensiones,
+                                                 reanudaciones=self._reanudaciones, demanda=self._demandaMaxima)
+
+
 ################################ PCB ########################################
 
 
+## estados de un proceso (codigos enteros, se muestran con su nombre)
+class EstadoPCB(IntEnum):
+    NEW = 0
+    READY = 1
+    RUNNING = 2
+    WAITING = 3
+    SUSPENDED = 4
+    TERMINATED = 5
+
+    def __str__(self):
+        return self.name.lower()
+
+    def __repr__(self):
+        return str(self)
+
+    def __format__(self, formatSpec):
+        return format(str(self), formatSpec)
+
+
 class PCB:
 
-    def __init__(self, baseDir, pid, nombre, priority, pageTable):
+    __slots__ = ('_baseDir', '_pid', '_pc', '_registers', '_state', '_path', '_priority', '_pageTable', '_limit',
+                 '_pcbTable')
+
+    def __init__(self, baseDir, pid, nombre, priority, pageTable, limit):
         self._baseDir = baseDir
         self._pid = pid
         self._pc = 0
-        self._state = "new"
+        self._registers = [0] * REGISTER_COUNT
+        self._state = EstadoPCB.NEW
         self._path = nombre
         self._priority = priority
         self._pageTable = pageTable
+        self._limit = limit
+        self._pcbTable = None  ## la tabla que cuenta los procesos en cada estado
 
     @property
     def baseDir(self):
@@ -437,14 +1601,32 @@ class PCB:
     def pc(self, pc):
         self._pc = pc
 
+    @property
+    def registers(self):
+        return self._registers
+
+    @registers.setter
+    def registers(self, registers):
+        self._registers = registers
+
     @property
     def state(self):
         return self._state
 
     @state.setter
     def state(self, state):
+        if self._pcbTable is not None:
+            self._pcbTable.cambioDeEstado(self._state, state)
         self._state = state
 
+    @property
+    def pcbTable(self):
+        return self._pcbTable
+
+    @pcbTable.setter
+    def pcbTable(self, pcbTable):
+        self._pcbTable = pcbTable
+
     @property
     def path(self):
         return self._path
@@ -453,6 +1635,10 @@ class PCB:
     def pageTable(self):
         return self._pageTable
 
+    @property
+    def limit(self):
+        return self._limit
+
     def __repr__(self):
         return "PCB(pid={}, baseDir={}, pc={}, state={}, path={}, priority={})".format(self.pid, self.baseDir, self.pc,
                                                                                        self.state, self.path,
@@ -464,14 +1650,16 @@ class PCB:
 
 class PCBTable:
 
+    ## los pcbs indexados por pid (en orden de llegada) y la cantidad de procesos en cada estado
     def __init__(self):
-        self._tabla = []
+        self._tabla = dict()
         self._pid = -1
         self._runningPcb = None
+        self._porEstado = [0] * len(EstadoPCB)
 
     @property
     def tabla(self):
-        return self._tabla
+        return self._tabla.values()
 
     @property
     def pid(self):
@@ -489,20 +1677,42 @@ class PCBTable:
     def runningPCB(self, pcb):
         self._runningPcb = pcb
 
+    @property
+    def cantidad(self):
+        return len(self._tabla)
+
+    def cantidadEn(self, estado):
+        return self._porEstado[estado]
+
+    @property
+    def cantidadPorEstado(self):
+        return {estado: self._porEstado[estado] for estado in EstadoPCB}
+
+    ## todos los procesos de la tabla terminaron (o no queda ninguno)
+    @property
+    def terminaronTodos(self):
+        return self._porEstado[EstadoPCB.TERMINATED] == len(self._tabla)
+
     def add(self, pcb):
-        self._tabla.append(pcb)
+        self._tabla[pcb.pid] = pcb
+        self._porEstado[pcb.state] += 1
+        pcb.pcbTable = self
 
     def remove(self, pid):
-        pcb = self.get(pid)
-        self._tabla.remove(pcb)
+        pcb = self._tabla.pop(pid)
+        self._porEstado[pcb.state] -= 1
+        pcb.pcbTable = None
 
     def get(self, pidBuscado):
-        pcbResultado = None
-        for pcb in self._tabla:
-            if pcb.pid == pidBuscado:
-                pcbResultado = pcb
-                break
-        return pcbResultado
+        return self._tabla.get(pidBuscado)
+
+    def cambioDeEstado(self, anterior, nuevo):
+        self._porEstado[anterior] -= 1
+        self._porEstado[nuevo] += 1
+
+    def __repr__(self):
+        return "PCBTable(procesos={cantidad}, {estados})".format(cantidad=len(self._tabla), estados=", ".join(
+            "{estado}={n}".format(estado=estado, n=n) for estado, n in self.cantidadPorEstado.items()))
 
     def getNewPID(self):
         nuevoPid = self.pid + 1
@@ -519,48 +1729,183 @@ class Dispatcher:
         pageTable = pcb.pageTable
         HARDWARE.timer.reset()
         HARDWARE.cpu.pc = pcb.pc
+        HARDWARE.cpu.registers = pcb.registers
         HARDWARE.mmu.baseDir = pcb.baseDir
         log.logger.info("loading pcb:{pcb}".format(pcb=pcb))
-        HARDWARE.mmu.resetTLB()  ##nuevo
-        for tuple in pageTable.table:
-            HARDWARE.mmu.setPageFrame(tuple[0], tuple[1])  ##nuevo
+        ## la TLB esta taggeada por pid: no hace falta vaciarla en el context switch
+        HARDWARE.mmu.asid = pcb.pid
+        HARDWARE.mmu.pageTable = pageTable
+        HARDWARE.mmu.limit = pcb.limit
 
     def save(self, pcb):
         pcb.pc = HARDWARE.cpu.pc
+        pcb.registers = list(HARDWARE.cpu.registers)
         HARDWARE.cpu.pc = -1
         log.logger.info("saving pcb:{pcb}".format(pcb=pcb))
 
 
 ################################ FILE SYSTEM ########################################
 
+## un directorio del file system: sus entradas (archivos y subdirectorios) indexadas por nombre
+class Directorio:
+
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._entradas = dict()
+
+    @property
+    def nombre(self):
+        return self._nombre
+
+    @property
+    def entradas(self):
+        return self._entradas
+
+    def get(self, nombre):
+        return self._entradas.get(nombre)
+
+    def agregar(self, nombre, entrada):
+        self._entradas[nombre] = entrada
+
+    def __repr__(self):
+        return "Directorio({nombre}, {entradas})".format(nombre=self._nombre, entradas=list(self._entradas))
+
+
+## file system jerarquico en memoria: "c:/bin/prg1.exe" es el archivo prg1.exe del directorio bin de la unidad c:
+## buscar un archivo cuesta lo que la profundidad de su path (un diccionario por nivel)
 class FileSystem:  ##nuevo
 
     def __init__(self, kernel):
-        self._files = []
+        self._raiz = Directorio("")
         self._kernel = kernel
 
+    ## escribe (o reemplaza) un archivo, creando los directorios que falten
     def write(self, path, program):
-        newFile = [path, program]
-        self._files.append(newFile)
+        directorio, nombre = self._partir(path)
+        self._escribirEn(self.mkdir(directorio), nombre, program, path)
 
     def read(self, path):
-        for file in self._files:
-            if file[0] == path:
-                fileBuscado = file
-        return fileBuscado[1]
+        directorio, nombre = self._partir(path)
+        archivo = self._buscar(directorio, path).get(nombre)
+        if archivo is None or isinstance(archivo, Directorio):
+            raise Exception("\n*\n* ERROR \n*\n No existe el archivo {path}".format(path=path))
+        return archivo
+
+    def exists(self, path):
+        directorio, nombre = self._partir(path)
+        actual = self._raiz
+        for nombreDirectorio in directorio:
+            actual = actual.get(nombreDirectorio)
+            if not isinstance(actual, Directorio):
+                return False
+        return actual.get(nombre) is not None
+
+    ## crea el directorio y los que falten en el camino (como "mkdir -p"), devuelve el ultimo
+    def mkdir(self, path):
+        partes = self._partes(path) if isinstance(path, str) else path
+        actual = self._raiz
+        for nombre in partes:
+            siguiente = actual.get(nombre)
+            if siguiente is None:
+                siguiente = Directorio(nombre)
+                actual.agregar(nombre, siguiente)
+            elif not isinstance(siguiente, Directorio):
+                raise Exception("\n*\n* ERROR \n*\n {nombre} no es un directorio".format(nombre=nombre))
+            actual = siguiente
+        return actual
+
+    ## nombres de las entradas de un directorio
+    def listdir(self, path):
+        return list(self._buscar(self._partes(path), path).entradas)
+
+    ## importa muchos programas de una vez: [(path, program), ...]
+    ## cada directorio se busca una sola vez aunque tenga muchos archivos
+    def importar(self, archivos):
+        directorios = dict()
+        for path, program in archivos:
+            directorio, nombre = self._partir(path)
+            clave = tuple(directorio)
+            if clave not in directorios:
+                directorios[clave] = self.mkdir(directorio)
+            self._escribirEn(directorios[clave], nombre, program, path)
+
+    ## libera el mapeo de las imagenes binarias guardadas (si se vuelven a leer, se mapean de nuevo)
+    def cerrar(self):
+        pendientes = [self._raiz]
+        while pendientes:
+            for entrada in pendientes.pop().entradas.values():
+                if isinstance(entrada, Directorio):
+                    pendientes.append(entrada)
+                elif isinstance(entrada, ProgramaBinario):
+                    entrada.close()
+
+    def _escribirEn(self, directorio, nombre, program, path):
+        if isinstance(directorio.get(nombre), Directorio):
+            raise Exception("\n*\n* ERROR \n*\n {path} es un directorio".format(path=path))
+        directorio.agregar(nombre, program)
+
+    def _buscar(self, partes, path):
+        actual = self._raiz
+        for nombre in partes:
+            actual = actual.get(nombre)
+            if not isinstance(actual, Directorio):
+                raise Exception("\n*\n* ERROR \n*\n No existe el directorio de {path}".format(path=path))
+        return actual
+
+    def _partes(self, path):
+        return [parte for parte in path.replace("\\", "/").split("/") if parte != ""]
+
+    def _partir(self, path):
+        partes = self._partes(path)
+        if not partes:
+            raise Exception("\n*\n* ERROR \n*\n El path {path} no nombra un archivo".format(path=path))
+        return partes[:-1], partes[-1]
+
+    def __repr__(self):
+        return "FileSystem({raiz})".format(raiz=list(self._raiz.entradas))
 
 
 ################################ MEMORY MANAGER ########################################
 
+## maxima cantidad de paginas que se leen por adelantado en un page fault
+READ_AHEAD_MAXIMO = 8
+
 class MemoryManager:  ##nuevo
 
-    def __init__(self, kernel, frameSize, cantidadFrames):
+    def __init__(self, kernel, frameSize, cantidadFrames, nivelesPageTable, pageTableInvertida, buddy=False,
+                 readAhead=False):
         self.kernel = kernel
+        self._nivelesPageTable = nivelesPageTable
+        self._invertedPageTable = None
+        if pageTableInvertida:
+            self._invertedPageTable = InvertedPageTable(cantidadFrames)
         self._logicalMemory = LogicalMemory()
         self._frameSize = frameSize
-        self._framesLibres = list(range(cantidadFrames))
+        if buddy:
+            self._asignadorDeFrames = AsignadorBuddy(cantidadFrames)
+        else:
+            self._asignadorDeFrames = AsignadorDeFramesLista(cantidadFrames)
         self._framesUsados = []
+        self._bloques = dict()  ## primer frame -> cantidad de frames de los bloques reservados para el kernel
         self._kernel = kernel
+        self._swap = SwapSpace(HARDWARE.swapDevice)
+        self._algoritmoDeVictima = AlgoritmoFIFO()
+        self._duenioDeFrame = dict()  ## numeroFrame -> pagina fisica cargada en el frame
+        self._imagenes = dict()  ## path -> imagen del programa cargada
+        self._imagenDeProceso = dict()  ## pid -> imagen que usa el proceso
+        self._espacios = dict()  ## pid -> {idPage -> pagina fisica que usa el proceso}
+        self._pageFaults = 0
+        self._swapIns = 0
+        self._cargasDesdePrograma = 0
+        self._swapOuts = 0
+        self._copiasPorEscritura = 0
+        self._readAhead = readAhead
+        self._ventanasReadAhead = dict()  ## pid -> cantidad de paginas a leer por adelantado
+        self._ultimosFallos = dict()  ## pid -> pagina del ultimo page fault (para reabrir una ventana en 0)
+        self._prefetchPendientes = dict()  ## pagina leida por adelantado y todavia no referenciada -> pid
+        self._paginasLeidasPorAdelantado = 0
+        self._aciertosDePrefetch = 0
+        self._prefetchDesperdiciado = 0
 
     @property
     def logicalMemory(self):
@@ -570,108 +1915,1111 @@ class MemoryManager:  ##nuevo
     def frameSize(self):
         return self._frameSize
 
+    @property
+    def asignadorDeFrames(self):
+        return self._asignadorDeFrames
+
+    @property
+    def cantidadFrames(self):
+        return self._asignadorDeFrames.cantidadFrames
+
     @property
     def framesLibres(self):
-        return self._framesLibres
+        return self._asignadorDeFrames.libres
 
     @property
     def framesUsados(self):
         return self._framesUsados
 
-    def frameOfPage(self, page):
-        for tuple in self.pageTable.table:
-            if tuple[0] == page.id:
-                frame = tuple[1]
-        return frame
+    @property
+    def swap(self):
+        return self._swap
+
+    @property
+    def invertedPageTable(self):
+        return self._invertedPageTable
+
+    @property
+    def imagenes(self):
+        return self._imagenes
+
+    @property
+    def pageFaults(self):
+        return self._pageFaults
+
+    @property
+    def swapIns(self):
+        return self._swapIns
+
+    @property
+    def cargasDesdePrograma(self):
+        return self._cargasDesdePrograma
+
+    @property
+    def swapOuts(self):
+        return self._swapOuts
+
+    @property
+    def copiasPorEscritura(self):
+        return self._copiasPorEscritura
+
+    @property
+    def ventanaReadAheadMaxima(self):
+        ## a lo sumo la mitad de la memoria, para que la lectura por adelantado no desplace al resto
+        return min(READ_AHEAD_MAXIMO, self.cantidadFrames // 2)
+
+    @property
+    def paginasLeidasPorAdelantado(self):
+        return self._paginasLeidasPorAdelantado
+
+    @property
+    def aciertosDePrefetch(self):
+        return self._aciertosDePrefetch
+
+    @property
+    def prefetchDesperdiciado(self):
+        return self._prefetchDesperdiciado
+
+    def frameOfPage(self, pcb, idPage):
+        return pcb.pageTable.frameDePagina(idPage)
 
     def getFrameLibre(self):
-        numeroFrame = self.framesLibres[0]
+        numeroFrame = self._asignadorDeFrames.asignar(1)
+        if numeroFrame is None:
+            self.liberarFrameVictima()
+            numeroFrame = self._asignadorDeFrames.asignar(1)
         self.framesUsados.append(numeroFrame)
-        self.framesLibres.remove(numeroFrame)
         return numeroFrame
 
+    def reservarBloque(self, cantidadFrames):
+        ## frames contiguos para paginas grandes o buffers del kernel; no participan del reemplazo de paginas
+        numeroFrame = self._asignadorDeFrames.asignar(cantidadFrames)
+        desalojos = len(self._duenioDeFrame)
+        while numeroFrame is None and desalojos > 0 and self.swap.habilitado:
+            self.liberarFrameVictima()
+            desalojos -= 1
+            numeroFrame = self._asignadorDeFrames.asignar(cantidadFrames)
+        if numeroFrame is None:
+            raise Exception("\n*\n* ERROR \n*\n No hay {cantidad} frames contiguos libres".format(cantidad=cantidadFrames))
+        self._bloques[numeroFrame] = cantidadFrames
+        return numeroFrame
+
+    def liberarBloque(self, numeroFrame):
+        del self._bloques[numeroFrame]
+        self._asignadorDeFrames.liberar(numeroFrame)
+
+    def asignarFrame(self, pagina):
+        numeroFrame = self.getFrameLibre()
+        pagina.setFrame(numeroFrame)
+        self._duenioDeFrame[numeroFrame] = pagina
+        self._algoritmoDeVictima.completePageTable(pagina.clave, pagina.idPage, numeroFrame, True)
+        return numeroFrame
+
+    def devolverFrame(self, numeroFrame):
+        self._duenioDeFrame.pop(numeroFrame, None)
+        self._algoritmoDeVictima.liberarFrame(numeroFrame)
+        self.framesUsados.remove(numeroFrame)
+        self._asignadorDeFrames.liberar(numeroFrame)
+
+    def liberarFrameVictima(self):
+        if self.swap.habilitado:
+            victima = self._algoritmoDeVictima.seleccionDeVictima()
+        else:
+            ## sin swap solo se desalojan paginas limpias (las de codigo se vuelven a leer del programa)
+            victima = self._algoritmoDeVictima.seleccionDeVictima(
+                lambda numeroFrame: not self._duenioDeFrame[numeroFrame].esPrivada)
+        if victima is None:
+            raise Exception("\n*\n* ERROR \n*\n No hay frames libres ni paginas que se puedan desalojar{motivo}".format(
+                motivo="" if self.swap.habilitado else " (no hay swap configurado)"))
+        self.desalojarFrame(victima)
+
+    def desalojarFrame(self, numeroFrame):
+        pagina = self._duenioDeFrame[numeroFrame]
+        self.swapOut(pagina, numeroFrame)
+        ## la pagina puede estar mapeada por varios procesos: se invalida en todos
+        for pid in pagina.mapeos:
+            HARDWARE.mmu.invalidatePage(pid, pagina.idPage)
+        self.sacarDeFrame(pagina)
+        self._algoritmoDeVictima.completePageTable(pagina.clave, pagina.idPage, numeroFrame, False)
+        self.devolverFrame(numeroFrame)
+        log.logger.info("Pagina {page} de {clave} desalojada del frame {frame}".format(page=pagina.idPage,
+                                                                                     clave=pagina.clave,
+                                                                                     frame=numeroFrame))
+
+    def desalojarEspacio(self, pid, suspendidos):
+        ## se bajan al swap las paginas del proceso que no usa ningun proceso activo
+        desalojados = 0
+        for pagina in self._espacios[pid].values():
+            if pagina.frame is not None and all(otroPid in suspendidos for otroPid in pagina.mapeos):
+                self.desalojarFrame(pagina.frame)
+                desalojados += 1
+        return desalojados
+
+    def swapOut(self, pagina, numeroFrame):
+        ## las paginas de codigo no se modifican: se vuelven a leer del programa, no hace falta escribirlas
+        if not pagina.esPrivada:
+            return
+        baseDir = self.baseDirDeFrame(numeroFrame)
+        cells = [HARDWARE.memory.read(baseDir + offset) for offset in range(0, self.frameSize)]
+        self.escribirEnSwap(pagina, cells)
+
+    def escribirEnSwap(self, pagina, cells):
+        if pagina.slot is None:
+            pagina.slot = self.swap.asignarSlot()
+        HARDWARE.cpu.stall(HARDWARE.swapDevice.write(pagina.slot, cells))
+        self._swapOuts += 1
+
+    def cargarPaginaDesdeSwap(self, pcb, idPage):
+        self._pageFaults += 1
+        pagina = self._espacios[pcb.pid].get(idPage)
+        if pagina is None or (pagina.frame is None and not pagina.esCargable):
+            raise Exception("\n*\n* ERROR \n*\n Page fault invalido\nLa pagina {pageId} no pertenece al proceso {pid}".format(
+                pageId=idPage, pid=pcb.pid))
+        if pagina.frame is not None:
+            ## otro proceso que comparte la pagina ya la cargo
+            pcb.pageTable.setFrame(idPage, pagina.frame)
+            return pagina.frame
+        ## la pagina que fallo y las que se leen por adelantado se traen del swap en una sola operacion.
+        ## Primero se le asigna frame a la que fallo; las leidas por adelantado usan un frame libre o desalojan
+        ## una victima (si hay swap), pero nunca uno de los frames que se estan cargando
+        paginas = [pagina]
+        frames = [self.asignarFrame(pagina)]
+        for paginaALeer in self.paginasParaLeerPorAdelantado(pcb.pid, idPage):
+            if self._asignadorDeFrames.cantidadLibres == 0 and (
+                    not self.swap.habilitado or self._algoritmoDeVictima.seleccionDeVictima() in frames + [None]):
+                break
+            paginas.append(paginaALeer)
+            frames.append(self.asignarFrame(paginaALeer))
+        contenidos, leyoDelSwap = self.leerPaginas(paginas)
+        if leyoDelSwap:
+            ## las paginas que salen de la imagen del programa no esperan al dispositivo de swap
+            HARDWARE.cpu.stall(HARDWARE.swapDevice.deviceTime)
+        for paginaLeida, numeroFrame, cells in zip(paginas, frames, contenidos):
+            baseDir = self.baseDirDeFrame(numeroFrame)
+            for offset in range(0, len(cells)):
+                HARDWARE.memory.write(baseDir + offset, cells[offset])
+        for paginaLeida in paginas[1:]:
+            self._prefetchPendientes[paginaLeida] = pcb.pid
+        self._paginasLeidasPorAdelantado += len(paginas) - 1
+        log.logger.info("Pagina {page} del proceso {pid} cargada en el frame {frame}".format(
+            page=idPage, pid=pcb.pid, frame=frames[0]))
+        if len(paginas) > 1:
+            log.logger.info("Paginas {pages} del proceso {pid} leidas por adelantado".format(
+                pages=[paginaLeida.idPage for paginaLeida in paginas[1:]], pid=pcb.pid))
+        return frames[0]
+
+    ## devuelve el contenido de cada pagina y si hubo que leer del swap
+    def leerPaginas(self, paginas):
+        ## las que tienen copia en el swap se leen en una sola operacion, las de codigo sin copia del programa
+        enSwap = [pagina for pagina in paginas if pagina.slot is not None]
+        contenidosDelSwap = dict()
+        if enSwap:
+            contenidosDelSwap = dict(zip(enSwap, HARDWARE.swapDevice.readMany([pagina.slot for pagina in enSwap])))
+        self._swapIns += len(enSwap)
+        self._cargasDesdePrograma += len(paginas) - len(enSwap)
+        return [contenidosDelSwap[pagina] if pagina.slot is not None
+                else self.logicalMemory.getPageForId(pagina.imagen, pagina.idPage).cells for pagina in paginas], bool(enSwap)
+
+    def paginasParaLeerPorAdelantado(self, pid, idPage):
+        ## los programas se ejecutan en forma secuencial: despues de la pagina k casi siempre se usa la k+1
+        if not self._readAhead:
+            return []
+        ventana = self._ventanasReadAhead.get(pid)
+        if ventana is None or (ventana == 0 and self._ultimosFallos.get(pid) == idPage - 1):
+            ## la ventana arranca en una pagina; si se cerro, un fallo en la pagina siguiente a la del anterior la reabre
+            ventana = min(1, self.ventanaReadAheadMaxima)
+        self._ventanasReadAhead[pid] = ventana
+        self._ultimosFallos[pid] = idPage
+        espacio = self._espacios[pid]
+        paginas = []
+        for siguiente in range(idPage + 1, idPage + 1 + ventana):
+            pagina = espacio.get(siguiente)
+            if pagina is None:
+                break
+            if pagina.frame is None and pagina.esCargable:
+                paginas.append(pagina)
+        return paginas
+
+    def referencia(self, pid, idPage):
+        ## el MMU avisa cada referencia: si era una pagina leida por adelantado, la lectura sirvio
+        if not self._prefetchPendientes:
+            return
+        pagina = self._espacios.get(pid, {}).get(idPage)
+        if pagina is not None and self._prefetchPendientes.pop(pagina, None) is not None:
+            self._aciertosDePrefetch += 1
+            self.ajustarVentanaReadAhead(pid, True)
+
+    def ajustarVentanaReadAhead(self, pid, acierto):
+        ## crece de a una pagina con cada acierto y se reduce a la mitad con cada pagina desperdiciada (hasta 0)
+        if pid not in self._ventanasReadAhead:
+            return
+        ventana = self._ventanasReadAhead[pid]
+        if acierto:
+            self._ventanasReadAhead[pid] = min(ventana + 1, self.ventanaReadAheadMaxima)
+        else:
+            self._ventanasReadAhead[pid] = ventana // 2
+
+    def copiarAlEscribir(self, pcb, idPage):
+        pagina = self._espacios[pcb.pid][idPage]
+        if pagina.esPrivada and pagina.referencias == 1:
+            ## ya nadie mas la comparte: alcanza con habilitar la escritura
+            pcb.pageTable.setEscribible(idPage, True)
+            return
+        if pagina.frame is None:
+            self.cargarPaginaDesdeSwap(pcb, idPage)
+        baseDir = self.baseDirDeFrame(pagina.frame)
+        cells = [HARDWARE.memory.read(baseDir + offset) for offset in range(0, self.frameSize)]
+        copia = PaginaFisica(pcb.pid, idPage, None)
+        numeroFrame = self.getFrameLibre()
+        baseDirCopia = self.baseDirDeFrame(numeroFrame)
+        for offset in range(0, self.frameSize):
+            HARDWARE.memory.write(baseDirCopia + offset, cells[offset])
+        self.desmapearPagina(pcb.pid, pagina)
+        copia.setFrame(numeroFrame)
+        self._duenioDeFrame[numeroFrame] = copia
+        self._algoritmoDeVictima.completePageTable(copia.clave, idPage, numeroFrame, True)
+        copia.mapear(pcb.pid, pcb.pageTable)
+        self._espacios[pcb.pid][idPage] = copia
+        pcb.pageTable.setEscribible(idPage, True)
+        self._copiasPorEscritura += 1
+        log.logger.info("Pagina {page} del proceso {pid} copiada al frame {frame} (copy on write)".format(
+            page=idPage, pid=pcb.pid, frame=numeroFrame))
+
+    def desmapearPagina(self, pid, pagina):
+        pagina.desmapear(pid)
+        HARDWARE.mmu.invalidatePage(pid, pagina.idPage)
+        if pagina.referencias == 0 and pagina.esPrivada:
+            self.liberarPagina(pagina)
+
+    def sacarDeFrame(self, pagina):
+        pagina.setFrame(None)
+        pid = self._prefetchPendientes.pop(pagina, None)
+        if pid is not None:
+            ## se leyo por adelantado pero se fue de memoria sin que nadie la use
+            self._prefetchDesperdiciado += 1
+            self.ajustarVentanaReadAhead(pid, False)
+        ## si ningun proceso la mapea, su entrada en la inverted page table no se borro a traves de una vista
+        if self._invertedPageTable is not None:
+            self._invertedPageTable.eliminar(pagina.clave, pagina.idPage)
+
+    def liberarPagina(self, pagina):
+        if pagina.frame is not None:
+            self.devolverFrame(pagina.frame)
+            self.sacarDeFrame(pagina)
+        if pagina.slot is not None:
+            self.swap.liberarSlot(pagina.slot)
+            pagina.slot = None
+
+    def forkEspacio(self, padre, pidHijo):
+        imagen = self._imagenDeProceso[padre.pid]
+        pageTableHijo = self.nuevaPageTable(imagen)
+        espacioHijo = dict()
+        for idPage, pagina in self._espacios[padre.pid].items():
+            pageTableHijo.addPage(idPage)
+            pagina.mapear(pidHijo, pageTableHijo)
+            espacioHijo[idPage] = pagina
+            if padre.pageTable.esEscribible(idPage):
+                ## la pagina pasa a ser compartida: el padre tambien la tiene que copiar antes de escribirla
+                padre.pageTable.setEscribible(idPage, False)
+                HARDWARE.mmu.invalidatePage(padre.pid, idPage)
+        self._espacios[pidHijo] = espacioHijo
+        self._imagenDeProceso[pidHijo] = imagen
+        imagen.procesos.add(pidHijo)
+        return pageTableHijo
+
     def liberarFrameUsado(self, pcb):
-        for tupla in pcb.pageTable.table:
-            numeroFrame = tupla[1]
-            self.framesLibres.append(numeroFrame)
-            self.framesUsados.remove(numeroFrame)
-        print("- - - - Frames libres actualizados: " + str(self.kernel.memoryManager.framesLibres) + " - - - -")
+        for pagina in self._espacios.pop(pcb.pid).values():
+            self.desmapearPagina(pcb.pid, pagina)
+        HARDWARE.mmu.flushASID(pcb.pid)
+        self._ventanasReadAhead.pop(pcb.pid, None)
+        self._ultimosFallos.pop(pcb.pid, None)
+        imagen = self._imagenDeProceso.pop(pcb.pid)
+        imagen.procesos.discard(pcb.pid)
+        ## los frames de la imagen se liberan recien cuando termina el ultimo proceso que la usa
+        if not imagen.procesos:
+            self.liberarImagen(imagen)
+        log.logger.info("- - - - Frames libres actualizados: {frames} - - - -".format(frames=self.kernel.memoryManager.framesLibres))
+
+    def liberarImagen(self, imagen):
+        for pagina in imagen.paginas:
+            self.liberarPagina(pagina)
+        self._algoritmoDeVictima.removePageTable(imagen)
+        self.logicalMemory.liberarPaginas(imagen)
+        if self._imagenes.get(imagen.path) is imagen:
+            del self._imagenes[imagen.path]
+
+    ## frames que van a ocupar las paginas de las imagenes cargadas que todavia no estan en memoria
+    @property
+    def framesComprometidos(self):
+        return sum(1 for imagen in self._imagenes.values() for pagina in imagen.paginas if pagina.frame is None)
+
+    def framesNecesarios(self, programa, path):
+        ## si la imagen del programa ya esta cargada, el proceso nuevo la comparte
+        imagen = self._imagenes.get(path)
+        if imagen is not None and imagen.programa is programa:
+            return 0
+        return self.paginasDePrograma(programa)
+
+    def paginasDePrograma(self, programa):
+        return -(-programa.size // self.frameSize)
 
     def memoriaLibre(self):
-        return len(self.framesLibres) * self.frameSize
+        return self._asignadorDeFrames.cantidadLibres * self.frameSize
 
     def baseDirDeFrame(self, numeroFrame):
         return numeroFrame * self.frameSize
 
-    def pageTableDePrograma(self, programa):
-        instrucciones = programa.instructions
-        instruccionesAgrupadas = self.kernel.loader.dividirProgramaEnPaginas(instrucciones)
-        pageTableNueva = PageTable()
-        for grupo in instruccionesAgrupadas:
-            paginaNueva = pageTableNueva.crearPagina(grupo)
-            self.logicalMemory.addPage(paginaNueva)
-            frameNuevo = self.getFrameLibre()
-            tuple = [paginaNueva.id, frameNuevo]
-            pageTableNueva.addTuple(tuple)
+    def nuevaPageTable(self, imagen):
+        if self._invertedPageTable is not None:
+            ## las paginas compartidas se indexan por imagen, asi todos los procesos usan la misma entrada
+            return PageTableInvertida(self._invertedPageTable, imagen)
+        if self._nivelesPageTable > 1:
+            return MultiLevelPageTable(self._nivelesPageTable, PAGE_TABLE_BITS_POR_NIVEL)
+        return PageTable()
+
+    def pageTableDePrograma(self, programa, pid, path):
+        imagen = self.imagenDePrograma(programa, path)
+        pageTableNueva = self.nuevaPageTable(imagen)
+        espacio = dict()
+        for pagina in imagen.paginas:
+            pageTableNueva.addPage(pagina.idPage)
+            pagina.mapear(pid, pageTableNueva)
+            espacio[pagina.idPage] = pagina
+        self._espacios[pid] = espacio
+        self._imagenDeProceso[pid] = imagen
+        imagen.procesos.add(pid)
         return pageTableNueva
 
+    def imagenDePrograma(self, programa, path):
+        ## el codigo de un programa se carga una sola vez y lo comparten todos sus procesos
+        imagen = self._imagenes.get(path)
+        if imagen is not None and imagen.programa is programa:
+            return imagen
+        imagen = ImagenDePrograma(path, programa)
+        self._imagenes[path] = imagen
+        ## paginacion por demanda: ninguna pagina se carga hasta que un proceso la usa
+        for paginaNueva in self.kernel.loader.dividirProgramaEnPaginas(programa):
+            self.logicalMemory.addPage(imagen, paginaNueva)
+            imagen.paginas.append(PaginaFisica(imagen, paginaNueva.id, imagen))
+        return imagen
+
+    def estadisticasDePaginacion(self):
+        return "Paginacion: {faults} page faults, {ins} swap-ins, {programa} cargas desde el programa, " \
+               "{outs} swap-outs, {cow} copias por escritura, " \
+               "{ticks} ticks de latencia de swap, read-ahead: {leidas} paginas, {aciertos} aciertos, " \
+               "{desperdicio} desperdiciadas".format(faults=self.pageFaults, ins=self.swapIns,
+                                                     programa=self.cargasDesdePrograma, outs=self.swapOuts,
+                                                     cow=self.copiasPorEscritura,
+                                                     ticks=HARDWARE.swapDevice.latencyTicks,
+                                                     leidas=self._paginasLeidasPorAdelantado,
+                                                     aciertos=self._aciertosDePrefetch,
+                                                     desperdicio=self._prefetchDesperdiciado)
+
+
+################################ IMAGEN DE PROGRAMA ########################################
+
+class ImagenDePrograma:
+
+    ## paginas de codigo (solo lectura) de un programa del FileSystem, compartidas por todos
+    ## los procesos que lo ejecutan
+
+    def __init__(self, path, programa):
+        self._path = path
+        self._programa = programa
+        self._paginas = []
+        self._procesos = set()  ## pids de los procesos que usan la imagen
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def programa(self):
+        return self._programa
+
+    @property
+    def paginas(self):
+        return self._paginas
+
+    @property
+    def cantidadPaginas(self):
+        return len(self._paginas)
+
+    @property
+    def procesos(self):
+        return self._procesos
+
+    @property
+    def referencias(self):
+        return len(self._procesos)
+
+    def __repr__(self):
+        return "ImagenDePrograma({path}, paginas={paginas}, referencias={referencias})".format(
+            path=self._path, paginas=self.cantidadPaginas, referencias=self.referencias)
+
+
+################################ PAGINA FISICA ########################################
+
+class PaginaFisica:
+
+    ## contenido de una pagina que esta en un frame o en el swap, mapeado por uno o mas procesos.
+    ## Las paginas de una imagen son de solo lectura; las privadas (copias por copy on write)
+    ## solo se pueden escribir mientras un unico proceso las usa.
+
+    def __init__(self, clave, idPage, imagen):
+        self._clave = clave  ## espacio de direcciones con el que se indexa (la imagen o el pid que la copio)
+        self._idPage = idPage
+        self._imagen = imagen
+        self._frame = None
+        self._slot = None
+        self._mapeos = dict()  ## pid -> page table de cada proceso que mapea la pagina
+
+    @property
+    def clave(self):
+        return self._clave
+
+    @property
+    def idPage(self):
+        return self._idPage
+
+    @property
+    def imagen(self):
+        return self._imagen
+
+    @property
+    def esPrivada(self):
+        return self._imagen is None
+
+    ## fuera de memoria se puede leer de algun lado: del swap o (si es de codigo) del programa
+    @property
+    def esCargable(self):
+        return self._slot is not None or self._imagen is not None
+
+    @property
+    def frame(self):
+        return self._frame
+
+    @property
+    def slot(self):
+        return self._slot
+
+    @slot.setter
+    def slot(self, slot):
+        self._slot = slot
+
+    @property
+    def mapeos(self):
+        return self._mapeos
+
+    @property
+    def referencias(self):
+        return len(self._mapeos)
+
+    def setFrame(self, numeroFrame):
+        self._frame = numeroFrame
+        for pageTable in self._mapeos.values():
+            pageTable.setFrame(self._idPage, numeroFrame)
+
+    def mapear(self, pid, pageTable):
+        self._mapeos[pid] = pageTable
+        pageTable.setClave(self._idPage, self._clave)
+        pageTable.setEscribible(self._idPage, False)
+        if self._frame is not None:
+            pageTable.setFrame(self._idPage, self._frame)
+
+    def desmapear(self, pid):
+        return self._mapeos.pop(pid)
+
+    def __repr__(self):
+        return "PaginaFisica({clave}, {idPage}, frame={frame}, slot={slot}, referencias={referencias})".format(
+            clave=self._clave, idPage=self._idPage, frame=self._frame, slot=self._slot, referencias=self.referencias)
+
+
+################################ ASIGNACION DE FRAMES ########################################
+
+class AbstractAsignadorDeFrames:
+
+    def __init__(self, cantidadFrames):
+        self._cantidadFrames = cantidadFrames
+        self._cantidadLibres = cantidadFrames
+
+    @property
+    def cantidadFrames(self):
+        return self._cantidadFrames
+
+    @property
+    def cantidadLibres(self):
+        return self._cantidadLibres
+
+    @property
+    def libres(self):
+        log.logger.error("-- libres MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+    def asignar(self, cantidad):
+        ## devuelve el primer frame de un bloque de frames contiguos, o None si no hay lugar
+        log.logger.error("-- asignar MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+    def liberar(self, numeroFrame):
+        log.logger.error("-- liberar MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+
+class AsignadorDeFramesLista(AbstractAsignadorDeFrames):
+
+    def __init__(self, cantidadFrames):
+        super(AsignadorDeFramesLista, self).__init__(cantidadFrames)
+        self._libres = list(range(cantidadFrames))
+        self._bloques = dict()  ## primer frame -> cantidad de frames
+
+    @property
+    def libres(self):
+        return self._libres
+
+    def asignar(self, cantidad):
+        if cantidad == 1:
+            if not self._libres:
+                return None
+            numeroFrame = self._libres.pop(0)
+        else:
+            numeroFrame = self._buscarContiguos(cantidad)
+            if numeroFrame is None:
+                return None
+            for frame in range(numeroFrame, numeroFrame + cantidad):
+                self._libres.remove(frame)
+        self._bloques[numeroFrame] = cantidad
+        self._cantidadLibres -= cantidad
+        return numeroFrame
+
+    def _buscarContiguos(self, cantidad):
+        ordenados = sorted(self._libres)
+        inicio = 0
+        for indice in range(1, len(ordenados) + 1):
+            if indice == len(ordenados) or ordenados[indice] != ordenados[indice - 1] + 1:
+                if indice - inicio >= cantidad:
+                    return ordenados[inicio]
+                inicio = indice
+        return None
+
+    def liberar(self, numeroFrame):
+        cantidad = self._bloques.pop(numeroFrame)
+        self._libres.extend(range(numeroFrame, numeroFrame + cantidad))
+        self._cantidadLibres += cantidad
+
+    def __repr__(self):
+        return "AsignadorDeFramesLista(libres={libres}/{frames})".format(libres=self._cantidadLibres,
+                                                                         frames=self._cantidadFrames)
+
+
+class AsignadorBuddy(AbstractAsignadorDeFrames):
+
+    ## buddy system binario: cada orden k tiene su lista de bloques libres de 2**k frames.
+    ## Un bloque se parte en dos "buddies" hasta llegar al orden pedido y al liberarse se une con su buddy
+    ## (el que difiere solo en el bit k de la direccion) mientras este libre, asi que ambas cosas son O(log n).
+
+    def __init__(self, cantidadFrames):
+        super(AsignadorBuddy, self).__init__(cantidadFrames)
+        self._ordenMaximo = max(cantidadFrames.bit_length() - 1, 0)
+        self._libresPorOrden = [set() for orden in range(0, self._ordenMaximo + 1)]
+        self._heapsPorOrden = [[] for orden in range(0, self._ordenMaximo + 1)]
+        self._ordenDeBloque = dict()  ## primer frame -> orden de los bloques asignados
+        self._divisiones = 0
+        self._uniones = 0
+        ## si la cantidad de frames no es potencia de 2 se arranca con los bloques alineados mas grandes que entran
+        inicio = 0
+        while inicio < cantidadFrames:
+            orden = self._ordenMaximo
+            while inicio % (1 << orden) != 0 or inicio + (1 << orden) > cantidadFrames:
+                orden -= 1
+            self._agregarLibre(inicio, orden)
+            inicio += 1 << orden
+
+    @property
+    def divisiones(self):
+        return self._divisiones
+
+    @property
+    def uniones(self):
+        return self._uniones
+
+    @property
+    def libres(self):
+        frames = []
+        for orden, bloques in enumerate(self._libresPorOrden):
+            for inicio in bloques:
+                frames.extend(range(inicio, inicio + (1 << orden)))
+        return sorted(frames)
+
+    @property
+    def libresPorOrden(self):
+        return {orden: len(bloques) for orden, bloques in enumerate(self._libresPorOrden)}
+
+    @property
+    def bloqueLibreMasGrande(self):
+        for orden in range(self._ordenMaximo, -1, -1):
+            if self._libresPorOrden[orden]:
+                return 1 << orden
+        return 0
+
+    @property
+    def fragmentacionExterna(self):
+        if self._cantidadLibres == 0:
+            return 0.0
+        return 1 - self.bloqueLibreMasGrande / self._cantidadLibres
+
+    def ordenPara(self, cantidad):
+        return max(cantidad - 1, 0).bit_length()
+
+    def _agregarLibre(self, inicio, orden):
+        self._libresPorOrden[orden].add(inicio)
+        heappush(self._heapsPorOrden[orden], inicio)
+
+    def _sacarLibre(self, orden):
+        ## el heap puede tener bloques que ya se unieron con su buddy: se descartan al pasar
+        heap = self._heapsPorOrden[orden]
+        while heap[0] not in self._libresPorOrden[orden]:
+            heappop(heap)
+        inicio = heappop(heap)
+        self._libresPorOrden[orden].remove(inicio)
+        return inicio
+
+    def asignar(self, cantidad):
+        ordenPedido = self.ordenPara(cantidad)
+        orden = ordenPedido
+        while orden <= self._ordenMaximo and not self._libresPorOrden[orden]:
+            orden += 1
+        if orden > self._ordenMaximo:
+            return None
+        inicio = self._sacarLibre(orden)
+        while orden > ordenPedido:
+            orden -= 1
+            self._agregarLibre(inicio + (1 << orden), orden)
+            self._divisiones += 1
+        self._ordenDeBloque[inicio] = ordenPedido
+        self._cantidadLibres -= 1 << ordenPedido
+        return inicio
+
+    def liberar(self, numeroFrame):
+        orden = self._ordenDeBloque.pop(numeroFrame)
+        self._cantidadLibres += 1 << orden
+        inicio = numeroFrame
+        while orden < self._ordenMaximo:
+            buddy = inicio ^ (1 << orden)
+            if buddy not in self._libresPorOrden[orden]:
+                break
+            self._libresPorOrden[orden].remove(buddy)
+            inicio = min(inicio, buddy)
+            orden += 1
+            self._uniones += 1
+        self._agregarLibre(inicio, orden)
+
+    def __repr__(self):
+        return "AsignadorBuddy(libres={libres}/{frames}, libresPorOrden={porOrden}, divisiones={divisiones}, " \
+               "uniones={uniones}, fragmentacionExterna={fragmentacion:.2f})".format(
+                   libres=self._cantidadLibres, frames=self._cantidadFrames, porOrden=self.libresPorOrden,
+                   divisiones=self._divisiones, uniones=self._uniones, fragmentacion=self.fragmentacionExterna)
+
+
+################################ SWAP SPACE ########################################
+
+class SwapSpace:  ##nuevo
+
+    def __init__(self, swapDevice):
+        self._swapDevice = swapDevice
+        self._cantidadSlots = 0
+        self._bitmap = bytearray()
+        self._slotsUsados = 0
+
+    @property
+    def habilitado(self):
+        return self._swapDevice.size > 0
+
+    @property
+    def cantidadSlots(self):
+        return self._cantidadSlots
+
+    @property
+    def slotsUsados(self):
+        return self._slotsUsados
+
+    def formatear(self, frameSize):
+        ## cada slot del swap guarda una pagina completa
+        self._swapDevice.frameSize = frameSize
+        self._cantidadSlots = self._swapDevice.slots
+        self._bitmap = bytearray((self._cantidadSlots + 7) // 8)
+        self._slotsUsados = 0
+
+    def asignarSlot(self):
+        for indiceByte, byte in enumerate(self._bitmap):
+            if byte != 0xFF:
+                for bit in range(0, 8):
+                    slot = indiceByte * 8 + bit
+                    if slot < self._cantidadSlots and not byte & (1 << bit):
+                        self._bitmap[indiceByte] |= (1 << bit)
+                        self._slotsUsados += 1
+                        return slot
+        raise Exception("\n*\n* ERROR \n*\n No hay slots libres en el swap")
+
+    def liberarSlot(self, slot):
+        self._bitmap[slot // 8] &= ~(1 << (slot % 8)) & 0xFF
+        self._slotsUsados -= 1
+
+    def __repr__(self):
+        return "SwapSpace(slots={slots}, usados={usados})".format(slots=self._cantidadSlots, usados=self._slotsUsados)
+
 
 ################################ LOGICAL MEMORY ########################################
 
 class LogicalMemory:  ##nuevo
 
     def __init__(self):
-        self._memory = []  ##paginas
+        self._memory = dict()  ## imagen -> {idPage -> pagina}
 
     @property
     def memory(self):
         return self._memory
 
-    def addPage(self, page):
-        self.memory.append(page)
+    def addPage(self, imagen, page):
+        self.memory.setdefault(imagen, dict())[page.id] = page
 
-    def getPageForId(self, id):
-        for page in self.memory:
-            if page.id == id:
-                pageBuscado = page
-        return pageBuscado
+    def getPageForId(self, imagen, id):
+        return self.memory[imagen][id]
+
+    def liberarPaginas(self, imagen):
+        self.memory.pop(imagen, None)
 
 
 ################################ PAGE TABLE ########################################
 
-class PageTable:  ##nuevo
+## cantidad de bits del numero de pagina que indexa cada nivel de una page table multinivel
+PAGE_TABLE_BITS_POR_NIVEL = 8
+
+
+class AbstractPageTable:
 
     def __init__(self):
-        self._contadorIdPages = -1
-        self._table = []
+        self._cantidadPaginas = 0
+        self._escribibles = set()  ## paginas que el proceso puede escribir sin copiarlas
 
     @property
-    def getIdPage(self):
-        self._contadorIdPages += 1
-        return self._contadorIdPages
+    def cantidadPaginas(self):
+        return self._cantidadPaginas
+
+    def esEscribible(self, idPage):
+        return idPage in self._escribibles
+
+    def setEscribible(self, idPage, escribible):
+        if escribible:
+            self._escribibles.add(idPage)
+        else:
+            self._escribibles.discard(idPage)
+
+    def setClave(self, idPage, clave):
+        ## solo la usan las page tables que indexan por espacio de direcciones
+        pass
+
+    def addPage(self, idPage):
+        self._cantidadPaginas += 1
+
+    def frameDePagina(self, idPage):
+        log.logger.error("-- frameDePagina MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+    def setFrame(self, idPage, numeroFrame):
+        log.logger.error("-- setFrame MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+    def paginasResidentes(self):
+        log.logger.error("-- paginasResidentes MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
+
+
+
+################################ FLAT PAGE TABLE ########################################
+
+class PageTable(AbstractPageTable):  ##nuevo
+
+    def __init__(self):
+        super(PageTable, self).__init__()
+        self._table = dict()  ## idPage -> numeroFrameMemoria (None si la pagina no esta en memoria)
 
     @property
     def table(self):
         return self._table
 
-    def addTuple(self, tuple):  ## [idPage, numeroFrameMemoria]
-        return self._table.append(tuple)
+    @property
+    def entradasAlocadas(self):
+        return len(self._table)
 
-    def crearPagina(self, instrucciones):
-        return Page(self.getIdPage, instrucciones)
+    def addPage(self, idPage):
+        super(PageTable, self).addPage(idPage)
+        self._table[idPage] = None
+
+    def frameDePagina(self, idPage):
+        return self._table.get(idPage)
+
+    def setFrame(self, idPage, numeroFrame):
+        self._table[idPage] = numeroFrame
+
+    def paginasResidentes(self):
+        return [(idPage, numeroFrame) for idPage, numeroFrame in self._table.items() if numeroFrame is not None]
+
+
+################################ MULTI LEVEL PAGE TABLE ########################################
+
+class MultiLevelPageTable(AbstractPageTable):
+
+    ## page table jerarquica: el numero de pagina se parte en "niveles" indices de "bitsPorNivel" bits.
+    ## Las tablas intermedias se alocan recien cuando se carga una pagina que las necesita y se liberan
+    ## cuando ya no tienen paginas residentes, asi el overhead es proporcional a las paginas en memoria.
+
+    def __init__(self, niveles, bitsPorNivel):
+        super(MultiLevelPageTable, self).__init__()
+        self._niveles = niveles
+        self._bitsPorNivel = bitsPorNivel
+        self._entradasPorTabla = 1 << bitsPorNivel
+        self._raiz = self._nuevaTabla()
+        self._tablasAlocadas = 1
+
+    @property
+    def niveles(self):
+        return self._niveles
+
+    @property
+    def tablasAlocadas(self):
+        return self._tablasAlocadas
+
+    @property
+    def entradasAlocadas(self):
+        return self._tablasAlocadas * self._entradasPorTabla
+
+    def _nuevaTabla(self):
+        ## la ultima posicion de cada tabla cuenta las entradas en uso
+        tabla = [None] * (self._entradasPorTabla + 1)
+        tabla[-1] = 0
+        return tabla
+
+    def _indices(self, idPage):
+        if idPage >> (self._bitsPorNivel * self._niveles):
+            raise Exception("La pagina {idPage} no entra en una page table de {niveles} niveles".format(
+                idPage=idPage, niveles=self._niveles))
+        mascara = self._entradasPorTabla - 1
+        return [(idPage >> (self._bitsPorNivel * nivel)) & mascara for nivel in reversed(range(0, self._niveles))]
+
+    def frameDePagina(self, idPage):
+        tabla = self._raiz
+        for indice in self._indices(idPage):
+            tabla = tabla[indice]
+            if tabla is None:
+                return None
+        return tabla
+
+    def setFrame(self, idPage, numeroFrame):
+        indices = self._indices(idPage)
+        if numeroFrame is None:
+            self._borrarEntrada(self._raiz, indices)
+            return
+        tabla = self._raiz
+        for indice in indices[:-1]:
+            if tabla[indice] is None:
+                tabla[indice] = self._nuevaTabla()
+                tabla[-1] += 1
+                self._tablasAlocadas += 1
+            tabla = tabla[indice]
+        if tabla[indices[-1]] is None:
+            tabla[-1] += 1
+        tabla[indices[-1]] = numeroFrame
+
+    def _borrarEntrada(self, tabla, indices):
+        indice = indices[0]
+        if tabla[indice] is None:
+            return
+        if len(indices) == 1:
+            tabla[indice] = None
+            tabla[-1] -= 1
+            return
+        subTabla = tabla[indice]
+        self._borrarEntrada(subTabla, indices[1:])
+        if subTabla[-1] == 0:
+            ## la tabla intermedia quedo vacia: se libera
+            tabla[indice] = None
+            tabla[-1] -= 1
+            self._tablasAlocadas -= 1
+
+    def paginasResidentes(self):
+        residentes = []
+        self._recorrer(self._raiz, 0, 0, residentes)
+        return residentes
+
+    def _recorrer(self, tabla, nivel, prefijo, residentes):
+        for indice in range(0, self._entradasPorTabla):
+            entrada = tabla[indice]
+            if entrada is None:
+                continue
+            idPage = (prefijo << self._bitsPorNivel) | indice
+            if nivel == self._niveles - 1:
+                residentes.append((idPage, entrada))
+            else:
+                self._recorrer(entrada, nivel + 1, idPage, residentes)
+
+
+################################ INVERTED PAGE TABLE ########################################
+
+class InvertedPageTable:
+
+    ## una sola tabla para todo el sistema con una entrada por frame fisico.
+    ## Se busca por hash de (espacio de direcciones, pagina): cada ancla apunta al primer frame de su cadena de colisiones
+    ## y cada entrada apunta al siguiente frame de la misma cadena.
+
+    def __init__(self, cantidadFrames):
+        self._claves = [None] * cantidadFrames
+        self._paginas = [None] * cantidadFrames
+        self._siguiente = [None] * cantidadFrames
+        self._anclas = [None] * max(cantidadFrames, 1)
+        self._busquedas = 0
+        self._pasos = 0
+        self._cadenaMaxima = 0
+
+    @property
+    def entradasAlocadas(self):
+        return len(self._claves)
+
+    @property
+    def busquedas(self):
+        return self._busquedas
+
+    @property
+    def pasosPromedio(self):
+        if self._busquedas == 0:
+            return 0.0
+        return self._pasos / self._busquedas
+
+    @property
+    def cadenaMaxima(self):
+        return self._cadenaMaxima
+
+    def _hash(self, clave, idPage):
+        return hash((clave, idPage)) % len(self._anclas)
+
+    def buscar(self, clave, idPage):
+        self._busquedas += 1
+        pasos = 0
+        numeroFrame = self._anclas[self._hash(clave, idPage)]
+        while numeroFrame is not None:
+            pasos += 1
+            if self._claves[numeroFrame] == clave and self._paginas[numeroFrame] == idPage:
+                break
+            numeroFrame = self._siguiente[numeroFrame]
+        self._pasos += pasos
+        self._cadenaMaxima = max(self._cadenaMaxima, pasos)
+        return numeroFrame
+
+    def insertar(self, clave, idPage, numeroFrame):
+        if self._claves[numeroFrame] is not None:
+            self.eliminar(self._claves[numeroFrame], self._paginas[numeroFrame])
+        ancla = self._hash(clave, idPage)
+        self._claves[numeroFrame] = clave
+        self._paginas[numeroFrame] = idPage
+        self._siguiente[numeroFrame] = self._anclas[ancla]
+        self._anclas[ancla] = numeroFrame
+
+    def eliminar(self, clave, idPage):
+        ancla = self._hash(clave, idPage)
+        anterior = None
+        numeroFrame = self._anclas[ancla]
+        while numeroFrame is not None:
+            if self._claves[numeroFrame] == clave and self._paginas[numeroFrame] == idPage:
+                if anterior is None:
+                    self._anclas[ancla] = self._siguiente[numeroFrame]
+                else:
+                    self._siguiente[anterior] = self._siguiente[numeroFrame]
+                self._claves[numeroFrame] = None
+                self._paginas[numeroFrame] = None
+                self._siguiente[numeroFrame] = None
+                return
+            anterior = numeroFrame
+            numeroFrame = self._siguiente[numeroFrame]
+
+    def paginasDe(self, clave):
+        return [(self._paginas[numeroFrame], numeroFrame) for numeroFrame in range(0, len(self._claves))
+                if self._claves[numeroFrame] == clave]
+
+    def largosDeCadenas(self):
+        largos = []
+        for numeroFrame in self._anclas:
+            largo = 0
+            while numeroFrame is not None:
+                largo += 1
+                numeroFrame = self._siguiente[numeroFrame]
+            if largo > 0:
+                largos.append(largo)
+        return largos
+
+    def __repr__(self):
+        largos = self.largosDeCadenas()
+        return "InvertedPageTable(entradas={entradas}, busquedas={busquedas}, pasosPromedio={pasos:.2f}, " \
+               "cadenaMaxima={maxima}, cadenasActuales={cadenas})".format(entradas=self.entradasAlocadas,
+                                                                         busquedas=self._busquedas,
+                                                                         pasos=self.pasosPromedio,
+                                                                         maxima=self._cadenaMaxima, cadenas=largos)
+
+
+class PageTableInvertida(AbstractPageTable):
+
+    ## vista de la InvertedPageTable para un proceso: el MMU la recorre igual que a cualquier page table,
+    ## pero las entradas viven en la tabla del sistema. Las paginas de codigo se indexan por la imagen del
+    ## programa (y no por pid) porque sus frames son compartidos por todos los procesos que la ejecutan;
+    ## solo las paginas propias (copias por copy on write) guardan aca la clave con la que se indexan
+
+    def __init__(self, invertedPageTable, imagen):
+        super(PageTableInvertida, self).__init__()
+        self._invertedPageTable = invertedPageTable
+        self._clave = imagen
+        self._clavesPropias = dict()  ## idPage -> clave de las paginas que no son de la imagen
+
+    @property
+    def entradasAlocadas(self):
+        return 0
+
+    def _claveDe(self, idPage):
+        return self._clavesPropias.get(idPage, self._clave)
+
+    def setClave(self, idPage, clave):
+        if clave is self._clave:
+            self._clavesPropias.pop(idPage, None)
+        else:
+            self._clavesPropias[idPage] = clave
+
+    def frameDePagina(self, idPage):
+        return self._invertedPageTable.buscar(self._claveDe(idPage), idPage)
+
+    def setFrame(self, idPage, numeroFrame):
+        if numeroFrame is None:
+            self._invertedPageTable.eliminar(self._claveDe(idPage), idPage)
+        else:
+            self._invertedPageTable.insertar(self._claveDe(idPage), idPage, numeroFrame)
+
+    def paginasResidentes(self):
+        residentes = [(idPage, numeroFrame) for idPage, numeroFrame in self._invertedPageTable.paginasDe(self._clave)
+                      if idPage not in self._clavesPropias]
+        for idPage in self._clavesPropias:
+            numeroFrame = self.frameDePagina(idPage)
+            if numeroFrame is not None:
+                residentes.append((idPage, numeroFrame))
+        return residentes
 
 
 ################################ PAGE ########################################
 
 class Page:  ##nuevo
 
-    def __init__(self, id, cells):
+    ## las posiciones [desde, hasta) del programa: las celdas se arman solo cuando se cargan
+    __slots__ = ('_id', '_programa', '_desde', '_hasta')
+
+    def __init__(self, id, programa, desde, hasta):
         self._id = id
-        self._cells = cells
+        self._programa = programa
+        self._desde = desde
+        self._hasta = hasta
 
     @property
     def cells(self):
-        return self._cells
+        return self._programa.instruccionesEntre(self._desde, self._hasta)
 
     @property
     def id(self):
@@ -684,7 +3032,9 @@ class Page:  ##nuevo
 
 class Kernel:
 
-    def __init__(self, seleccion, quantum, frameSize, tamañoMemoria):
+    def __init__(self, seleccion, quantum, frameSize, tamañoMemoria, nivelesPageTable=1, pageTableInvertida=False,
+                 buddy=False, ventanaWorkingSet=None, readAhead=False, politicaDeAdmision="1",
+                 politicaDeDisco="1"):
         self._tamañoMemoria = tamañoMemoria
         if seleccion == "1":
             self._scheduler = PriorityExpropiativoScheduler()
@@ -714,16 +3064,47 @@ class Kernel:
         pageFaultHandler = PageFaultInterruptionHandler(self)
         HARDWARE.interruptVector.register(PAGE_FAULT_INTERRUPTION_TYPE, pageFaultHandler)
 
+        protectionFaultHandler = ProtectionFaultInterruptionHandler(self)
+        HARDWARE.interruptVector.register(PROTECTION_FAULT_INTERRUPTION_TYPE, protectionFaultHandler)
+
+        forkHandler = ForkInterruptionHandler(self)
+        HARDWARE.interruptVector.register(FORK_INTERRUPTION_TYPE, forkHandler)
+
         ## setear frameSize al MMU
         HARDWARE.mmu.frameSize = int(frameSize)
 
         ## controls the Hardware's I/O Device
         self._finalizado = None
-        self._ioDeviceController = IoDeviceController(HARDWARE.ioDevice)
+        self._ioDeviceControllers = dict()  ## deviceId -> controller con la cola de espera de ese dispositivo
+        for deviceId, device in HARDWARE.ioDevices.items():
+            if isinstance(device, DiskIODevice):
+                self._ioDeviceControllers[deviceId] = DiskDeviceController(device, self.politicaDeDisco(politicaDeDisco, device.cylinders))
+            else:
+                self._ioDeviceControllers[deviceId] = IoDeviceController(device)
         self._loader = Loader(self, frameSize)
         self._pcbTable = PCBTable()
         self._dispatcher = Dispatcher()
-        self.memoryManager = MemoryManager(self, frameSize, int(tamañoMemoria / frameSize))
+        self.memoryManager = MemoryManager(self, frameSize, int(tamañoMemoria / frameSize), nivelesPageTable,
+                                           pageTableInvertida, buddy, readAhead)
+        self.memoryManager.swap.formatear(frameSize)
+        ## control de carga con working sets (opcional)
+        self._planificadorMedianoPlazo = None
+        if ventanaWorkingSet is not None:
+            self._planificadorMedianoPlazo = PlanificadorMedianoPlazo(self, int(ventanaWorkingSet))
+            HARDWARE.clock.addSubscriber(self._planificadorMedianoPlazo)
+            HARDWARE.mmu.addReferenceSubscriber(self._planificadorMedianoPlazo)
+        if readAhead:
+            HARDWARE.mmu.addReferenceSubscriber(self.memoryManager)
+
+        ## planificador de largo plazo
+        if politicaDeAdmision == "1":
+            politica = PoliticaDeAdmisionFIFO()
+        if politicaDeAdmision == "2":
+            politica = PoliticaDeAdmisionMenorPrimero()
+        if politicaDeAdmision == "3":
+            politica = PoliticaDeAdmisionPrioridad()
+        self._colaDeAdmision = ColaDeAdmision(self, politica)
+        HARDWARE.clock.addSubscriber(self._colaDeAdmision)
         self.fileSystem = FileSystem(self)
 
     @property
@@ -734,6 +3115,14 @@ class Kernel:
     def fileSystem(self):
         return self._fileSystem
 
+    @property
+    def planificadorMedianoPlazo(self):
+        return self._planificadorMedianoPlazo
+
+    @property
+    def colaDeAdmision(self):
+        return self._colaDeAdmision
+
     @property
     def finalizado(self):
         return self._finalizado
@@ -744,7 +3133,29 @@ class Kernel:
 
     @property
     def ioDeviceController(self):
-        return self._ioDeviceController
+        return self._ioDeviceControllers.get(PRINTER_DEVICE)
+
+    @property
+    def ioDeviceControllers(self):
+        return self._ioDeviceControllers
+
+    def politicaDeDisco(self, seleccion, cilindros):
+        if seleccion == "1":
+            return PoliticaDeDiscoFCFS(cilindros)
+        if seleccion == "2":
+            return PoliticaDeDiscoSSTF(cilindros)
+        if seleccion == "3":
+            return PoliticaDeDiscoSCAN(cilindros)
+        if seleccion == "4":
+            return PoliticaDeDiscoLOOK(cilindros)
+        if seleccion == "5":
+            return PoliticaDeDiscoCLOOK(cilindros)
+
+    def ioDeviceControllerDe(self, deviceId):
+        if deviceId not in self._ioDeviceControllers:
+            raise Exception("\n*\n* ERROR \n*\n No existe el dispositivo de entrada/salida {deviceId}".format(
+                deviceId=deviceId))
+        return self._ioDeviceControllers[deviceId]
 
     @property
     def tamañoMemoria(self):
@@ -773,12 +3184,25 @@ class Kernel:
     ## emulates a "system call" for programs execution
     def run(self, pathProgram, priority):
         self.finalizado = False
-        tuple = [pathProgram, priority]
-        newIRQ = IRQ(NEW_INTERRUPTION_TYPE, tuple)
+        ## el programa se busca una sola vez: si no existe el error sale en la llamada y no en el handler
+        program = self.fileSystem.read(pathProgram)
+        if isinstance(program, ProgramaBinario) and program.frameSize != self.loader.frameSize:
+            raise Exception("\n*\n* ERROR \n*\n El programa {path} tiene paginas de {imagen} celdas y los frames son de {frameSize}".format(
+                path=pathProgram, imagen=program.frameSize, frameSize=self.loader.frameSize))
+        trabajo = Trabajo(pathProgram, program, priority)
+        if not self.colaDeAdmision.entraEnMemoria(trabajo):
+            raise Exception("\n*\n* ERROR \n*\n El programa {path} no entra en memoria y no hay swap configurado".format(
+                path=pathProgram))
+        newIRQ = IRQ(NEW_INTERRUPTION_TYPE, trabajo)
         HARDWARE.interruptVector.handle(newIRQ)
-        log.logger.info("\n Executing program: {name}".format(name=self.fileSystem.read(pathProgram).name))
+        log.logger.info("\n Executing program: {name}".format(name=program.name))
         log.logger.info(HARDWARE)
 
+    ## emulates a "system call" to clone a process (None = the running process)
+    def fork(self, pid=None):
+        forkIRQ = IRQ(FORK_INTERRUPTION_TYPE, pid)
+        HARDWARE.interruptVector.handle(forkIRQ)
+
     def __repr__(self):
         return "Kernel "
 
@@ -837,7 +3261,7 @@ class GraficadorGantt:
         nroProceso = 0
 
         for pcb in pcbTable:
-            retorna = pcb.state
+            retorna = str(pcb.state)
             self._representacion[nroProceso].append(retorna)
 
             nroProceso = nroProceso + 1
@@ -0,0 +1,56 @@
+## los modulos de la practica se importan como en main.py (desde su directorio)
+import collections
+import collections.abc
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+## el tabulate incluido importa Iterable de collections (se movio a collections.abc en python 3.10)
+if not hasattr(collections, "Iterable"):
+    collections.Iterable = collections.abc.Iterable
+
+import hardware
+from hardware import HARDWARE
+
+
+## el reloj espera un segundo por tick: en los tests no hace falta
+@pytest.fixture(autouse=True)
+def sinEsperas(monkeypatch):
+    monkeypatch.setattr(hardware, "sleep", lambda segundos: None)
+
+
+## arma el hardware con el archivo de swap en un directorio temporal
+@pytest.fixture
+def armarHardware(tmp_path):
+    def armar(memoria, swap=0, **opciones):
+        HARDWARE.setup(memoria, swap, str(tmp_path / "swap.bin"), **opciones)
+        return HARDWARE
+    yield armar
+    HARDWARE.swapDevice.close()
+
+
+## hace andar el reloj hasta que terminen todos los procesos, devuelve la cantidad de ticks
+@pytest.fixture
+def correr():
+    def correrHastaTerminar(kernel, maximo=5000):
+        for tick in range(maximo):
+            if kernel.finalizado:
+                return tick
+            HARDWARE.clock.tick(tick)
+        raise AssertionError("los procesos no terminaron en {maximo} ticks".format(maximo=maximo))
+    return correrHastaTerminar
+
+
+## ensambla un fuente escrito en el test: ensamblar("cont", "SET R1 5 ...", frameSize=4)
+@pytest.fixture
+def ensamblar(tmp_path):
+    from so import Ensamblador
+
+    def ensamblarTexto(nombre, fuente, frameSize=4):
+        path = tmp_path / (nombre + ".asm")
+        path.write_text(fuente)
+        return Ensamblador(frameSize).ensamblarFuente(str(path))
+    return ensamblarTexto
@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+
+from hardware import HARDWARE, IRQ, NEW_INTERRUPTION_TYPE, TERMINAL_DEVICE
+from so import ASM, Kernel, Program, Trabajo
+
+## da 20 vueltas en su primera pagina y despues recorre otras 8: el working set queda chico mientras da vueltas
+VUELTAS = """
+      SET R1 20
+loop: SUB R1 1
+      JNZ R1 loop
+      CPU * 30
+      IO Terminal
+      EXIT
+"""
+
+
+def correrContando(kernel, maximo=5000):
+    ## cantidad maxima de procesos vivos al mismo tiempo
+    simultaneos = 0
+    for tick in range(maximo):
+        if kernel.finalizado:
+            return simultaneos
+        HARDWARE.clock.tick(tick)
+        simultaneos = max(simultaneos, kernel.pcbTable.cantidad)
+    raise AssertionError("los procesos no terminaron en {maximo} ticks".format(maximo=maximo))
+
+
+def test_sin_swap_un_programa_que_no_entra_se_rechaza_al_ejecutarlo(armarHardware):
+    armarHardware(8)
+    kernel = Kernel("3", None, 4, 8)
+    kernel.fileSystem.write("c:/grande.exe", Program("grande.exe", [ASM.CPU(20)]))
+    with pytest.raises(Exception, match="no entra en memoria"):
+        kernel.run("c:/grande.exe", 0)
+    assert kernel.colaDeAdmision.largo == 0
+
+
+def test_el_handler_descarta_un_trabajo_que_no_entra_sin_cortar_la_ejecucion(armarHardware, caplog):
+    armarHardware(8)
+    kernel = Kernel("3", None, 4, 8)
+    grande = Program("grande.exe", [ASM.CPU(20)])
+    HARDWARE.interruptVector.handle(IRQ(NEW_INTERRUPTION_TYPE, Trabajo("c:/grande.exe", grande, 0)))
+    with caplog.at_level(logging.ERROR):
+        HARDWARE.clock.tick(0)
+    assert "rechazado" in caplog.text
+    assert kernel.colaDeAdmision.largo == 0
+    assert kernel.pcbTable.cantidad == 0
+
+
+def test_los_procesos_admitidos_reservan_su_working_set(armarHardware, ensamblar):
+    ## 16 frames y procesos de 9 paginas con una ventana de 8: entran dos reservas, el tercero espera
+    armarHardware(64, 256)
+    kernel = Kernel("3", None, 4, 64, ventanaWorkingSet=8)
+    kernel.fileSystem.write("c:/vueltas.exe", ensamblar("vueltas", VUELTAS))
+    for vez in range(3):
+        kernel.run("c:/vueltas.exe", 0)
+    HARDWARE.clock.tick(0)
+    assert kernel.pcbTable.cantidad == 2
+    assert kernel.colaDeAdmision.largo == 1
+    assert kernel.planificadorMedianoPlazo.demandaEstimada == 16
+
+
+def test_cuando_baja_la_demanda_se_admite_sin_esperar_que_termine_un_proceso(armarHardware, ensamblar):
+    armarHardware(64, 256)
+    kernel = Kernel("3", None, 4, 64, ventanaWorkingSet=8)
+    kernel.fileSystem.write("c:/vueltas.exe", ensamblar("vueltas", VUELTAS))
+    for vez in range(3):
+        kernel.run("c:/vueltas.exe", 0)
+
+    assert correrContando(kernel) == 3
+    assert kernel.colaDeAdmision.admitidos == 3
+    assert kernel.colaDeAdmision.esperaMaxima > 0
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 3
@@ -0,0 +1,74 @@
+import pytest
+
+from hardware import HARDWARE, TERMINAL_DEVICE
+from so import AsignadorBuddy, Kernel
+
+from test_swap import CONTADOR
+
+
+def test_un_pedido_parte_el_bloque_hasta_el_orden_pedido():
+    buddy = AsignadorBuddy(16)
+    assert buddy.libresPorOrden == {0: 0, 1: 0, 2: 0, 3: 0, 4: 1}
+
+    assert buddy.asignar(3) == 0
+    assert buddy.libresPorOrden == {0: 0, 1: 0, 2: 1, 3: 1, 4: 0}
+    assert buddy.divisiones == 2
+    assert buddy.cantidadLibres == 12
+    assert buddy.libres == list(range(4, 16))
+
+
+def test_al_liberar_se_une_con_su_buddy_libre():
+    buddy = AsignadorBuddy(8)
+    primero = buddy.asignar(1)
+    segundo = buddy.asignar(1)
+    assert (primero, segundo) == (0, 1)
+
+    buddy.liberar(primero)
+    assert buddy.uniones == 0
+    buddy.liberar(segundo)
+    assert buddy.uniones == 3
+    assert buddy.libresPorOrden == {0: 0, 1: 0, 2: 0, 3: 1}
+    assert buddy.fragmentacionExterna == 0.0
+
+
+def test_una_memoria_que_no_es_potencia_de_dos_arranca_con_bloques_alineados():
+    buddy = AsignadorBuddy(12)
+    assert buddy.libresPorOrden == {0: 0, 1: 0, 2: 1, 3: 1}
+    assert buddy.bloqueLibreMasGrande == 8
+    assert buddy.asignar(8) == 0
+    assert buddy.asignar(8) is None
+    assert buddy.asignar(4) == 8
+
+
+def test_la_fragmentacion_externa_cuenta_los_libres_fuera_del_bloque_mas_grande():
+    buddy = AsignadorBuddy(8)
+    frames = [buddy.asignar(1) for vez in range(8)]
+    for frame in frames[1::2]:
+        buddy.liberar(frame)
+    assert buddy.bloqueLibreMasGrande == 1
+    assert buddy.fragmentacionExterna == 0.75
+    assert buddy.asignar(2) is None
+
+
+def test_los_bloques_reservados_quedan_fuera_del_reemplazo(armarHardware):
+    armarHardware(32)
+    kernel = Kernel("4", 3, 4, 32, buddy=True)
+    memoryManager = kernel.memoryManager
+    bloque = memoryManager.reservarBloque(4)
+    assert bloque % 4 == 0
+    assert memoryManager.asignadorDeFrames.cantidadLibres == 4
+    with pytest.raises(Exception, match="contiguos"):
+        memoryManager.reservarBloque(8)
+    memoryManager.liberarBloque(bloque)
+    assert memoryManager.asignadorDeFrames.libresPorOrden[3] == 1
+
+
+def test_los_procesos_corren_igual_con_el_buddy(armarHardware, correr, ensamblar):
+    armarHardware(8, 64)
+    kernel = Kernel("4", 3, 4, 8, buddy=True)
+    kernel.fileSystem.write("c:/contador.exe", ensamblar("contador", CONTADOR))
+    kernel.run("c:/contador.exe", 0)
+    kernel.run("c:/contador.exe", 0)
+    correr(kernel)
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 2
+    assert kernel.memoryManager.asignadorDeFrames.cantidadLibres == 2
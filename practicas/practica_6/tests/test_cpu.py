@@ -0,0 +1,30 @@
+from hardware import HARDWARE
+from so import Kernel
+
+PRIMERO = "SET R1 1\nEXIT\n"
+SEGUNDO = "SET R1 2\nEXIT\n"
+
+
+def test_un_cpu_nuevo_no_tiene_instruccion_en_curso(armarHardware):
+    cpu = armarHardware(8).cpu
+    assert not cpu.isBusy()
+    assert cpu.decodeHits == 0 and cpu.decodeMisses == 0
+    ## sin proceso el tick no ejecuta nada
+    cpu.tick(0)
+    assert cpu.decodeMisses == 0
+
+
+def test_escribir_un_frame_descarta_sus_instrucciones_decodificadas(armarHardware, ensamblar, correr):
+    ## con un solo frame el segundo programa se carga donde se decodifico el primero
+    armarHardware(4)
+    kernel = Kernel("3", None, 4, 4)
+    kernel.fileSystem.write("c:/primero.exe", ensamblar("primero", PRIMERO))
+    kernel.fileSystem.write("c:/segundo.exe", ensamblar("segundo", SEGUNDO))
+    kernel.run("c:/primero.exe", 0)
+    correr(kernel)
+    assert HARDWARE.cpu.registers[1] == 1
+    misses = HARDWARE.cpu.decodeMisses
+    kernel.run("c:/segundo.exe", 0)
+    correr(kernel)
+    assert HARDWARE.cpu.registers[1] == 2
+    assert HARDWARE.cpu.decodeMisses == misses + 2
@@ -0,0 +1,87 @@
+import pytest
+
+from hardware import ASM, DISK_DEVICE, HARDWARE, DiskIODevice
+from so import (IndiceDeCilindros, Kernel, PoliticaDeDiscoCLOOK, PoliticaDeDiscoFCFS, PoliticaDeDiscoLOOK,
+                PoliticaDeDiscoSCAN, PoliticaDeDiscoSSTF, Program)
+
+## el ejemplo de siempre: cabezal en 53, disco de 200 cilindros
+PEDIDOS = [98, 183, 37, 122, 14, 124, 65, 67]
+
+
+def atender(politica, cabezal=53, cilindros=200):
+    for cilindro in PEDIDOS:
+        politica.agregar(cilindro, cilindro)
+    orden = []
+    vias = []
+    while politica.pendientes > 0:
+        pedido, via = politica.siguiente(cabezal, cilindros)
+        orden.append(pedido)
+        vias.append(via)
+        cabezal = pedido
+    return orden, vias
+
+
+def test_el_indice_encuentra_el_cilindro_ocupado_mas_cercano_en_cada_sentido():
+    indice = IndiceDeCilindros(200)
+    for cilindro in (14, 98, 199):
+        indice.marcar(cilindro)
+    assert indice.primeroDesde(0) == 14
+    assert indice.primeroDesde(15) == 98
+    assert indice.primeroDesde(98) == 98
+    assert indice.ultimoHasta(97) == 14
+    assert indice.ultimoHasta(199) == 199
+    assert indice.ultimoHasta(13) is None
+    indice.desmarcar(199)
+    assert indice.primeroDesde(99) is None
+    with pytest.raises(Exception, match="Cilindro 200 invalido"):
+        indice.marcar(200)
+
+
+def test_fcfs():
+    assert atender(PoliticaDeDiscoFCFS(200))[0] == PEDIDOS
+
+
+def test_sstf():
+    assert atender(PoliticaDeDiscoSSTF(200))[0] == [65, 67, 37, 14, 98, 122, 124, 183]
+
+
+def test_scan_llega_al_borde_antes_de_volver():
+    orden, vias = atender(PoliticaDeDiscoSCAN(200))
+    assert orden == [65, 67, 98, 122, 124, 183, 37, 14]
+    assert vias == [None] * 6 + [199, None]
+
+
+def test_look_vuelve_en_el_ultimo_pedido():
+    orden, vias = atender(PoliticaDeDiscoLOOK(200))
+    assert orden == [65, 67, 98, 122, 124, 183, 37, 14]
+    assert vias == [None] * 8
+
+
+def test_c_look_salta_al_pedido_mas_bajo():
+    assert atender(PoliticaDeDiscoCLOOK(200))[0] == [65, 67, 98, 122, 124, 183, 14, 37]
+
+
+def test_los_pedidos_del_mismo_cilindro_salen_por_orden_de_llegada():
+    politica = PoliticaDeDiscoSSTF(200)
+    politica.agregar(10, "primero")
+    politica.agregar(10, "segundo")
+    assert politica.siguiente(0, 200)[0] == "primero"
+    assert politica.siguiente(0, 200)[0] == "segundo"
+
+
+def test_sstf_recorre_menos_cilindros_que_fcfs():
+    def seekTotal(politicaDeDisco):
+        HARDWARE.setup(1024, ioDevices=[DiskIODevice()])
+        kernel = Kernel("4", 2, 4, 1024, politicaDeDisco=politicaDeDisco)
+        for k, cilindro in enumerate(PEDIDOS):
+            kernel.fileSystem.write("c:/d%d.exe" % k, Program("d%d.exe" % k, [ASM.IO(DISK_DEVICE, cilindro)]))
+            kernel.run("c:/d%d.exe" % k, 0)
+        for tick in range(500):
+            if kernel.finalizado:
+                break
+            HARDWARE.clock.tick(tick)
+        assert kernel.finalizado
+        disco = HARDWARE.ioDevices[DISK_DEVICE]
+        assert disco.operations == len(PEDIDOS)
+        return disco.totalSeek
+    assert seekTotal("2") < seekTotal("1")
@@ -0,0 +1,53 @@
+import pytest
+
+from hardware import ASM, HARDWARE, NETWORK_DEVICE, PRINTER_DEVICE, TERMINAL_DEVICE, NetworkIODevice, PrinterIODevice
+from so import Kernel, Program
+
+
+def correrProgramas(kernel, programas, maximo=500):
+    for k, instrucciones in enumerate(programas):
+        kernel.fileSystem.write("c:/p%d.exe" % k, Program("p%d.exe" % k, instrucciones))
+        kernel.run("c:/p%d.exe" % k, 0)
+    for tick in range(maximo):
+        if kernel.finalizado:
+            return tick
+        HARDWARE.clock.tick(tick)
+    raise AssertionError("los procesos no terminaron en {maximo} ticks".format(maximo=maximo))
+
+
+def test_la_instruccion_io_nombra_al_dispositivo():
+    assert ASM.IO() == "IO"
+    assert ASM.IO(TERMINAL_DEVICE) == "IO Terminal"
+    assert ASM.deviceOf(ASM.IO()) == PRINTER_DEVICE
+    assert ASM.deviceOf(ASM.IO(NETWORK_DEVICE)) == NETWORK_DEVICE
+    assert ASM.isIO(ASM.IO(NETWORK_DEVICE))
+
+
+def test_cada_operacion_va_a_su_dispositivo():
+    HARDWARE.setup(128)
+    kernel = Kernel("4", 2, 4, 128)
+    correrProgramas(kernel, [[ASM.CPU(1), ASM.IO(), ASM.CPU(1)],
+                             [ASM.CPU(1), ASM.IO(TERMINAL_DEVICE), ASM.IO(NETWORK_DEVICE), ASM.CPU(1)]])
+    dispositivos = HARDWARE.ioDevices
+    assert dispositivos[PRINTER_DEVICE].completions == 1
+    assert dispositivos[TERMINAL_DEVICE].completions == 1
+    assert dispositivos[NETWORK_DEVICE].completions == 1
+
+
+def test_las_operaciones_en_distintos_dispositivos_se_superponen():
+    HARDWARE.setup(128)
+    kernel = Kernel("4", 2, 4, 128)
+    mismoDispositivo = correrProgramas(kernel, [[ASM.IO(), ASM.CPU(1)], [ASM.IO(), ASM.CPU(1)]])
+    HARDWARE.setup(128)
+    kernel = Kernel("4", 2, 4, 128)
+    distintos = correrProgramas(kernel, [[ASM.IO(), ASM.CPU(1)], [ASM.IO(NETWORK_DEVICE), ASM.CPU(1)]])
+    assert distintos < mismoDispositivo
+
+
+def test_los_dispositivos_se_configuran_en_el_setup():
+    HARDWARE.setup(128, ioDevices=[PrinterIODevice(), NetworkIODevice()])
+    assert list(HARDWARE.ioDevices) == [PRINTER_DEVICE, NETWORK_DEVICE]
+    kernel = Kernel("4", 2, 4, 128)
+    assert set(kernel.ioDeviceControllers) == {PRINTER_DEVICE, NETWORK_DEVICE}
+    with pytest.raises(Exception, match="No existe el dispositivo de entrada/salida Terminal"):
+        kernel.ioDeviceControllerDe(TERMINAL_DEVICE)
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from so import Ensamblador, EscritorDeImagenes, FileSystem, ProgramaBinario
+
+FUENTE = "CPU 3\nIO Terminal\n"
+
+
+def escribirFuentes(directorio, nombres, fuente=FUENTE):
+    for nombre in nombres:
+        with open(os.path.join(str(directorio), nombre), "w") as archivo:
+            archivo.write(fuente)
+
+
+def test_fuentes_iguales_con_distinto_nombre(tmp_path):
+    escribirFuentes(tmp_path, ["a.asm", "b.asm"])
+    ensamblador = Ensamblador(4)
+    programas = ensamblador.ensamblarDirectorio(str(tmp_path))
+    assert [programa.name for nombre, programa in programas] == ["a.exe", "b.exe"]
+    assert programas[0][1].segmentos == programas[1][1].segmentos
+    assert ensamblador.aciertos == 1
+    fileSystem = FileSystem(None)
+    fileSystem.importar([("c:/" + programa.name, programa) for nombre, programa in programas])
+    assert sorted(fileSystem.listdir("c:/")) == ["a.exe", "b.exe"]
+
+
+def test_fuentes_iguales_con_name_conservan_el_nombre(tmp_path):
+    escribirFuentes(tmp_path, ["a.asm", "b.asm"], ".name comun.exe\n" + FUENTE)
+    programas = Ensamblador(4).ensamblarDirectorio(str(tmp_path))
+    assert [programa.name for nombre, programa in programas] == ["comun.exe", "comun.exe"]
+
+
+def test_cache_en_disco_por_nombre_y_frame(tmp_path):
+    fuentes = tmp_path / "fuentes"
+    cache = tmp_path / "cache"
+    fuentes.mkdir()
+    escribirFuentes(fuentes, ["a.asm", "b.asm"])
+    Ensamblador(4, str(cache)).ensamblar(str(fuentes / "a.asm"))
+    ensamblador = Ensamblador(4, str(cache))
+    programa = ensamblador.ensamblar(str(fuentes / "b.asm"))
+    assert ensamblador.aciertos == 1
+    assert isinstance(programa, ProgramaBinario)
+    assert programa.name == "b.exe"
+    ## con otro tamaño de frame la imagen del cache no sirve
+    otro = Ensamblador(8, str(cache))
+    assert otro.ensamblar(str(fuentes / "a.asm")).name == "a.exe"
+    assert otro.aciertos == 0
+    assert len(os.listdir(str(cache))) == 2
+
+
+def test_inmediatos_negativos_y_cero(tmp_path):
+    escribirFuentes(tmp_path, ["n.asm"], "SET R1 -3\nADD R1 0\nSUB R1 -1\nDATA -7\n")
+    programa = Ensamblador(4).ensamblar(str(tmp_path / "n.asm"))
+    instrucciones = programa.instruccionesEntre(0, 4)
+    assert instrucciones == ["SET R1 -3", "ADD R1 0", "SUB R1 -1", -7]
+    ## los valores con signo sobreviven a la imagen binaria
+    imagen = EscritorDeImagenes(4).escribir(programa, str(tmp_path / "n.img"))
+    with ProgramaBinario(imagen) as binario:
+        assert binario.instruccionesEntre(0, 4) == instrucciones
+
+
+def test_rafagas_y_repeticiones_piden_al_menos_uno(tmp_path):
+    for fuente in ["CPU 0\n", "IO Terminal * 0\n", "CPU -2\n", "SET R1 dos\n"]:
+        escribirFuentes(tmp_path, ["mal.asm"], fuente)
+        with pytest.raises(Exception, match="se esperaba un numero"):
+            Ensamblador(4).ensamblarFuente(str(tmp_path / "mal.asm"))
@@ -0,0 +1,51 @@
+import pytest
+
+from so import ASM, FileSystem, Program
+
+
+def programa(nombre):
+    return Program(nombre, [ASM.CPU(1)])
+
+
+def test_escribir_crea_los_directorios_y_leer_los_recorre():
+    fileSystem = FileSystem(None)
+    prg = programa("prg.exe")
+    fileSystem.write("c:/bin/juegos/prg.exe", prg)
+    assert fileSystem.read("c:/bin/juegos/prg.exe") is prg
+    assert fileSystem.read("c:\\bin\\juegos\\prg.exe") is prg
+    assert fileSystem.listdir("c:/bin") == ["juegos"]
+    assert fileSystem.exists("c:/bin/juegos/prg.exe")
+    assert not fileSystem.exists("c:/bin/otro/prg.exe")
+
+
+def test_escribir_de_nuevo_reemplaza_el_archivo():
+    fileSystem = FileSystem(None)
+    fileSystem.write("c:/prg.exe", programa("viejo.exe"))
+    nuevo = programa("nuevo.exe")
+    fileSystem.write("c:/prg.exe", nuevo)
+    assert fileSystem.read("c:/prg.exe") is nuevo
+    assert fileSystem.listdir("c:") == ["prg.exe"]
+
+
+def test_importar_muchos_archivos():
+    fileSystem = FileSystem(None)
+    fileSystem.importar([("c:/lote/p%d.exe" % k, programa("p%d.exe" % k)) for k in range(50)])
+    assert len(fileSystem.listdir("c:/lote")) == 50
+    assert fileSystem.read("c:/lote/p49.exe").name == "p49.exe"
+
+
+def test_errores():
+    fileSystem = FileSystem(None)
+    fileSystem.write("c:/bin/prg.exe", programa("prg.exe"))
+    with pytest.raises(Exception, match="No existe el archivo c:/bin/otro.exe"):
+        fileSystem.read("c:/bin/otro.exe")
+    with pytest.raises(Exception, match="No existe el archivo c:/bin"):
+        fileSystem.read("c:/bin")
+    with pytest.raises(Exception, match="No existe el directorio"):
+        fileSystem.read("c:/usr/prg.exe")
+    with pytest.raises(Exception, match="c:/bin es un directorio"):
+        fileSystem.write("c:/bin", programa("prg.exe"))
+    with pytest.raises(Exception, match="prg.exe no es un directorio"):
+        fileSystem.mkdir("c:/bin/prg.exe/sub")
+    with pytest.raises(Exception, match="no nombra un archivo"):
+        fileSystem.write("/", programa("prg.exe"))
@@ -0,0 +1,80 @@
+from hardware import ASM, HARDWARE, PRINTER_DEVICE, TERMINAL_DEVICE
+from so import Kernel, Program
+
+## el padre imprime y el hijo usa la terminal: solo se pueden separar mirando R0 despues del FORK
+BIFURCA = """
+        SET R1 7
+        FORK
+        JZ R0 hijo
+        IO Printer
+        EXIT
+hijo:   SUB R1 7
+        JNZ R1 fin
+        IO Terminal
+fin:    EXIT
+"""
+
+## los dos procesos escriben la misma pagina: el hijo en su copia, el padre en la original
+ESCRIBEN = """
+        SET R2 1
+        FORK
+        JZ R0 hijo
+        STORE R2 dato
+        LOAD R3 dato
+        SUB R3 1
+        JNZ R3 fin
+        IO Printer
+        EXIT
+hijo:   STORE R0 dato
+        LOAD R3 dato
+        JNZ R3 fin
+        IO Terminal
+fin:    EXIT
+dato:   DATA 5
+"""
+
+
+def armarKernel(armarHardware, ensamblar, fuente):
+    armarHardware(64)
+    kernel = Kernel("4", 2, 4, 64)
+    kernel.fileSystem.write("c:/prg.exe", ensamblar("prg", fuente))
+    kernel.run("c:/prg.exe", 0)
+    return kernel
+
+
+def test_fork_devuelve_0_al_hijo_y_el_pid_al_padre(armarHardware, correr, ensamblar):
+    kernel = armarKernel(armarHardware, ensamblar, BIFURCA)
+    pids = []
+    original = kernel.pcbTable.add
+    kernel.pcbTable.add = lambda pcb: (pids.append(pcb.pid), original(pcb))
+    correr(kernel)
+    ## el hijo arranca con los registros del padre (R1 = 7) salvo R0
+    assert pids == [0, 1]
+    assert HARDWARE.ioDevices[PRINTER_DEVICE].completions == 1
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 1
+
+
+def test_padre_e_hijo_escriben_copias_distintas(armarHardware, correr, ensamblar):
+    kernel = armarKernel(armarHardware, ensamblar, ESCRIBEN)
+    correr(kernel)
+    assert HARDWARE.ioDevices[PRINTER_DEVICE].completions == 1
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 1
+    assert kernel.memoryManager.copiasPorEscritura >= 1
+    assert kernel.memoryManager.framesUsados == []
+
+
+def test_fork_de_un_proceso_que_no_esta_corriendo(armarHardware, correr):
+    armarHardware(64)
+    kernel = Kernel("3", 2, 4, 64)
+    kernel.fileSystem.write("c:/a.exe", Program("a.exe", [ASM.CPU(3)]))
+    kernel.fileSystem.write("c:/b.exe", Program("b.exe", [ASM.CPU(3)]))
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/b.exe", 0)
+    HARDWARE.clock.tick(0)
+    esperando = kernel.pcbTable.get(1)
+    kernel.fork(1)
+    HARDWARE.clock.tick(1)
+    hijo = kernel.pcbTable.get(2)
+    assert hijo.registers[0] == 0
+    assert esperando.registers[0] == 2
+    correr(kernel)
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from so import EscritorDeImagenes, IMAGEN_HEADER, Kernel, ProgramaBinario
+
+FUENTE = "CPU 5\nIO Terminal\nCPU 2\n"
+
+
+def escribirImagen(tmp_path, ensamblar, frameSize=4):
+    return EscritorDeImagenes(frameSize).escribir(ensamblar("prg", FUENTE, frameSize), str(tmp_path / "prg.img"))
+
+
+def test_imagen_con_otro_tamaño_de_frame(tmp_path, ensamblar):
+    imagen = escribirImagen(tmp_path, ensamblar, frameSize=4)
+    with pytest.raises(Exception, match="paginas de 4 celdas y los frames son de 8"):
+        ProgramaBinario(imagen, frameSize=8)
+    with ProgramaBinario(imagen, frameSize=4) as programa:
+        assert programa.cantidadPaginas == 3
+
+
+def test_imagen_truncada(tmp_path, ensamblar):
+    imagen = escribirImagen(tmp_path, ensamblar)
+    with open(imagen, "r+b") as archivo:
+        archivo.truncate(os.path.getsize(imagen) - 1)
+    with pytest.raises(Exception, match="truncada"):
+        ProgramaBinario(imagen)
+
+
+def test_header_con_paginas_inconsistentes(tmp_path, ensamblar):
+    imagen = escribirImagen(tmp_path, ensamblar)
+    with open(imagen, "r+b") as archivo:
+        campos = list(IMAGEN_HEADER.unpack(archivo.read(IMAGEN_HEADER.size)))
+        campos[-1] = 5
+        archivo.seek(0)
+        archivo.write(IMAGEN_HEADER.pack(*campos))
+    with pytest.raises(Exception, match="dice tener 5 paginas"):
+        ProgramaBinario(imagen)
+
+
+def test_cerrada_se_vuelve_a_mapear(tmp_path, ensamblar):
+    imagen = escribirImagen(tmp_path, ensamblar)
+    with ProgramaBinario(imagen) as programa:
+        instrucciones = programa.segmentos
+        assert programa.abierto
+    assert not programa.abierto
+    assert programa.segmentos == instrucciones
+    programa.close()
+
+
+def test_run_rechaza_imagen_de_otro_frame_y_el_apagado_la_cierra(tmp_path, armarHardware, ensamblar, correr):
+    armarHardware(32)
+    kernel = Kernel("1", 2, 8, 32)
+    kernel.fileSystem.write("c:/otro.img", ProgramaBinario(escribirImagen(tmp_path, ensamblar, frameSize=4)))
+    with pytest.raises(Exception, match="paginas de 4 celdas y los frames son de 8"):
+        kernel.run("c:/otro.img", 1)
+    imagen = EscritorDeImagenes(8).escribir(ensamblar("bueno", FUENTE, 8), str(tmp_path / "bueno.img"))
+    programa = ProgramaBinario(imagen, frameSize=8)
+    kernel.fileSystem.write("c:/bueno.img", programa)
+    kernel.run("c:/bueno.img", 1)
+    correr(kernel)
+    assert not programa.abierto
+    assert not kernel.fileSystem.read("c:/otro.img").abierto
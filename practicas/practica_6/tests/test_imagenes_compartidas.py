@@ -0,0 +1,47 @@
+from hardware import ASM, HARDWARE
+from so import Kernel, Program
+
+
+def armarKernel(armarHardware):
+    armarHardware(64)
+    kernel = Kernel("4", 2, 4, 64)
+    ## 11 instrucciones: 3 paginas de codigo
+    kernel.fileSystem.write("c:/a.exe", Program("a.exe", [ASM.CPU(10)]))
+    kernel.fileSystem.write("c:/b.exe", Program("b.exe", [ASM.CPU(10)]))
+    return kernel
+
+
+def test_los_procesos_del_mismo_programa_comparten_la_imagen(armarHardware):
+    kernel = armarKernel(armarHardware)
+    memoryManager = kernel.memoryManager
+    programa = kernel.fileSystem.read("c:/a.exe")
+    assert memoryManager.framesNecesarios(programa, "c:/a.exe") == 3
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/a.exe", 0)
+    for tick in range(0, 12):
+        HARDWARE.clock.tick(tick)
+    assert memoryManager.framesNecesarios(programa, "c:/a.exe") == 0
+    assert list(memoryManager.imagenes) == ["c:/a.exe"]
+    assert memoryManager.imagenes["c:/a.exe"].referencias == 3
+    ## el codigo esta una sola vez en memoria aunque lo ejecuten tres procesos
+    assert len(memoryManager.framesUsados) <= 3
+
+
+def test_otro_path_no_comparte_la_imagen(armarHardware, correr):
+    kernel = armarKernel(armarHardware)
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/b.exe", 0)
+    HARDWARE.clock.tick(0)
+    assert sorted(kernel.memoryManager.imagenes) == ["c:/a.exe", "c:/b.exe"]
+    correr(kernel)
+
+
+def test_la_imagen_se_libera_con_el_ultimo_proceso(armarHardware, correr):
+    kernel = armarKernel(armarHardware)
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/a.exe", 0)
+    correr(kernel)
+    assert kernel.memoryManager.imagenes == {}
+    assert kernel.memoryManager.framesUsados == []
+    assert kernel.memoryManager.asignadorDeFrames.cantidadLibres == 16
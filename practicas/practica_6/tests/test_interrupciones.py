@@ -0,0 +1,108 @@
+from threading import Thread
+
+import pytest
+
+from hardware import (IO_IN_INTERRUPTION_TYPE, IO_OUT_INTERRUPTION_TYPE, IRQ, IRQ_CLASS_DEVICE, IRQ_CLASS_TRAP,
+                      KILL_INTERRUPTION_TYPE, NEW_INTERRUPTION_TYPE, PAGE_FAULT_INTERRUPTION_TYPE,
+                      TIMEOUT_INTERRUPTION_TYPE, Clock, InterruptionType, InterruptVector)
+
+
+class Registro:
+
+    ## handler que anota el orden en que se atienden las interrupciones
+    def __init__(self, atendidas, alAtender=None):
+        self._atendidas = atendidas
+        self._alAtender = alAtender
+
+    def execute(self, irq):
+        self._atendidas.append((irq.type, irq.parameters))
+        if self._alAtender is not None:
+            self._alAtender(irq)
+
+
+def controlador(alAtender=None):
+    atendidas = []
+    clock = Clock()
+    interruptVector = InterruptVector(clock)
+    for tipo in InterruptionType:
+        interruptVector.register(tipo, Registro(atendidas, alAtender))
+    ## el hilo que llama a handlePending es el que atiende
+    interruptVector.handlePending()
+    return interruptVector, clock, atendidas
+
+
+def test_las_diferidas_se_atienden_en_el_tick_por_prioridad_y_llegada():
+    interruptVector, clock, atendidas = controlador()
+    interruptVector.handle(IRQ(NEW_INTERRUPTION_TYPE, "nuevo"))
+    interruptVector.handle(IRQ(IO_OUT_INTERRUPTION_TYPE, "disco"))
+    interruptVector.handle(IRQ(TIMEOUT_INTERRUPTION_TYPE))
+    interruptVector.handle(IRQ(IO_OUT_INTERRUPTION_TYPE, "impresora"))
+    assert atendidas == []
+    assert interruptVector.pendingCount == 4
+
+    interruptVector.handlePending()
+    assert atendidas == [(TIMEOUT_INTERRUPTION_TYPE, None), (IO_OUT_INTERRUPTION_TYPE, "disco"),
+                         (IO_OUT_INTERRUPTION_TYPE, "impresora"), (NEW_INTERRUPTION_TYPE, "nuevo")]
+    assert interruptVector.pendingCount == 0
+
+
+def test_las_excepciones_y_los_traps_se_atienden_en_el_momento():
+    interruptVector, clock, atendidas = controlador()
+    interruptVector.handle(IRQ(PAGE_FAULT_INTERRUPTION_TYPE, 3))
+    interruptVector.handle(IRQ(KILL_INTERRUPTION_TYPE))
+    assert atendidas == [(PAGE_FAULT_INTERRUPTION_TYPE, 3), (KILL_INTERRUPTION_TYPE, None)]
+
+
+def test_un_trap_levantado_dentro_de_un_handler_se_atiende_cuando_ese_handler_termina():
+    def levantarTrap(irq):
+        if irq.type == IO_OUT_INTERRUPTION_TYPE:
+            interruptVector.handle(IRQ(IO_IN_INTERRUPTION_TYPE, "anidado"))
+            atendidas.append(("fin", IO_OUT_INTERRUPTION_TYPE))
+    interruptVector, clock, atendidas = controlador(levantarTrap)
+    interruptVector.handle(IRQ(NEW_INTERRUPTION_TYPE))
+    interruptVector.handle(IRQ(IO_OUT_INTERRUPTION_TYPE))
+    interruptVector.handlePending()
+    ## no se anida: espera al handler en curso, pero como es un trap pasa antes que el NEW
+    assert atendidas == [(IO_OUT_INTERRUPTION_TYPE, None), ("fin", IO_OUT_INTERRUPTION_TYPE),
+                         (IO_IN_INTERRUPTION_TYPE, "anidado"), (NEW_INTERRUPTION_TYPE, None)]
+
+
+def test_las_clases_enmascaradas_quedan_pendientes():
+    interruptVector, clock, atendidas = controlador()
+    interruptVector.mask(IRQ_CLASS_DEVICE)
+    interruptVector.handle(IRQ(IO_OUT_INTERRUPTION_TYPE))
+    interruptVector.handle(IRQ(TIMEOUT_INTERRUPTION_TYPE))
+    interruptVector.handlePending()
+    assert atendidas == [(TIMEOUT_INTERRUPTION_TYPE, None)]
+    assert interruptVector.isMasked(IRQ_CLASS_DEVICE)
+
+    interruptVector.unmask(IRQ_CLASS_DEVICE)
+    interruptVector.handlePending()
+    assert atendidas[-1] == (IO_OUT_INTERRUPTION_TYPE, None)
+    with pytest.raises(Exception, match="no se pueden enmascarar"):
+        interruptVector.mask(IRQ_CLASS_TRAP)
+
+
+def test_las_de_otros_hilos_esperan_al_tick_y_reconocen_al_dispositivo_primero():
+    interruptVector, clock, atendidas = controlador()
+    reconocidas = []
+    otroHilo = Thread(target=lambda: interruptVector.handle(IRQ(IO_OUT_INTERRUPTION_TYPE, "worker")))
+    otroHilo.start()
+    otroHilo.join()
+    interruptVector.post(IRQ(IO_OUT_INTERRUPTION_TYPE, "dma"), lambda: reconocidas.append(list(atendidas)))
+    assert atendidas == []
+
+    interruptVector.handlePending()
+    assert reconocidas == [[]]
+    assert atendidas == [(IO_OUT_INTERRUPTION_TYPE, "worker"), (IO_OUT_INTERRUPTION_TYPE, "dma")]
+
+
+def test_cuenta_las_atendidas_y_su_latencia():
+    interruptVector, clock, atendidas = controlador()
+    interruptVector.handle(IRQ(NEW_INTERRUPTION_TYPE))
+    clock.tick(1)
+    clock.tick(2)
+    interruptVector.handlePending()
+    assert interruptVector.counts == {NEW_INTERRUPTION_TYPE: 1}
+    assert interruptVector.latencies == {NEW_INTERRUPTION_TYPE: (2.0, 2)}
+    assert interruptVector.rates(2) == {NEW_INTERRUPTION_TYPE: 0.5}
@@ -0,0 +1,49 @@
+from hardware import ASM, HARDWARE, TERMINAL_DEVICE
+from so import InvertedPageTable, Kernel, PageTableInvertida, Program
+
+
+def test_inverted_page_table_con_colisiones():
+    tabla = InvertedPageTable(4)
+    for numeroFrame, (clave, idPage) in enumerate([("a", 0), ("a", 1), ("b", 0), ("b", 1)]):
+        tabla.insertar(clave, idPage, numeroFrame)
+    assert [tabla.buscar(clave, idPage) for clave, idPage in [("a", 0), ("a", 1), ("b", 0), ("b", 1)]] == [0, 1, 2, 3]
+    assert tabla.buscar("a", 2) is None
+    assert sum(tabla.largosDeCadenas()) == 4
+    tabla.eliminar("b", 0)
+    assert tabla.buscar("b", 0) is None
+    assert tabla.buscar("b", 1) == 3
+    assert sorted(tabla.paginasDe("a")) == [(0, 0), (1, 1)]
+
+
+def test_inverted_page_table_reemplaza_la_entrada_del_frame():
+    tabla = InvertedPageTable(2)
+    tabla.insertar("a", 0, 1)
+    tabla.insertar("b", 3, 1)
+    assert tabla.buscar("a", 0) is None
+    assert tabla.buscar("b", 3) == 1
+
+
+def test_vista_invertida_de_un_proceso_con_paginas_propias():
+    tabla = InvertedPageTable(4)
+    imagen = object()
+    vista = PageTableInvertida(tabla, imagen)
+    vista.setFrame(0, 0)
+    vista.setClave(1, 7)
+    vista.setFrame(1, 2)
+    ## la pagina 1 es una copia del proceso 7: se indexa por el pid, la 0 por la imagen
+    assert tabla.buscar(imagen, 0) == 0
+    assert tabla.buscar(7, 1) == 2
+    assert sorted(vista.paginasResidentes()) == [(0, 0), (1, 2)]
+
+
+def test_los_procesos_corren_con_la_inverted_page_table(armarHardware, correr):
+    armarHardware(32)
+    kernel = Kernel("4", 2, 4, 32, 1, True)
+    kernel.fileSystem.write("c:/a.exe", Program("a.exe", [ASM.CPU(9), ASM.IO(TERMINAL_DEVICE), ASM.CPU(2)]))
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/a.exe", 0)
+    correr(kernel)
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 2
+    invertida = kernel.memoryManager.invertedPageTable
+    assert invertida.busquedas > 0
+    assert invertida.largosDeCadenas() == []
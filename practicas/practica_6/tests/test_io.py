@@ -0,0 +1,34 @@
+from hardware import ASM, HARDWARE, PRINTER_DEVICE
+from so import Kernel, Program
+
+
+def correrConImpresora(procesos, coalesceCount, coalesceTicks):
+    HARDWARE.setup(128, coalesceCount=coalesceCount, coalesceTicks=coalesceTicks)
+    kernel = Kernel("4", 2, 4, 128)
+    for k in range(procesos):
+        kernel.fileSystem.write("c:/p%d.exe" % k, Program("p%d.exe" % k, [ASM.CPU(1), ASM.IO(), ASM.CPU(1), ASM.IO()]))
+        kernel.run("c:/p%d.exe" % k, k)
+    for tick in range(500):
+        if kernel.finalizado:
+            break
+        HARDWARE.clock.tick(tick)
+    assert kernel.finalizado
+    return HARDWARE.ioDevices[PRINTER_DEVICE]
+
+
+def test_sin_coalescing_una_interrupcion_por_operacion():
+    impresora = correrConImpresora(3, 1, 0)
+    assert impresora.completions == 6
+    assert impresora.interrupts == impresora.completions
+
+
+def test_coalescing_por_cantidad_sin_timeout():
+    impresora = correrConImpresora(3, 3, 0)
+    assert impresora.completions == 6
+    assert impresora.interrupts < impresora.completions
+
+
+def test_coalescing_un_solo_pedido_no_queda_esperando():
+    impresora = correrConImpresora(1, 3, 0)
+    assert impresora.completions == 2
+    assert impresora.interrupts == 2
@@ -0,0 +1,51 @@
+from hardware import ASM, DISK_DEVICE, HARDWARE, PRINTER_DEVICE
+from so import Kernel, Program
+
+## con dispositivos asincronicos el tick en que termina cada operacion depende del tiempo real:
+## los tests solo miran lo que no depende de eso (que todo termine y los totales)
+
+
+def correrAsincronico(programas, maximo=5000, antesDeCorrer=None):
+    HARDWARE.setup(1024, asyncIO=True)
+    kernel = Kernel("4", 2, 4, 1024)
+    if antesDeCorrer is not None:
+        antesDeCorrer()
+    try:
+        for k, instrucciones in enumerate(programas):
+            kernel.fileSystem.write("c:/p%d.exe" % k, Program("p%d.exe" % k, instrucciones))
+            kernel.run("c:/p%d.exe" % k, 0)
+        for tick in range(maximo):
+            if kernel.finalizado:
+                return kernel
+            HARDWARE.clock.tick(tick)
+        raise AssertionError("los procesos no terminaron en {maximo} ticks".format(maximo=maximo))
+    finally:
+        HARDWARE.switchOff()
+
+
+def test_las_operaciones_asincronicas_terminan_y_se_cuentan_al_atender_la_interrupcion(monkeypatch, tmp_path):
+    ## el disco asincronico lee de un archivo en el directorio actual
+    monkeypatch.chdir(tmp_path)
+    correrAsincronico([[ASM.CPU(1), ASM.IO(), ASM.IO(DISK_DEVICE, 40), ASM.CPU(1)],
+                       [ASM.IO(DISK_DEVICE, 150), ASM.CPU(2), ASM.IO()]])
+    impresora = HARDWARE.ioDevices[PRINTER_DEVICE]
+    disco = HARDWARE.ioDevices[DISK_DEVICE]
+    assert (impresora.completions, impresora.interrupts) == (2, 2)
+    assert (disco.completions, disco.interrupts, disco.operations) == (2, 2, 2)
+    ## el orden en que llegan los dos pedidos al disco puede variar entre corridas
+    assert disco.totalSeek == (150 + 110 if disco.head == 40 else 40 + 110)
+    assert not disco.isAsync
+    assert disco.is_idle
+
+
+def test_el_bloque_leido_llega_al_buffer_con_la_interrupcion(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    def ensuciarBuffer():
+        buffer = HARDWARE.ioDevices[DISK_DEVICE].buffer
+        buffer[:] = b"\xff" * len(buffer)
+    correrAsincronico([[ASM.IO(DISK_DEVICE, 3)]], antesDeCorrer=ensuciarBuffer)
+    disco = HARDWARE.ioDevices[DISK_DEVICE]
+    assert disco.completions == 1
+    ## el archivo del disco arranca en ceros
+    assert bytes(disco.buffer) == bytes(len(disco.buffer))
@@ -0,0 +1,71 @@
+from hardware import HARDWARE
+from so import Kernel
+
+## suma 3 cinco veces en R2 y guarda el total en una celda de datos de la imagen
+CUENTA = """
+        SET R1 5
+        SET R2 0
+loop:   ADD R2 3
+        SUB R1 1
+        JNZ R1 loop
+        STORE R2 total
+        LOAD R3 total
+        EXIT
+total:  DATA 0
+"""
+
+## JZ salta con cero, JMP saltea lo que sigue; ADD y SUB tambien con registros y valores negativos
+SALTOS = """
+        SET R1 0
+        JZ R1 salta
+        SET R4 99
+salta:  SET R5 -2
+        JNZ R1 fin
+        JMP fin
+        SET R5 7
+fin:    ADD R6 R5
+        SUB R6 1
+        SUB R7 R6
+        EXIT
+"""
+
+## cada proceso incrementa la celda dato: la escritura no puede llegar a la imagen compartida
+INCREMENTA = """
+        LOAD R1 dato
+        ADD R1 1
+        STORE R1 dato
+        EXIT
+dato:   DATA 10
+"""
+
+
+def correrFuente(armarHardware, ensamblar, correr, fuente, procesos=1):
+    armarHardware(64)
+    kernel = Kernel("3", None, 4, 64)
+    kernel.fileSystem.write("c:/prg.exe", ensamblar("prg", fuente))
+    for proceso in range(procesos):
+        kernel.run("c:/prg.exe", 0)
+    return kernel, correr(kernel)
+
+
+def test_loop_que_cuenta(armarHardware, ensamblar, correr):
+    kernel, ticks = correrFuente(armarHardware, ensamblar, correr, CUENTA)
+    registros = HARDWARE.cpu.registers
+    assert (registros[1], registros[2], registros[3]) == (0, 15, 15)
+    ## un tick por instruccion: 2 SET + 5 vueltas de 3 + STORE + LOAD + EXIT (los page faults no esperan al swap)
+    assert ticks == 20
+    ## la celda total esta en una pagina de la imagen: el STORE la copia
+    assert kernel.memoryManager.copiasPorEscritura == 1
+
+
+def test_saltos_y_aritmetica(armarHardware, ensamblar, correr):
+    correrFuente(armarHardware, ensamblar, correr, SALTOS)
+    registros = HARDWARE.cpu.registers
+    assert (registros[4], registros[5], registros[6], registros[7]) == (0, -2, -3, 3)
+
+
+def test_store_copia_la_pagina_de_cada_proceso(armarHardware, ensamblar, correr):
+    kernel, ticks = correrFuente(armarHardware, ensamblar, correr, INCREMENTA, procesos=2)
+    ## el segundo proceso todavia lee el 10 de la imagen
+    assert HARDWARE.cpu.registers[1] == 11
+    assert kernel.memoryManager.copiasPorEscritura == 2
@@ -0,0 +1,58 @@
+import pytest
+
+from hardware import (IRQ, KILL_INTERRUPTION_TYPE, TIMEOUT_INTERRUPTION_TYPE, Clock, InterruptionType,
+                      InterruptVector)
+from so import PCB, EstadoPCB, Page, PageTable, PedidoDeIO
+
+
+def test_los_tipos_y_estados_son_enteros_que_se_muestran_con_su_nombre():
+    assert int(KILL_INTERRUPTION_TYPE) == InterruptionType.KILL
+    assert str(TIMEOUT_INTERRUPTION_TYPE) == "#TIMEOUT"
+    assert "{:>9}".format(TIMEOUT_INTERRUPTION_TYPE) == " #TIMEOUT"
+    assert EstadoPCB.RUNNING == 2
+    assert str(EstadoPCB.RUNNING) == "running"
+    assert "{:<8}|".format(EstadoPCB.READY) == "ready   |"
+
+
+@pytest.mark.parametrize("objeto", [
+    IRQ(KILL_INTERRUPTION_TYPE),
+    PCB(0, 1, "prg.exe", 0, PageTable(), 9),
+    Page(0, None, 0, 4),
+    PedidoDeIO(None, "IO", 0),
+])
+def test_los_objetos_de_los_caminos_calientes_no_tienen_dict(objeto):
+    assert not hasattr(objeto, "__dict__")
+    with pytest.raises(AttributeError):
+        objeto.atributoNuevo = 1
+
+
+class Nada:
+
+    def execute(self, irq):
+        pass
+
+
+def test_las_irqs_del_pool_se_reusan_despues_de_atenderse():
+    interruptVector = InterruptVector(Clock())
+    interruptVector.register(TIMEOUT_INTERRUPTION_TYPE, Nada())
+    interruptVector.handlePending()
+
+    primera = IRQ.acquire(TIMEOUT_INTERRUPTION_TYPE, "a")
+    interruptVector.handle(primera)
+    interruptVector.handlePending()
+    assert primera.parameters is None
+    segunda = IRQ.acquire(TIMEOUT_INTERRUPTION_TYPE, "b")
+    assert segunda is primera
+    assert segunda.parameters == "b"
+
+
+def test_las_irqs_creadas_directamente_no_vuelven_al_pool():
+    interruptVector = InterruptVector(Clock())
+    interruptVector.register(TIMEOUT_INTERRUPTION_TYPE, Nada())
+    interruptVector.handlePending()
+
+    directa = IRQ(TIMEOUT_INTERRUPTION_TYPE, "x")
+    interruptVector.handle(directa)
+    interruptVector.handlePending()
+    assert directa.parameters == "x"
+    assert IRQ.acquire(TIMEOUT_INTERRUPTION_TYPE) is not directa
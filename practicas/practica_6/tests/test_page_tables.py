@@ -0,0 +1,56 @@
+import pytest
+
+from hardware import ASM, HARDWARE, TERMINAL_DEVICE
+from so import Kernel, MultiLevelPageTable, PageTable, Program
+
+
+def test_page_table_plana():
+    pageTable = PageTable()
+    pageTable.addPage(0)
+    pageTable.addPage(1)
+    pageTable.setFrame(1, 5)
+    assert pageTable.frameDePagina(0) is None
+    assert pageTable.frameDePagina(1) == 5
+    assert pageTable.paginasResidentes() == [(1, 5)]
+
+
+def test_multinivel_aloca_las_tablas_intermedias_bajo_demanda():
+    ## 2 niveles de 2 bits: paginas 0..15, 4 entradas por tabla
+    pageTable = MultiLevelPageTable(2, 2)
+    assert pageTable.tablasAlocadas == 1
+    pageTable.setFrame(13, 3)
+    pageTable.setFrame(14, 4)
+    pageTable.setFrame(1, 7)
+    assert pageTable.tablasAlocadas == 3
+    assert pageTable.frameDePagina(13) == 3
+    assert pageTable.frameDePagina(12) is None
+    assert pageTable.frameDePagina(5) is None
+    assert sorted(pageTable.paginasResidentes()) == [(1, 7), (13, 3), (14, 4)]
+
+
+def test_multinivel_libera_las_tablas_que_quedan_vacias():
+    pageTable = MultiLevelPageTable(2, 2)
+    pageTable.setFrame(13, 3)
+    pageTable.setFrame(14, 4)
+    pageTable.setFrame(13, None)
+    assert pageTable.tablasAlocadas == 2
+    pageTable.setFrame(14, None)
+    assert pageTable.tablasAlocadas == 1
+    assert pageTable.paginasResidentes() == []
+
+
+def test_multinivel_rechaza_paginas_fuera_de_rango():
+    with pytest.raises(Exception):
+        MultiLevelPageTable(2, 2).setFrame(16, 0)
+
+
+@pytest.mark.parametrize("niveles", [1, 2, 3])
+def test_los_procesos_corren_con_cada_page_table(armarHardware, correr, niveles):
+    armarHardware(32)
+    kernel = Kernel("4", 2, 4, 32, niveles)
+    kernel.fileSystem.write("c:/a.exe", Program("a.exe", [ASM.CPU(9), ASM.IO(TERMINAL_DEVICE), ASM.CPU(2)]))
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/a.exe", 0)
+    correr(kernel)
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 2
+    assert kernel.memoryManager.framesUsados == []
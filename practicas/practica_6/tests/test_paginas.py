@@ -0,0 +1,33 @@
+from hardware import ASM, HARDWARE, DISK_DEVICE, TERMINAL_DEVICE
+from so import Kernel, LogicalMemory, Page, Program
+
+
+def test_las_paginas_se_buscan_por_imagen_y_numero():
+    memoria = LogicalMemory()
+    programaA = Program("a.exe", [ASM.CPU(6)])
+    programaB = Program("b.exe", [ASM.IO(), ASM.CPU(2)])
+    imagenA, imagenB = object(), object()
+    for imagen, programa in [(imagenA, programaA), (imagenB, programaB)]:
+        for idPage, desde in enumerate(range(0, programa.size, 4)):
+            memoria.addPage(imagen, Page(idPage, programa, desde, desde + 4))
+    assert memoria.getPageForId(imagenA, 1).cells == ["CPU", "CPU", "EXIT"]
+    assert memoria.getPageForId(imagenB, 0).cells == ["IO", "CPU", "CPU", "EXIT"]
+    memoria.liberarPaginas(imagenA)
+    assert list(memoria.memory) == [imagenB]
+
+
+def test_cada_proceso_ejecuta_las_paginas_de_su_programa(armarHardware, correr):
+    ## round robin de a un tick: las paginas de los dos programas se usan intercaladas
+    armarHardware(64)
+    kernel = Kernel("4", 1, 4, 64)
+    kernel.fileSystem.write("c:/a.exe", Program("a.exe", [ASM.CPU(5), ASM.IO(TERMINAL_DEVICE), ASM.CPU(5)]))
+    kernel.fileSystem.write("c:/b.exe", Program("b.exe", [ASM.CPU(7), ASM.IO(DISK_DEVICE), ASM.CPU(3)]))
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/b.exe", 0)
+    correr(kernel)
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 1
+    assert HARDWARE.ioDevices[DISK_DEVICE].completions == 1
+    ## al terminar no queda ninguna pagina indexada
+    assert kernel.memoryManager.logicalMemory.memory == {}
+    assert kernel.memoryManager.imagenes == {}
+    assert kernel.memoryManager.framesUsados == []
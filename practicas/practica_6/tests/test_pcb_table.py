@@ -0,0 +1,50 @@
+from so import PCB, EstadoPCB, PCBTable, PageTable
+
+
+def nuevoPCB(tabla):
+    return PCB(0, tabla.getNewPID(), "prg.exe", 0, PageTable(), 9)
+
+
+def test_los_pcbs_se_buscan_por_pid_y_quedan_en_orden_de_llegada():
+    tabla = PCBTable()
+    pcbs = [nuevoPCB(tabla) for vez in range(3)]
+    for pcb in pcbs:
+        tabla.add(pcb)
+    assert [pcb.pid for pcb in pcbs] == [0, 1, 2]
+    assert tabla.get(1) is pcbs[1]
+    assert tabla.get(7) is None
+
+    tabla.remove(1)
+    assert list(tabla.tabla) == [pcbs[0], pcbs[2]]
+    assert tabla.cantidad == 2
+    assert pcbs[1].pcbTable is None
+
+
+def test_la_tabla_cuenta_los_procesos_en_cada_estado():
+    tabla = PCBTable()
+    primero, segundo = nuevoPCB(tabla), nuevoPCB(tabla)
+    tabla.add(primero)
+    tabla.add(segundo)
+    assert tabla.cantidadEn(EstadoPCB.NEW) == 2
+
+    primero.state = EstadoPCB.RUNNING
+    segundo.state = EstadoPCB.READY
+    segundo.state = EstadoPCB.WAITING
+    assert tabla.cantidadPorEstado == {EstadoPCB.NEW: 0, EstadoPCB.READY: 0, EstadoPCB.RUNNING: 1,
+                                       EstadoPCB.WAITING: 1, EstadoPCB.SUSPENDED: 0, EstadoPCB.TERMINATED: 0}
+
+    tabla.remove(segundo.pid)
+    assert tabla.cantidadEn(EstadoPCB.WAITING) == 0
+    ## un pcb que ya salio de la tabla no la modifica
+    segundo.state = EstadoPCB.READY
+    assert tabla.cantidadEn(EstadoPCB.READY) == 0
+
+
+def test_terminaron_todos():
+    tabla = PCBTable()
+    assert tabla.terminaronTodos
+    pcb = nuevoPCB(tabla)
+    tabla.add(pcb)
+    assert not tabla.terminaronTodos
+    pcb.state = EstadoPCB.TERMINATED
+    assert tabla.terminaronTodos
@@ -0,0 +1,67 @@
+import warnings
+
+from hardware import ASM, Burst, HARDWARE, INSTRUCTION_CPU, INSTRUCTION_EXIT
+from so import Kernel, Program
+
+from test_admision import correrContando
+
+## ocupa 8 paginas de 4 celdas y escribe la ultima: la copia necesita un frame mas de los que hay
+ESCRIBE_AL_FINAL = """
+      SET R1 1
+      CPU * 27
+      STORE R1 dato
+      EXIT
+dato: DATA 0
+"""
+
+
+def test_cpu_es_un_solo_segmento():
+    rafaga = ASM.CPU(10000)
+    assert isinstance(rafaga, Burst)
+    assert len(rafaga) == 10000 and rafaga[-1] == INSTRUCTION_CPU
+    assert ASM.CPU(3) == [INSTRUCTION_CPU] * 3
+    assert ASM.CPU(1) + [INSTRUCTION_EXIT] == [INSTRUCTION_CPU, INSTRUCTION_EXIT]
+    programa = Program("largo.exe", [ASM.CPU(10000)])
+    assert programa.size == 10001
+    assert programa.segmentos == [[INSTRUCTION_CPU, 10000], [INSTRUCTION_EXIT, 1]]
+    assert programa.instruccionesEntre(9998, 10004) == [INSTRUCTION_CPU, INSTRUCTION_CPU, INSTRUCTION_EXIT]
+
+
+def test_instructions_esta_deprecado():
+    programa = Program("corto.exe", [ASM.CPU(2)])
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter("always")
+        assert programa.instructions == [INSTRUCTION_CPU, INSTRUCTION_CPU, INSTRUCTION_EXIT]
+    assert [aviso.category for aviso in avisos] == [DeprecationWarning]
+
+
+def test_las_paginas_se_cargan_recien_cuando_se_usan(armarHardware, correr):
+    armarHardware(64)
+    kernel = Kernel("3", None, 4, 64)
+    kernel.fileSystem.write("c:/largo.exe", Program("largo.exe", [ASM.CPU(39)]))
+    kernel.run("c:/largo.exe", 0)
+    HARDWARE.clock.tick(0)
+    assert kernel.memoryManager.asignadorDeFrames.cantidadLibres == 15
+    correr(kernel)
+    ## cada una de las 10 paginas se cargo una vez, desde el programa
+    assert kernel.memoryManager.pageFaults == 10
+    assert kernel.memoryManager.cargasDesdePrograma == 10
+
+
+def test_sin_swap_se_desalojan_paginas_de_codigo(armarHardware, ensamblar, correr):
+    armarHardware(32)
+    kernel = Kernel("3", None, 4, 32)
+    kernel.fileSystem.write("c:/escribe.exe", ensamblar("escribe", ESCRIBE_AL_FINAL))
+    kernel.run("c:/escribe.exe", 0)
+    correr(kernel)
+    assert kernel.memoryManager.copiasPorEscritura == 1
+
+
+def test_sin_swap_se_reservan_las_paginas_que_faltan_cargar(armarHardware):
+    armarHardware(32)
+    kernel = Kernel("3", None, 4, 32)
+    for nombre in ["a.exe", "b.exe"]:
+        kernel.fileSystem.write("c:/" + nombre, Program(nombre, [ASM.CPU(19)]))
+        kernel.run("c:/" + nombre, 0)
+    ## cada uno ocupa 5 de los 8 frames: el segundo espera aunque el primero todavia no cargo sus paginas
+    assert correrContando(kernel) == 1
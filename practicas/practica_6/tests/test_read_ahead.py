@@ -0,0 +1,59 @@
+from hardware import HARDWARE, TERMINAL_DEVICE
+from so import Kernel
+
+## 12 paginas de codigo que se ejecutan una detras de otra
+SECUENCIAL = """
+      CPU * 44
+      IO Terminal
+      CPU * 2
+      EXIT
+"""
+
+
+def pageFaults(armarHardware, correr, ensamblar, memoria, readAhead, fuente=SECUENCIAL):
+    armarHardware(memoria, 256)
+    kernel = Kernel("3", None, 4, memoria, readAhead=readAhead)
+    kernel.fileSystem.write("c:/prueba.exe", ensamblar("prueba", fuente))
+    kernel.run("c:/prueba.exe", 0)
+    correr(kernel)
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 1
+    return kernel.memoryManager
+
+
+def test_en_un_programa_secuencial_el_read_ahead_no_agrega_page_faults(armarHardware, correr, ensamblar):
+    sinReadAhead = pageFaults(armarHardware, correr, ensamblar, 16, False).pageFaults
+    memoryManager = pageFaults(armarHardware, correr, ensamblar, 16, True)
+
+    assert memoryManager.pageFaults < sinReadAhead
+    assert memoryManager.paginasLeidasPorAdelantado > 0
+    assert memoryManager.prefetchDesperdiciado == 0
+
+
+def test_la_ventana_nunca_pasa_de_la_mitad_de_la_memoria(armarHardware, correr, ensamblar):
+    ## con 3 frames se lee a lo sumo una pagina por adelantado: cada fallo trae dos paginas
+    memoryManager = pageFaults(armarHardware, correr, ensamblar, 12, True)
+    assert memoryManager.ventanaReadAheadMaxima == 1
+    assert memoryManager.paginasLeidasPorAdelantado <= memoryManager.pageFaults
+
+
+def test_con_un_solo_frame_no_se_lee_por_adelantado(armarHardware, correr, ensamblar):
+    ## leer por adelantado desalojaria la pagina que fallo
+    sinReadAhead = pageFaults(armarHardware, correr, ensamblar, 4, False).pageFaults
+    memoryManager = pageFaults(armarHardware, correr, ensamblar, 4, True)
+    assert memoryManager.paginasLeidasPorAdelantado == 0
+    assert memoryManager.pageFaults == sinReadAhead
+
+
+## salta de una pagina a la de dos mas adelante: la pagina siguiente a la que falla nunca se usa
+SALTEADO = "\n".join("p{n}: JMP p{m}\n CPU * 3\n CPU * 4".format(n=n, m=n + 1) for n in range(0, 8)) + """
+p8: IO Terminal
+    EXIT
+"""
+
+
+def test_si_lo_leido_por_adelantado_no_se_usa_la_ventana_se_cierra(armarHardware, correr, ensamblar):
+    memoryManager = pageFaults(armarHardware, correr, ensamblar, 8, True, SALTEADO)
+    assert memoryManager.prefetchDesperdiciado > 0
+    assert memoryManager.aciertosDePrefetch == 0
+    ## sin cerrar la ventana cada fallo leeria una pagina de mas
+    assert memoryManager.paginasLeidasPorAdelantado < memoryManager.pageFaults // 2
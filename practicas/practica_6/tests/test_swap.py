@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from hardware import HARDWARE, TERMINAL_DEVICE, SwapDevice, SWAP_CELL_SIZE
+from so import Kernel
+
+## cuenta hasta 5 en su pagina de datos y hace IO en la terminal solo si el contador quedo bien
+CONTADOR = """
+      SET R1 5
+loop: LOAD R2 contador
+      ADD R2 1
+      STORE R2 contador
+      SUB R1 1
+      JNZ R1 loop
+      LOAD R3 contador
+      SUB R3 5
+      JNZ R3 fin
+      IO Terminal
+fin:  EXIT
+contador: DATA 0
+"""
+
+
+def test_escribir_y_leer_una_pagina(tmp_path):
+    swap = SwapDevice(16, str(tmp_path / "swap.bin"), 2)
+    swap.frameSize = 4
+    assert swap.slots == 4
+    assert swap.write(2, ["CPU", 7, "IO Disk 3"]) == 2
+    assert swap.read(2) == ["CPU", 7, "IO Disk 3", ""]
+    assert swap.readMany([2, 0]) == [["CPU", 7, "IO Disk 3", ""], ["", "", "", ""]]
+    assert (swap.reads, swap.writes, swap.latencyTicks) == (2, 1, 6)
+    swap.close()
+
+
+def test_escribir_y_leer_con_mmap(tmp_path):
+    swap = SwapDevice(16, str(tmp_path / "swap.bin"), 2, useMmap=True)
+    swap.frameSize = 4
+    swap.write(3, [1, 2, 3, 4])
+    assert swap.read(3) == [1, 2, 3, 4]
+    swap.close()
+
+
+def test_una_celda_que_no_entra_se_rechaza_sin_escribir(tmp_path):
+    swap = SwapDevice(16, str(tmp_path / "swap.bin"), 2)
+    swap.frameSize = 4
+    swap.write(1, [1, 2, 3, 4])
+    with pytest.raises(Exception, match="ERROR"):
+        swap.write(1, [5, "X" * SWAP_CELL_SIZE])
+    with pytest.raises(Exception, match="ERROR"):
+        swap.write(1, [10 ** SWAP_CELL_SIZE])
+    assert swap.read(1) == [1, 2, 3, 4]
+    assert swap.writes == 1
+    swap.close()
+
+
+def test_slot_invalido(tmp_path):
+    swap = SwapDevice(16, str(tmp_path / "swap.bin"), 2)
+    swap.frameSize = 4
+    with pytest.raises(Exception):
+        swap.read(4)
+    swap.close()
+
+
+def test_sin_swap_no_se_crea_el_archivo(tmp_path):
+    swap = SwapDevice(0, str(tmp_path / "swap.bin"), 2)
+    swap.close()
+    swap.close()
+    assert not os.path.exists(str(tmp_path / "swap.bin"))
+
+
+def test_las_paginas_modificadas_vuelven_del_swap(armarHardware, correr, ensamblar):
+    ## 2 frames para dos procesos de 3 paginas: los datos de cada uno van y vuelven del swap
+    armarHardware(8, 64)
+    kernel = Kernel("4", 3, 4, 8)
+    kernel.fileSystem.write("c:/contador.exe", ensamblar("contador", CONTADOR))
+    kernel.run("c:/contador.exe", 0)
+    kernel.run("c:/contador.exe", 0)
+    correr(kernel)
+    memoryManager = kernel.memoryManager
+    assert memoryManager.swapOuts > 0
+    assert memoryManager.swapIns > 0
+    assert HARDWARE.swapDevice.writes == memoryManager.swapOuts
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 2
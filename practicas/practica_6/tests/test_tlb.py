@@ -0,0 +1,64 @@
+import pytest
+
+from hardware import ASM, HARDWARE, TLB
+from so import Kernel, Program
+
+
+def test_geometria_invalida():
+    with pytest.raises(Exception):
+        TLB(6, 4)
+    with pytest.raises(Exception):
+        TLB(0, 1)
+
+
+def test_aciertos_y_fallos():
+    tlb = TLB(4, 2)
+    assert tlb.lookup(1, 0) is None
+    tlb.insert(1, 0, 7)
+    assert tlb.lookup(1, 0) == (7, False)
+    assert (tlb.hits, tlb.misses) == (1, 1)
+    assert tlb.hitRate == 0.5
+
+
+def test_las_entradas_se_distinguen_por_asid():
+    tlb = TLB(4, 2)
+    tlb.insert(1, 0, 7)
+    tlb.insert(2, 0, 9, True)
+    assert tlb.lookup(1, 0) == (7, False)
+    assert tlb.lookup(2, 0) == (9, True)
+    tlb.flush(1)
+    assert tlb.lookup(1, 0) is None
+    assert tlb.lookup(2, 0) == (9, True)
+    tlb.invalidate(2, 0)
+    assert tlb.lookup(2, 0) is None
+
+
+def test_cada_conjunto_desaloja_la_entrada_menos_usada():
+    ## 2 conjuntos de 2 vias: las paginas pares van al conjunto 0
+    tlb = TLB(4, 2)
+    tlb.insert(1, 0, 10)
+    tlb.insert(1, 2, 12)
+    tlb.lookup(1, 0)
+    tlb.insert(1, 4, 14)
+    assert tlb.lookup(1, 2) is None
+    assert tlb.lookup(1, 0) == (10, False)
+    assert tlb.lookup(1, 4) == (14, False)
+    ## el otro conjunto no se toca
+    tlb.insert(1, 1, 11)
+    assert tlb.lookup(1, 1) == (11, False)
+
+
+def test_la_tlb_se_usa_durante_la_ejecucion(armarHardware, correr):
+    armarHardware(64, tlbSize=4, tlbWays=2)
+    kernel = Kernel("4", 2, 4, 64)
+    kernel.fileSystem.write("c:/a.exe", Program("a.exe", [ASM.CPU(12)]))
+    kernel.run("c:/a.exe", 0)
+    kernel.run("c:/a.exe", 0)
+    correr(kernel)
+    tlb = HARDWARE.mmu.tlb
+    ## 13 instrucciones por proceso en 4 paginas: la mayoria de las traducciones salen de la TLB
+    assert tlb.hits + tlb.misses == 26
+    assert tlb.hits > tlb.misses
+    ## cada proceso que termina saca sus entradas
+    assert tlb.flushes == 2
+    assert all(tlb.lookup(pid, idPage) is None for pid in (0, 1) for idPage in range(4))
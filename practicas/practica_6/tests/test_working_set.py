@@ -0,0 +1,57 @@
+from hardware import HARDWARE, TERMINAL_DEVICE
+from so import EstadoPCB, Kernel
+
+## recorre cuatro paginas de datos en cada vuelta: su working set es de unas 7 paginas (3 de texto y 4 de datos).
+## Con FORK son dos procesos desde el principio, sin pasar por la admision
+RECORRE = """
+      FORK
+      SET R1 10
+loop: LOAD R2 a
+      LOAD R2 b
+      LOAD R2 c
+      LOAD R2 d
+      SUB R1 1
+      JNZ R1 loop
+      IO Terminal
+      EXIT
+a:    DATA * 4
+b:    DATA * 4
+c:    DATA * 4
+d:    DATA * 4
+"""
+
+
+def test_con_la_memoria_sobrecomprometida_se_suspende_un_proceso_y_despues_se_reanuda(armarHardware, ensamblar):
+    ## 8 frames para dos procesos que necesitan unos 7 cada uno
+    armarHardware(32, 256)
+    kernel = Kernel("4", 3, 4, 32, ventanaWorkingSet=20)
+    kernel.fileSystem.write("c:/recorre.exe", ensamblar("recorre", RECORRE))
+    kernel.run("c:/recorre.exe", 0)
+    planificador = kernel.planificadorMedianoPlazo
+
+    estados = set()
+    for tick in range(5000):
+        if kernel.finalizado:
+            break
+        HARDWARE.clock.tick(tick)
+        estados.update(pcb.state for pcb in kernel.pcbTable.tabla)
+        for pcb in planificador.suspendidos:
+            assert pcb not in kernel.scheduler.readyQueue.lista
+
+    assert kernel.finalizado
+    assert EstadoPCB.SUSPENDED in estados
+    assert planificador.suspensiones >= 1
+    assert planificador.reanudaciones == planificador.suspensiones
+    assert planificador.suspendidos == []
+    assert planificador.demanda == 0
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 2
+
+
+def test_si_el_working_set_entra_no_se_suspende(armarHardware, correr, ensamblar):
+    armarHardware(128, 256)
+    kernel = Kernel("4", 3, 4, 128, ventanaWorkingSet=20)
+    kernel.fileSystem.write("c:/recorre.exe", ensamblar("recorre", RECORRE))
+    kernel.run("c:/recorre.exe", 0)
+    correr(kernel)
+    assert kernel.planificadorMedianoPlazo.suspensiones == 0
+    assert HARDWARE.ioDevices[TERMINAL_DEVICE].completions == 2